@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (c) 2023 Sorcero, Inc.
+#
+# This file is part of Sorcero's Language Intelligence platform
+# (see https://www.sorcero.com).
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import os
+import argparse
+import tempfile
+import timeit
+
+from ingestum import engine
+from ingestum import manifests
+from ingestum import pipelines
+
+
+def make_source(pipeline):
+    return manifests.sources.PDF(
+        id="",
+        pipeline=pipeline,
+        first_page=1,
+        last_page=3,
+        location=manifests.sources.locations.Local(
+            path="tests/data/test.pdf",
+        ),
+        destination=manifests.sources.destinations.Void(),
+    )
+
+
+def parse_and_prepare(source, pipelines_dir, output_directory):
+    path = os.path.join(pipelines_dir, f"{source.pipeline}.json")
+    pipeline = pipelines.Base.parse_file(path)
+    engine.prepare_pineline(source, pipeline, output_directory)
+    return pipeline
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pipelines", type=str, default="tests/pipelines")
+    parser.add_argument("--pipeline", type=str, default="pipeline_pdf")
+    parser.add_argument("--sources", type=int, default=1000)
+    args = parser.parse_args()
+
+    source = make_source(args.pipeline)
+    workspace = tempfile.TemporaryDirectory()
+
+    before = timeit.timeit(
+        lambda: parse_and_prepare(source, args.pipelines, workspace.name),
+        number=args.sources,
+    )
+    after = timeit.timeit(
+        lambda: engine.find_pipeline(source, None, args.pipelines, workspace.name),
+        number=args.sources,
+    )
+
+    workspace.cleanup()
+
+    print(f"parse per source: {before / args.sources * 1e3:.3f} ms")
+    print(f"bind per source:  {after / args.sources * 1e3:.3f} ms")
+    print(f"speedup:          {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
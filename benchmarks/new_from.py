@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (c) 2023 Sorcero, Inc.
+#
+# This file is part of Sorcero's Language Intelligence platform
+# (see https://www.sorcero.com).
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+
+# runs the pipeline over the PDF and prints the time per step and peak memory
+RUN = """
+import resource
+import sys
+import tempfile
+import time
+
+from ingestum import engine
+from ingestum import manifests
+from ingestum import pipelines
+
+pipeline = pipelines.Base.parse_file(sys.argv[1])
+source = manifests.sources.PDF(
+    id="",
+    pipeline=pipeline.name,
+    location=manifests.sources.locations.Local(path=sys.argv[2]),
+    destination=manifests.sources.destinations.Void(),
+)
+steps = sum(len(pipe.steps) for pipe in pipeline.pipes)
+
+with tempfile.TemporaryDirectory() as workspace:
+    start = time.perf_counter()
+    engine.run(
+        manifest=manifests.Base(sources=[source]),
+        pipelines=[pipeline],
+        pipelines_dir=None,
+        workspace_dir=workspace,
+    )
+    elapsed = time.perf_counter() - start
+
+print(elapsed / steps, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def measure(copy_on_write, pipeline, pdf, runs):
+    env = dict(os.environ, INGESTUM_COPY_ON_WRITE=copy_on_write)
+    timings = []
+    peaks = []
+
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", RUN, pipeline, pdf],
+            env=env,
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True,
+        ).stdout.split()
+        timings.append(float(output[-2]))
+        peaks.append(int(output[-1]))
+
+    return statistics.median(timings), max(peaks)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pipeline", default="tests/pipelines/pipeline_pdf.json")
+    parser.add_argument("--pdf", default="tests/data/test.pdf")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    before, before_peak = measure("0", args.pipeline, args.pdf, args.runs)
+    after, after_peak = measure("1", args.pipeline, args.pdf, args.runs)
+
+    print(
+        f"deep copies:   {before * 1e3:.1f} ms per step, {before_peak / 1024:.0f} MB peak"
+    )
+    print(
+        f"copy-on-write: {after * 1e3:.1f} ms per step, {after_peak / 1024:.0f} MB peak"
+    )
+    print(f"speedup:       {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
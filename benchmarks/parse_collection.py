@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (c) 2023 Sorcero, Inc.
+#
+# This file is part of Sorcero's Language Intelligence platform
+# (see https://www.sorcero.com).
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import os
+import argparse
+import tempfile
+import timeit
+
+from pydantic import create_model
+from typing import List, Union
+
+from ingestum import documents
+from ingestum.utils import find_subclasses
+
+
+def make_collection(items):
+    return documents.Collection.new_from(
+        None,
+        content=[
+            documents.Publication.new_from(
+                None,
+                title=f"Publication {index}",
+                abstract="Lorem ipsum dolor sit amet.",
+                keywords=["lorem", "ipsum"],
+                authors=[documents.publication.Author(name="Doe, J.")],
+                journal="Journal",
+            )
+            for index in range(items)
+        ],
+    )
+
+
+def make_union_collection():
+    # how collections used to validate their content, one member at a time
+    __documents__ = tuple(find_subclasses(documents.Base))
+    return create_model(
+        "UnionCollection",
+        __base__=documents.Collection,
+        content=(List[Union[__documents__]], []),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=50000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    workspace = tempfile.TemporaryDirectory()
+    path = os.path.join(workspace.name, "collection.json")
+    with open(path, "w") as collection_file:
+        collection_file.write(make_collection(args.items).json())
+
+    union_collection = make_union_collection()
+
+    before = timeit.timeit(lambda: union_collection.parse_file(path), number=args.runs)
+    after = timeit.timeit(
+        lambda: documents.Collection.parse_file(path), number=args.runs
+    )
+
+    workspace.cleanup()
+
+    print(f"union per parse:    {before / args.runs:.3f} s")
+    print(f"dispatch per parse: {after / args.runs:.3f} s")
+    print(f"speedup:            {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (c) 2023 Sorcero, Inc.
+#
+# This file is part of Sorcero's Language Intelligence platform
+# (see https://www.sorcero.com).
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import sys
+import argparse
+import statistics
+import subprocess
+import time
+
+LAZY = "import ingestum.engine"
+
+# what every process paid before transformers were loaded on demand
+EAGER = """
+import ingestum.engine
+from ingestum import transformers
+for name in transformers.__transformers__:
+    getattr(transformers, name)
+"""
+
+
+def measure(code, runs):
+    timings = []
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        timings.append(time.perf_counter() - start)
+
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    before = measure(EAGER, args.runs)
+    after = measure(LAZY, args.runs)
+
+    print(f"eager import: {before * 1e3:.0f} ms")
+    print(f"lazy import:  {after * 1e3:.0f} ms")
+    print(f"speedup:      {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
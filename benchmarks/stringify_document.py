@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (c) 2023 Sorcero, Inc.
+#
+# This file is part of Sorcero's Language Intelligence platform
+# (see https://www.sorcero.com).
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import json
+import argparse
+import timeit
+import tracemalloc
+
+from ingestum import documents
+from ingestum.utils import stringify_document
+
+
+def make_collection(items):
+    return documents.Collection.new_from(
+        None,
+        content=[
+            documents.Publication.new_from(
+                None,
+                title=f"Publication {index}",
+                abstract="Lorem ipsum dolor sit amet.",
+                keywords=["lorem", "ipsum"],
+                authors=[documents.publication.Author(name="Doe, J.")],
+                journal="Journal",
+            )
+            for index in range(items)
+        ],
+    )
+
+
+def dumps(document, formatted):
+    # how documents used to be serialized, through a dict() copy
+    params = {"indent": 4, "sort_keys": True} if formatted else {}
+    return json.dumps(document.dict(), ensure_ascii=False, **params)
+
+
+def measure(function, collection, formatted, runs):
+    seconds = timeit.timeit(lambda: function(collection, formatted), number=runs)
+
+    tracemalloc.start()
+    function(collection, formatted)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return seconds / runs, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=50000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    collection = make_collection(args.items)
+
+    for formatted in (False, True):
+        before, before_peak = measure(dumps, collection, formatted, args.runs)
+        after, after_peak = measure(
+            stringify_document, collection, formatted, args.runs
+        )
+
+        mode = "formatted" if formatted else "compact"
+        print(f"{mode} dict() per dump:  {before:.3f} s, {before_peak >> 20} MB peak")
+        print(f"{mode} fields per dump:  {after:.3f} s, {after_peak >> 20} MB peak")
+        print(f"{mode} speedup:          {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (c) 2023 Sorcero, Inc.
+#
+# This file is part of Sorcero's Language Intelligence platform
+# (see https://www.sorcero.com).
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import argparse
+import timeit
+
+from ingestum import documents
+from ingestum import transformers
+
+
+def make_collection(items):
+    return documents.Collection.new_from(
+        None,
+        content=[
+            documents.Text.new_from(
+                None, content=f"Lorem ipsum dolor sit amet {index}."
+            )
+            for index in range(items)
+        ],
+    )
+
+
+def build(collection):
+    # how most pipelines turn texts into passages
+    return transformers.CollectionDocumentTransform(
+        transformer=transformers.TextCreatePassageDocument()
+    ).transform(collection=collection)
+
+
+def measure(validate, collection, runs):
+    documents.base.VALIDATE = validate
+    return timeit.timeit(lambda: build(collection), number=runs) / runs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--passages", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    collection = make_collection(args.passages)
+
+    before = measure(True, collection, args.runs)
+    after = measure(False, collection, args.runs)
+
+    print(f"validated per build: {before:.3f} s")
+    print(f"trusted per build:   {after:.3f} s")
+    print(f"speedup:             {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (c) 2023 Sorcero, Inc.
+#
+# This file is part of Sorcero's Language Intelligence platform
+# (see https://www.sorcero.com).
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import argparse
+import concurrent.futures
+import multiprocessing
+import statistics
+import tempfile
+import time
+
+from ingestum import engine
+from ingestum import manifests
+from ingestum import pipelines
+
+
+def manifest(pipeline, sources):
+    return manifests.Base(
+        sources=[
+            manifests.sources.CSV(
+                id=f"{index}",
+                pipeline=pipeline.name,
+                location=manifests.sources.locations.Local(path="tests/data/test.csv"),
+                destination=manifests.sources.destinations.Void(),
+            )
+            for index in range(sources)
+        ]
+    )
+
+
+def cold(pipeline, sources, jobs):
+    # every worker starts from scratch, importing and loading on its own
+    executor = concurrent.futures.ProcessPoolExecutor(
+        jobs, mp_context=multiprocessing.get_context("spawn")
+    )
+
+    with tempfile.TemporaryDirectory() as workspace:
+        engine.run(
+            manifest=manifest(pipeline, sources),
+            pipelines=[pipeline],
+            pipelines_dir=None,
+            workspace_dir=workspace,
+            executor=executor,
+        )
+
+    executor.shutdown()
+
+
+def warm(pipeline, sources, jobs):
+    with tempfile.TemporaryDirectory() as workspace:
+        engine.run(
+            manifest=manifest(pipeline, sources),
+            pipelines=[pipeline],
+            pipelines_dir=None,
+            workspace_dir=workspace,
+            jobs=jobs,
+            warm=True,
+        )
+
+
+def measure(function, pipeline, sources, jobs, runs):
+    timings = []
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        function(pipeline, sources, jobs)
+        timings.append((time.perf_counter() - start) / sources)
+
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sources", type=int, default=20)
+    parser.add_argument("--jobs", type=int, default=4)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    pipeline = pipelines.Base.parse_file("tests/pipelines/pipeline_csv.json")
+
+    before = measure(cold, pipeline, args.sources, args.jobs, args.runs)
+    after = measure(warm, pipeline, args.sources, args.jobs, args.runs)
+
+    print(f"spawned pool: {before * 1e3:.1f} ms per source")
+    print(f"warm pool:    {after * 1e3:.1f} ms per source")
+    print(f"speedup:      {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -25,6 +25,8 @@ import os
 import json_logging
 import logging
 
+__version__ = "2.15.0"
+
 # XXX there should be a better way
 if json_logging._current_framework is None:
     json_logging.init_non_web(enable_json=True)
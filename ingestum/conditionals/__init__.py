@@ -39,6 +39,8 @@ from . import collection_has_document_with_conditional
 
 BaseConditional = base.BaseConditional
 
+registry = base.registry
+
 AllNegate = all_negate.Conditional
 AllAnd = all_and.Conditional
 AllOr = all_or.Conditional
@@ -24,14 +24,12 @@
 import os
 
 from pydantic import BaseModel
-from typing import Optional, Union
+from typing import Optional
 from typing_extensions import Literal
 
-from .base import BaseConditional
-from ..utils import find_subclasses
+from .base import BaseConditional, registry
 
 __script__ = os.path.basename(__file__).replace(".py", "")
-__conditionals__ = tuple(list(find_subclasses(BaseConditional)) + ["Conditional"])
 
 
 class Conditional(BaseConditional):
@@ -43,7 +41,9 @@ class Conditional(BaseConditional):
     """
 
     class ArgumentsModel(BaseModel):
-        conditional: Union[__conditionals__]
+        conditional: BaseConditional
+
+        validate_conditional = registry.validator("conditional")
 
     class InputsModel(BaseModel):
         pass
@@ -54,7 +54,3 @@ class Conditional(BaseConditional):
 
     def evaluate(self, document):
         return not self.arguments.conditional.evaluate(document)
-
-
-Conditional.ArgumentsModel.update_forward_refs()
-Conditional.update_forward_refs()
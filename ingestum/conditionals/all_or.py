@@ -24,14 +24,12 @@
 import os
 
 from pydantic import BaseModel
-from typing import Optional, Union
+from typing import Optional
 from typing_extensions import Literal
 
-from .base import BaseConditional
-from ..utils import find_subclasses
+from .base import BaseConditional, registry
 
 __script__ = os.path.basename(__file__).replace(".py", "")
-__conditionals__ = tuple(list(find_subclasses(BaseConditional)) + ["Conditional"])
 
 
 class Conditional(BaseConditional):
@@ -45,8 +43,12 @@ class Conditional(BaseConditional):
     """
 
     class ArgumentsModel(BaseModel):
-        left_conditional: Union[__conditionals__]
-        right_conditional: Union[__conditionals__]
+        left_conditional: BaseConditional
+        right_conditional: BaseConditional
+
+        validate_conditionals = registry.validator(
+            "left_conditional", "right_conditional"
+        )
 
     class InputsModel(BaseModel):
         pass
@@ -59,7 +61,3 @@ class Conditional(BaseConditional):
         return self.arguments.left_conditional.evaluate(
             document
         ) or self.arguments.right_conditional.evaluate(document)
-
-
-Conditional.ArgumentsModel.update_forward_refs()
-Conditional.update_forward_refs()
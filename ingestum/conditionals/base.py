@@ -26,6 +26,8 @@ import os
 from pydantic import BaseModel
 from typing_extensions import Literal
 
+from ..utils import Registry
+
 __script__ = os.path.basename(__file__).replace(".py", "")
 
 
@@ -74,3 +76,6 @@ class BaseConditional(BaseModel):
 
     def evaluate(self, **kargs):
         self.InputsModel.validate(kargs)
+
+
+registry = Registry(BaseConditional)
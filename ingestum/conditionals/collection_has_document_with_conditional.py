@@ -24,15 +24,13 @@
 import os
 
 from pydantic import BaseModel
-from typing import Optional, Union
+from typing import Optional
 from typing_extensions import Literal
 
 from .. import documents
-from .base import BaseConditional
-from ..utils import find_subclasses
+from .base import BaseConditional, registry
 
 __script__ = os.path.basename(__file__).replace(".py", "")
-__conditionals__ = tuple(list(find_subclasses(BaseConditional)) + ["Conditional"])
 
 
 class Conditional(BaseConditional):
@@ -44,7 +42,9 @@ class Conditional(BaseConditional):
     """
 
     class ArgumentsModel(BaseModel):
-        conditional: Union[__conditionals__]
+        conditional: BaseConditional
+
+        validate_conditional = registry.validator("conditional")
 
     class InputsModel(BaseModel):
         document: documents.Collection
@@ -61,7 +61,3 @@ class Conditional(BaseConditional):
                 return True
 
         return False
-
-
-Conditional.ArgumentsModel.update_forward_refs()
-Conditional.update_forward_refs()
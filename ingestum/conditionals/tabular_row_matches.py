@@ -24,15 +24,13 @@
 import os
 
 from pydantic import BaseModel
-from typing import Optional, Union
+from typing import Optional
 from typing_extensions import Literal
 
-from .base import BaseConditional
+from .base import BaseConditional, registry
 from .. import documents
-from ..utils import find_subclasses
 
 __script__ = os.path.basename(__file__).replace(".py", "")
-__conditionals__ = tuple(find_subclasses(BaseConditional))
 
 
 class Conditional(BaseConditional):
@@ -47,7 +45,9 @@ class Conditional(BaseConditional):
 
     class ArgumentsModel(BaseModel):
         row: int
-        conditional: Union[__conditionals__]
+        conditional: BaseConditional
+
+        validate_conditional = registry.validator("conditional")
 
     class InputsModel(BaseModel):
         document: documents.Tabular
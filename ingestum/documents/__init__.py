@@ -41,6 +41,8 @@ manager.default.register(sys.modules[__name__], "documents", base.BaseDocument)
 from . import collection
 
 
+registry = base.registry
+
 Base = base.BaseDocument
 Form = form.Document
 HTML = html.Document
@@ -51,3 +53,8 @@ Collection = collection.Document
 Tabular = tabular.Document
 Resource = resource.Document
 Publication = publication.Document
+
+
+def __getattr__(name):
+    # plugin classes are imported on first use
+    return manager.default.resolve(__name__, name)
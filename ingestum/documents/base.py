@@ -21,12 +21,129 @@
 #
 
 
+import os
 import copy
+import functools
 
 from pydantic import BaseModel
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON
 from typing import Any, Optional
 
 from .. import sources
+from ..plugins import manager
+from ..utils import Registry
+
+# derived documents can share, rather than copy, what they take from the
+# documents they derive from, see derive()
+COPY_ON_WRITE = os.environ.get("INGESTUM_COPY_ON_WRITE", "0") == "1"
+
+# documents built by Ingestum itself skip validating values that already
+# have the type of their field, see BaseDocument.trusted()
+VALIDATE = os.environ.get("INGESTUM_VALIDATE_DOCUMENTS", "0") == "1"
+
+
+def derive(value):
+    """
+    Returns a value taken from a document for a document derived from it,
+    i.e., a deep copy of the value.
+
+    Sharing can be turned on by setting the ``INGESTUM_COPY_ON_WRITE``
+    environment variable to ``1``, so the value itself is shared by both
+    documents instead. Ingestum transformers never change documents in
+    place, they copy whatever part they change first, but plugins must do
+    the same for sharing to be safe.
+
+    :param value: Value taken from the document derived from
+    :type value: Any
+    """
+
+    if COPY_ON_WRITE:
+        return value
+    return copy.deepcopy(value)
+
+
+def _is_model(type_):
+    return isinstance(type_, type) and issubclass(type_, BaseModel)
+
+
+@functools.lru_cache(maxsize=None)
+def _checks(model):
+    """
+    Returns, for every field of the model, a check telling whether a value
+    can be taken as it is, computed once per model.
+    """
+
+    checks = {}
+
+    for name, field in model.__fields__.items():
+        type_ = field.type_
+        if type_ is Any:
+            check = None
+        elif _is_model(type_):
+            check = functools.partial(_isinstance, type_)
+        elif isinstance(type_, type):
+            check = functools.partial(_is, type_)
+        else:
+            check = _never
+
+        if check is not None and field.shape == SHAPE_LIST:
+            check = functools.partial(_all, check)
+        elif check is not None and field.shape != SHAPE_SINGLETON:
+            check = _never
+
+        checks[name] = (field, check)
+
+    return checks
+
+
+def _isinstance(type_, value):
+    return isinstance(value, type_)
+
+
+def _is(type_, value):
+    return type(value) is type_
+
+
+def _all(check, value):
+    return type(value) is list and all(check(v) for v in value)
+
+
+def _never(value):
+    return False
+
+
+def _construct(model, values):
+    fields = {}
+
+    for name, (field, check) in _checks(model).items():
+        if name not in values:
+            if field.required:
+                return model(**values)
+            fields[name] = field.get_default()
+            continue
+
+        value = values[name]
+        if check is None or (value is None and field.allow_none) or check(value):
+            pass
+        elif (
+            field.shape == SHAPE_SINGLETON
+            and _is_model(field.type_)
+            and isinstance(value, dict)
+            and not field.pre_validators
+        ):
+            value = _construct(field.type_, value)
+        else:
+            value, errors = field.validate(value, fields, loc=name, cls=model)
+            if errors:
+                # let pydantic report every error
+                return model(**values)
+        fields[name] = value
+
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", fields)
+    object.__setattr__(instance, "__fields_set__", values.keys() & fields.keys())
+
+    return instance
 
 
 class BaseDocument(BaseModel):
@@ -76,7 +193,7 @@ class BaseDocument(BaseModel):
         if "content" in kargs:
             pass
         elif isinstance(_object, cls) and hasattr(_object, "content"):
-            kargs["content"] = copy.deepcopy(_object.content)
+            kargs["content"] = derive(_object.content)
 
         kargs["context"] = kargs.get("context", {})
         if isinstance(_object, BaseDocument) and _object.context:
@@ -96,4 +213,29 @@ class BaseDocument(BaseModel):
         if isinstance(_object, sources.Local):
             kargs["source"] = _object.uri
 
-        return cls(**kargs)
+        return cls.trusted(**kargs)
+
+    @classmethod
+    def trusted(cls, **values):
+        """
+        Creates a document from values produced by Ingestum itself, e.g., by
+        transformers. Values that already have the type of their field, like
+        the documents of a collection, are taken as they are instead of being
+        validated, and copied, again. Nested models given as dictionaries are
+        built the same way, any other value still goes through validation,
+        and missing fields get their defaults.
+
+        Full validation can be forced by setting the
+        ``INGESTUM_VALIDATE_DOCUMENTS`` environment variable to ``1``, e.g.,
+        in tests.
+        """
+
+        if VALIDATE:
+            return cls(**values)
+
+        return _construct(cls, values)
+
+
+registry = Registry(
+    BaseDocument, loader=functools.partial(manager.default.load, "documents")
+)
@@ -21,15 +21,11 @@
 #
 
 
-from .base import BaseDocument
+from .base import BaseDocument, registry
 
-from typing import List, Union
+from typing import List
 from typing_extensions import Literal
 
-from ..utils import find_subclasses
-
-__documents__ = tuple(list(find_subclasses(BaseDocument)) + ["Document"])
-
 
 class Document(BaseDocument):
     """
@@ -50,7 +46,6 @@ class Document(BaseDocument):
     """
 
     type: Literal["collection"] = "collection"
-    content: List[Union[__documents__]] = []
-
+    content: List[BaseDocument] = []
 
-Document.update_forward_refs()
+    validate_content = registry.validator("content")
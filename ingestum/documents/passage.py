@@ -21,8 +21,7 @@
 #
 
 
-import copy
-
+from .base import derive
 from .text import Document as TextDocument
 from pydantic import BaseModel
 from typing import Optional, List
@@ -218,16 +217,16 @@ class Document(TextDocument):
         if "metadata" in kargs:
             pass
         elif hasattr(_object, "metadata"):
-            kargs["metadata"] = copy.deepcopy(_object.metadata)
+            kargs["metadata"] = derive(_object.metadata)
 
         if "styling" in kargs:
             pass
         elif hasattr(_object, "styling"):
-            kargs["styling"] = copy.deepcopy(_object.styling)
+            kargs["styling"] = derive(_object.styling)
 
         if "dimensions" in kargs:
             pass
         elif hasattr(_object, "dimensions"):
-            kargs["dimensions"] = copy.deepcopy(_object.dimensions)
+            kargs["dimensions"] = derive(_object.dimensions)
 
         return super().new_from(_object, **kargs)
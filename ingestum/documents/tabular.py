@@ -21,12 +21,10 @@
 #
 
 
-import copy
-
 from typing import List, Optional
 from typing_extensions import Literal
 
-from .base import BaseDocument
+from .base import BaseDocument, derive
 from .resource import PDFContext
 
 
@@ -76,6 +74,6 @@ class Document(BaseDocument):
         if "pdf_context" in kargs:
             pass
         elif hasattr(_object, "pdf_context"):
-            kargs["pdf_context"] = copy.deepcopy(_object.pdf_context)
+            kargs["pdf_context"] = derive(_object.pdf_context)
 
         return super().new_from(_object, **kargs)
@@ -21,9 +21,7 @@
 #
 
 
-import copy
-
-from .base import BaseDocument
+from .base import BaseDocument, derive
 from .resource import PDFContext
 
 from typing import Optional
@@ -60,6 +58,6 @@ class Document(BaseDocument):
         if "pdf_context" in kargs:
             pass
         elif hasattr(_object, "pdf_context"):
-            kargs["pdf_context"] = copy.deepcopy(_object.pdf_context)
+            kargs["pdf_context"] = derive(_object.pdf_context)
 
         return super().new_from(_object, **kargs)
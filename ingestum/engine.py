@@ -22,17 +22,40 @@
 
 
 import os
-import copy
+import asyncio
+import functools
+import contextlib
+import concurrent.futures
 import pathlib
 import logging
 import tempfile
+import threading
+import time
+import collections
+import fcntl
+import gc
+import hashlib
+import multiprocessing
+import shutil
 
+import psutil
+
+from ingestum import errors
+from ingestum import instrumentation
 from ingestum import pipelines
+from ingestum.pipelines import optimizer
 from ingestum import transformers
+from ingestum.journal import Journal, fingerprint, pipeline_json
 
 
 __logger__ = logging.getLogger("ingestum")
 
+POOLS = {
+    transformers.base.CPU: os.cpu_count(),
+    transformers.base.IO: 32,
+    transformers.base.MEMORY: 1,
+}
+
 
 def prepare_transformer(source, transformer, output_directory):
     for attribute in transformer.arguments.__dict__.keys():
@@ -55,118 +78,686 @@ def prepare_pineline(source, pipeline, output_directory):
             prepare_transformer(source, transformer, output_directory)
 
 
-def find_pipeline(source, _pipelines, pipelines_dir, output_directory):
+def bind_transformer(source, transformer, output_directory):
+    """
+    Same as :func:`prepare_transformer`, but leaves the given transformer
+    untouched and returns a shallow copy carrying the substitutions instead.
+    """
+
+    update = {}
+
+    for attribute in transformer.arguments.__dict__.keys():
+        value = getattr(transformer.arguments, attribute)
+        if isinstance(value, transformers.base.BaseTransformer):
+            update[attribute] = bind_transformer(source, value, output_directory)
+            continue
+        if hasattr(source, attribute) and value == getattr(
+            source, f"{attribute}_placeholder"
+        ):
+            update[attribute] = getattr(source, attribute)
+        # XXX make sure directories ARE contained in workspace
+        if attribute == "directory":
+            update[attribute] = output_directory
+
+    arguments = transformer.arguments
+    if update:
+        arguments = arguments.copy(update=update)
+
+    return transformer.copy(update={"arguments": arguments})
+
+
+def bind_pipeline(source, pipeline, output_directory):
+    """
+    Same as :func:`prepare_pineline`, but leaves the given pipeline untouched,
+    so it can be shared as a template by every source.
+    """
+
+    pipes = []
+
+    for pipe in pipeline.pipes:
+        steps = [bind_transformer(source, t, output_directory) for t in pipe.steps]
+        pipes.append(pipe.copy(update={"steps": steps}))
+
+    return pipeline.copy(update={"pipes": pipes})
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_pipeline(path, mtime):
+    return pipelines.Base.parse_file(path)
+
+
+def load_pipeline(path):
+    """
+    Parses a pipeline file, re-using the pipeline parsed earlier as long as
+    the file has not been modified since.
+
+    The returned pipeline is shared and must not be modified, see
+    :func:`bind_pipeline`.
+
+    :param path: Path to the pipeline file
+    :type path: str
+
+    :return: The parsed pipeline
+    :rtype: pipelines.base.Pipeline
+    """
+
+    return _parse_pipeline(path, os.stat(path).st_mtime_ns)
+
+
+def _find_template(source, _pipelines, pipelines_dir):
     pipeline = None
 
     if _pipelines is not None:
         pipeline = next(
             (p for p in _pipelines if source.pipeline == p.name), None
         )  # noqa: E501
-        pipeline = copy.deepcopy(pipeline) if pipeline else None
 
     if pipeline is None and pipelines_dir is not None:
         pipeline_path = os.path.join(pipelines_dir, f"{source.pipeline}.json")
-        pipeline = pipelines.Base.parse_file(pipeline_path)
+        pipeline = load_pipeline(pipeline_path)
+
+    return pipeline
+
+
+def find_pipeline(source, _pipelines, pipelines_dir, output_directory, optimize=False):
+    pipeline = _find_template(source, _pipelines, pipelines_dir)
 
     if pipeline is not None:
-        prepare_pineline(source, pipeline, output_directory)
+        pipeline = bind_pipeline(source, pipeline, output_directory)
+        if optimize:
+            pipeline = pipelines.optimize(pipeline)
 
     return pipeline
 
 
-def run_source(
-    source, pipelines, pipelines_dir, cache_dir, artifacts_dir, workspace_dir
-):
+def _pipes_cache(cache_dir, pipes_cache_size):
+    if pipes_cache_size is None:
+        return None
+
+    directory = os.path.join(cache_dir, "pipes")
+    return pipelines.Cache(directory, pipes_cache_size)
+
+
+@contextlib.contextmanager
+def _pipes_executor(pipes_jobs, pipes_pool):
+    if pipes_jobs is None or pipes_jobs <= 1:
+        yield None
+        return
+
+    if pipes_pool == "process":
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=pipes_jobs)
+    else:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=pipes_jobs)
+
+    with executor:
+        yield executor
+
+
+def _source_directories(source, workspace_dir):
     source_directory = os.path.join(workspace_dir, source.id)
     pathlib.Path(source_directory).mkdir(parents=True, exist_ok=True)
 
     output_directory = os.path.join(source_directory, "output")
     pathlib.Path(output_directory).mkdir(parents=True, exist_ok=True)
 
-    pipeline = find_pipeline(
-        source, pipelines, pipelines_dir, output_directory
-    )  # noqa: E501
-    document = pipeline.run(source_directory, source, cache_dir)
-    artifact_location, document_location = source.destination.store(
-        document, output_directory, artifacts_dir
+    return source_directory, output_directory
+
+
+def _log_cache(source, cache):
+    if cache is None:
+        return
+
+    __logger__.info(
+        "cached",
+        extra={
+            "props": {
+                "source": source.id,
+                "hits": cache.hits,
+                "misses": cache.misses,
+            }
+        },
     )
 
+
+def run_source(
+    source,
+    pipelines,
+    pipelines_dir,
+    cache_dir,
+    artifacts_dir,
+    workspace_dir,
+    pipes_cache_size=None,
+    pipes_jobs=None,
+    pipes_pool="thread",
+    sink=None,
+    optimize=False,
+):
+    with instrumentation.traced(sink, "source", source.id, source=source.id):
+        source_directory, output_directory = _source_directories(source, workspace_dir)
+
+        pipeline = find_pipeline(
+            source, pipelines, pipelines_dir, output_directory, optimize
+        )  # noqa: E501
+        cache = _pipes_cache(cache_dir, pipes_cache_size)
+        with _pipes_executor(pipes_jobs, pipes_pool) as executor:
+            document = pipeline.run(
+                source_directory,
+                source,
+                cache_dir,
+                cache=cache,
+                executor=executor,
+                sink=sink,
+            )
+        _log_cache(source, cache)
+        with instrumentation.traced(
+            sink, "store", source.destination.type, source=source.id
+        ):
+            artifact_location, document_location = source.destination.store(
+                document, output_directory, artifacts_dir
+            )
+
     return document, artifact_location, document_location
 
 
-def run(manifest, pipelines, pipelines_dir, artifacts_dir=None, workspace_dir=None):
-    documents = []
-    artifacts_locations = []
-    documents_locations = []
+async def arun_source(
+    source,
+    pipelines,
+    pipelines_dir,
+    cache_dir,
+    artifacts_dir,
+    workspace_dir,
+    pipes_cache_size=None,
+    executor=None,
+    io_executor=None,
+    sink=None,
+    optimize=False,
+):
+    """
+    Coroutine version of :func:`run_source`, see
+    :meth:`pipelines.base.Pipeline.arun` for ``executor`` and ``io_executor``.
+    """
 
-    # Allow our API clients to not-have to provide any filesystem-specific data
-    if artifacts_dir is None:
-        artifacts_tmp = tempfile.TemporaryDirectory()
-        artifacts_dir = artifacts_tmp.name
-    if workspace_dir is None:
-        workspace_tmp = tempfile.TemporaryDirectory()
-        workspace_dir = workspace_tmp.name
+    loop = asyncio.get_running_loop()
 
-    cache_dir = os.path.join(workspace_dir, "cache")
-    pathlib.Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    with instrumentation.traced(sink, "source", source.id, source=source.id):
+        source_directory, output_directory = _source_directories(source, workspace_dir)
 
-    for index, source in enumerate(manifest.sources):
-        __logger__.info(
-            "processing",
+        pipeline = find_pipeline(
+            source, pipelines, pipelines_dir, output_directory, optimize
+        )
+        cache = _pipes_cache(cache_dir, pipes_cache_size)
+        document = await pipeline.arun(
+            source_directory,
+            source,
+            cache_dir,
+            cache=cache,
+            executor=executor,
+            io_executor=io_executor,
+            sink=sink,
+        )
+        _log_cache(source, cache)
+        with instrumentation.traced(
+            sink, "store", source.destination.type, source=source.id
+        ):
+            artifact_location, document_location = await loop.run_in_executor(
+                io_executor,
+                source.destination.store,
+                document,
+                output_directory,
+                artifacts_dir,
+            )
+
+    return document, artifact_location, document_location
+
+
+def _kill(process):
+    try:
+        children = psutil.Process(process.pid).children(recursive=True)
+    except psutil.NoSuchProcess:
+        children = []
+
+    for child in children:
+        with contextlib.suppress(psutil.NoSuchProcess):
+            child.kill()
+    process.kill()
+    process.join()
+
+
+def _killable_target(connection, function, source, args, kargs):
+    lock = threading.Lock()
+
+    def observer(pipe, index, transformer):
+        _type = transformer.type if transformer is not None else None
+        with lock:
+            connection.send(("step", pipe, index, _type))
+
+    try:
+        with pipelines.base.observed(observer):
+            result = function(source, *args, **kargs)
+    except Exception as e:
+        message = ("error", e)
+    else:
+        message = ("result", result)
+
+    with lock:
+        try:
+            connection.send(message)
+        except Exception as e:
+            # e.g., exceptions that can't be pickled
+            error = message[1] if message[0] == "error" else e
+            connection.send(("error", RuntimeError(str(error))))
+    connection.close()
+
+
+def _run_killable(function, step_timeouts, start_method, source, *args, **kargs):
+    """
+    Runs function in a child process, started with ``start_method``, that is
+    killed, along with its own children, once the manifest source has been
+    processed for longer than its ``timeout``, or a step of its pipeline for
+    longer than given in ``step_timeouts`` for that transformer type. Worker
+    processes of pools can run it too, their children are not daemonic.
+
+    :raises errors.SourceTimeoutError: With the step that was running
+    """
+
+    if source.timeout is None and not step_timeouts:
+        return function(source, *args, **kargs)
+
+    context = multiprocessing.get_context(start_method)
+    reader, writer = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_killable_target, args=(writer, function, source, args, kargs)
+    )
+    process.start()
+    writer.close()
+
+    started = time.time()
+    steps = {}
+
+    try:
+        while True:
+            deadlines = []
+            if source.timeout is not None:
+                deadlines.append((started + source.timeout, source.timeout, None))
+            for pipe, (index, _type, _started) in steps.items():
+                if _type in step_timeouts:
+                    seconds = step_timeouts[_type]
+                    deadlines.append((_started + seconds, seconds, pipe))
+
+            deadline = min(deadlines, key=lambda d: d[0]) if deadlines else None
+            wait = max(deadline[0] - time.time(), 0) if deadline else None
+
+            if not reader.poll(wait):
+                _, seconds, pipe = deadline
+                # report the step running in the pipe that timed out, or the
+                # last one started when it's the whole source
+                if pipe is None and steps:
+                    pipe = max(steps, key=lambda p: steps[p][2])
+                index, _type, _ = steps.get(pipe, (None, None, None))
+                raise errors.SourceTimeoutError(source.id, seconds, pipe, index, _type)
+
+            try:
+                message = reader.recv()
+            except EOFError:
+                process.join()
+                raise RuntimeError(f"worker exited with code {process.exitcode}")
+
+            kind, *body = message
+            if kind == "step":
+                pipe, index, _type = body
+                if _type is None:
+                    steps.pop(pipe, None)
+                else:
+                    steps[pipe] = (index, _type, time.time())
+                continue
+
+            process.join()
+            if kind == "error":
+                raise body[0]
+            return body[0]
+    except errors.SourceTimeoutError as e:
+        _kill(process)
+        __logger__.error(
+            "timeout",
             extra={
                 "props": {
                     "source": source.id,
-                    "progress": f"{index + 1}/{len(manifest.sources)}",
+                    "seconds": e.seconds,
+                    "pipe": e.pipe,
+                    "step": e.step,
+                    "transformer": e.transformer,
                 }
             },
         )
+        raise
+    finally:
+        reader.close()
+        if process.is_alive():
+            _kill(process)
 
-        document, artifact_location, document_location = run_source(
-            source,
-            pipelines,
-            pipelines_dir,
-            cache_dir,
-            artifacts_dir,
-            workspace_dir,
+
+def _has_timeouts(manifest, step_timeouts):
+    return bool(step_timeouts) or any(
+        source.timeout is not None for source in manifest.sources
+    )
+
+
+def _killable(function, step_timeouts, start_method=None):
+    return functools.partial(_run_killable, function, step_timeouts or {}, start_method)
+
+
+class _SharedLocation:
+    """
+    Stands for a location shared by several manifest sources. The location
+    is only fetched once, into a store directory, and every source gets a
+    hard link to the fetched file in its own directory, or the path to the
+    file in the store if a link can't be made. Fetched files are read-only,
+    so sources can't modify each other's input, and links are removed once
+    the run ends, see :meth:`unlink`.
+
+    Fetches are serialized with a lock file in the store directory, so the
+    location can be shared by threads and processes alike.
+
+    :param location: Location shared by the sources
+    :type location: manifests.sources.locations.base.BaseLocation
+    :param directory: Path to the store directory for this location
+    :type directory: str
+    """
+
+    def __init__(self, location, directory):
+        self.location = location
+        self.directory = os.path.abspath(directory)
+
+    @property
+    def uri(self):
+        return self.location.uri
+
+    @property
+    def prefetch(self):
+        return self.location.prefetch
+
+    def _fetch_once(self, cache_dir):
+        marker = os.path.join(self.directory, ".fetched")
+
+        with open(os.path.join(self.directory, ".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                if os.path.exists(marker):
+                    with open(marker) as file:
+                        return file.read()
+
+                path = self.location.fetch(self.directory, cache_dir)
+                if os.path.dirname(os.path.abspath(path)) == self.directory:
+                    os.chmod(path, 0o444)
+                with open(marker, "w") as file:
+                    file.write(path)
+
+                __logger__.info("shared", extra={"props": {"uri": self.uri}})
+                return path
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def fetch(self, output_dir, cache_dir=None):
+        path = self._fetch_once(cache_dir)
+
+        link = os.path.join(output_dir, os.path.basename(path))
+        if os.path.lexists(link):
+            os.remove(link)
+        try:
+            os.link(path, link)
+        except OSError:
+            return path
+        return link
+
+    async def afetch(self, output_dir, cache_dir=None, executor=None):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.fetch, output_dir, cache_dir)
+
+    def unlink(self, output_dir):
+        """
+        Removes the link to the fetched file made in the given directory, if
+        any, so later runs in the same workspace fetch a copy of their own
+        instead of writing through the read-only file.
+
+        :param output_dir: Path to the directory the location was fetched to
+        :type output_dir: str
+        """
+
+        marker = os.path.join(self.directory, ".fetched")
+        if not os.path.exists(marker):
+            return
+
+        with open(marker) as file:
+            path = file.read()
+
+        link = os.path.join(output_dir, os.path.basename(path))
+        if os.path.exists(link) and os.path.samefile(link, path):
+            os.remove(link)
+
+
+def _location_key(source):
+    location = getattr(source, "location", None)
+    if not getattr(location, "prefetch", False):
+        return None
+
+    return hashlib.sha256(location.json(sort_keys=True).encode("utf-8")).hexdigest()
+
+
+@contextlib.contextmanager
+def _shared_locations(sources, workspace_dir):
+    """
+    Yields the given manifest sources, with the locations that several of
+    them have in common replaced by a :class:`_SharedLocation`. The store
+    directory, and the links made to its files, are removed once done.
+    """
+
+    keys = [_location_key(source) for source in sources]
+    counts = collections.Counter(key for key in keys if key is not None)
+
+    if all(count < 2 for count in counts.values()):
+        yield list(sources)
+        return
+
+    store = tempfile.mkdtemp(prefix="locations-", dir=workspace_dir)
+    locations = {}
+    shared = []
+
+    try:
+        for source, key in zip(sources, keys):
+            if counts.get(key, 0) < 2:
+                shared.append(source)
+                continue
+
+            if key not in locations:
+                directory = os.path.join(store, key)
+                pathlib.Path(directory).mkdir()
+                locations[key] = _SharedLocation(source.location, directory)
+            shared.append(source.copy(update={"location": locations[key]}))
+
+        yield shared
+    finally:
+        for source in shared:
+            if isinstance(source.location, _SharedLocation):
+                source.location.unlink(os.path.join(workspace_dir, source.id))
+        shutil.rmtree(store, ignore_errors=True)
+
+
+def _size(path):
+    if os.path.isdir(path):
+        return sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, names in os.walk(path)
+            for name in names
         )
+    return os.path.getsize(path)
 
-        documents.append(document)
-        artifacts_locations.append(artifact_location)
-        documents_locations.append(document_location)
 
-    if "artifacts_tmp" in locals():
-        artifacts_tmp.cleanup()
-    if "workspace_tmp" in locals():
-        workspace_tmp.cleanup()
+class _Prefetcher:
+    """
+    Fetches the locations of the next manifest sources into their workspace
+    directories, in a pool of threads, so downloads overlap with processing
+    the current source. Only locations worth fetching ahead are prefetched,
+    see :attr:`manifests.sources.locations.base.BaseLocation.prefetch`.
 
-    return documents, artifacts_locations, documents_locations
+    :param sources: Manifest sources, in processing order
+    :type sources: List[manifests.sources.base.BaseSource]
+    :param workspace_dir: Path to the workspace directory
+    :type workspace_dir: str
+    :param cache_dir: Path to the directory for requests caching
+    :type cache_dir: str
+    :param ahead: Number of sources to prefetch ahead of the current one,
+        none if zero
+    :type ahead: int
+    :param max_size: Bytes that prefetched sources not processed yet can
+        take on disk before prefetching more. Sizes are only known once
+        fetched, so sources are then prefetched one at a time, and the
+        budget is exceeded by at most one source
+    :type max_size: Optional[int]
+    """
 
+    def __init__(self, sources, workspace_dir, cache_dir, ahead, max_size=None):
+        self.sources = sources
+        self.indexes = {id(s): i for i, s in enumerate(sources)}
+        self.workspace_dir = workspace_dir
+        self.cache_dir = cache_dir
+        self.ahead = ahead or 0
+        self.max_size = max_size
+        self.futures = {}
+        self.current = 0
+        self.next = 0
+        self.closed = False
+        # fetches completing in the pool schedule the next ones
+        self.lock = threading.RLock()
+        self.executor = None
+        if self.ahead > 0:
+            self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=ahead)
 
-def run_source_refs_only(
-    source, pipelines, pipelines_dir, cache_dir, artifacts_dir, workspace_dir
-):
-    source_directory = os.path.join(workspace_dir, source.id)
-    pathlib.Path(source_directory).mkdir(parents=True, exist_ok=True)
+    def __enter__(self):
+        return self
 
-    output_directory = os.path.join(source_directory, "output")
-    pathlib.Path(output_directory).mkdir(parents=True, exist_ok=True)
+    def __exit__(self, *args):
+        self.shutdown()
 
-    pipeline = find_pipeline(
-        source, pipelines, pipelines_dir, output_directory
-    )  # noqa: E501
-    document = pipeline.run(source_directory, source, cache_dir)
-    artifact_location, document_location = source.destination.store(
-        document, output_directory, artifacts_dir
-    )
+    def _fetch(self, source):
+        source_directory, _ = _source_directories(source, self.workspace_dir)
+        path = source.location.fetch(source_directory, self.cache_dir)
+        size = _size(path)
 
-    return artifact_location, document_location
+        __logger__.info(
+            "prefetched", extra={"props": {"source": source.id, "size": size}}
+        )
+        return path, size
 
+    def _prefetched_size(self):
+        return sum(
+            f.result()[1]
+            for f in self.futures.values()
+            if f.done() and not f.cancelled() and f.exception() is None
+        )
 
-def run_refs_only(
-    manifest, pipelines, pipelines_dir, artifacts_dir=None, workspace_dir=None
-):
-    artifacts_locations = []
-    documents_locations = []
+    def _in_flight(self):
+        return any(not f.done() for f in self.futures.values())
+
+    def _is_full(self):
+        if self.max_size is None:
+            return False
+        return self._in_flight() or self._prefetched_size() >= self.max_size
+
+    def _schedule(self, *args):
+        with self.lock:
+            last = min(self.current + self.ahead, len(self.sources) - 1)
+
+            while not self.closed and self.next <= last:
+                if self._is_full():
+                    break
+
+                index = self.next
+                # before the callback, which runs right away on quick fetches
+                self.next += 1
+
+                source = self.sources[index]
+                location = getattr(source, "location", None)
+                if getattr(location, "prefetch", False):
+                    future = self.executor.submit(self._fetch, source)
+                    self.futures[index] = future
+                    if self.max_size is not None:
+                        future.add_done_callback(self._schedule)
+
+    def get(self, source):
+        """
+        Prefetches the sources following the given one, and waits for its
+        own location, if it was prefetched.
+
+        :return: The manifest source, or a copy of it using its prefetched
+            location
+        :rtype: manifests.sources.base.BaseSource
+        """
+
+        if self.executor is None:
+            return source
+
+        index = self.indexes[id(source)]
+        with self.lock:
+            self.current = index
+            self.next = max(self.next, index + 1)
+            future = self.futures.pop(index, None)
+        self._schedule()
+
+        if future is None:
+            return source
+
+        try:
+            path, _ = future.result()
+        except Exception as e:
+            # left to fail, or succeed, when the source gets processed
+            __logger__.debug(
+                "prefetch failed",
+                extra={"props": {"source": source.id, "error": str(e)}},
+            )
+            return source
+
+        return source.fetched(path)
+
+    def shutdown(self):
+        if self.executor is None:
+            return
+
+        with self.lock:
+            self.closed = True
+            futures = list(self.futures.values())
+
+        for future in futures:
+            future.cancel()
+        self.executor.shutdown(wait=True)
+
+
+def _prefetched(prefetcher, function):
+    async def _function(source, *args, **kargs):
+        loop = asyncio.get_running_loop()
+        source = await loop.run_in_executor(None, prefetcher.get, source)
+        return await function(source, *args, **kargs)
+
+    return _function
+
+
+@contextlib.contextmanager
+def run_directories(artifacts_dir, workspace_dir):
+    """
+    Provides the directories sources are processed in, temporary ones,
+    removed on exit, when not given.
+
+    :param artifacts_dir: Path to the artifacts directory
+    :type artifacts_dir: Optional[str]
+    :param workspace_dir: Path to the workspace directory
+    :type workspace_dir: Optional[str]
+
+    :return: Paths to the artifacts, workspace and requests cache
+        directories
+    :rtype: Tuple[str, str, str]
+    """
+
+    artifacts_tmp = None
+    workspace_tmp = None
 
     # Allow our API clients to not-have to provide any filesystem-specific data
     if artifacts_dir is None:
@@ -179,32 +770,1186 @@ def run_refs_only(
     cache_dir = os.path.join(workspace_dir, "cache")
     pathlib.Path(cache_dir).mkdir(parents=True, exist_ok=True)
 
-    for index, source in enumerate(manifest.sources):
-        __logger__.info(
-            "processing",
-            extra={
-                "props": {
-                    "source": source.id,
-                    "progress": f"{index + 1}/{len(manifest.sources)}",
-                }
-            },
+    try:
+        yield artifacts_dir, workspace_dir, cache_dir
+    finally:
+        if artifacts_tmp is not None:
+            artifacts_tmp.cleanup()
+        if workspace_tmp is not None:
+            workspace_tmp.cleanup()
+
+
+def _is_parallel(jobs, executor, pools=None):
+    return pools is not None or executor is not None or (jobs is not None and jobs > 1)
+
+
+def _interrupts(error, parallel):
+    # failing sources interrupt sequential runs, unless they timed out
+    return (
+        error is not None
+        and not parallel
+        and not isinstance(error, errors.SourceTimeoutError)
+    )
+
+
+def _resource_classes(manifest, pipelines, pipelines_dir):
+    classes = {}
+
+    for source in manifest.sources:
+        if source.pipeline in classes:
+            continue
+
+        try:
+            pipeline = _find_template(source, pipelines, pipelines_dir)
+        except (OSError, ValueError):
+            # left to fail when the source gets processed
+            pipeline = None
+
+        classes[source.pipeline] = (
+            pipeline.get_resource_class()
+            if pipeline is not None
+            else transformers.base.CPU
         )
 
-        artifact_location, document_location = run_source_refs_only(
-            source,
+    return classes
+
+
+def _timed(function, *args, **kargs):
+    started = time.time()
+    try:
+        result = function(*args, **kargs)
+    except Exception as e:
+        return None, e, started, time.time()
+    return result, None, started, time.time()
+
+
+def _measured(function, *args, **kargs):
+    process = psutil.Process()
+    try:
+        result = function(*args, **kargs)
+    except Exception as e:
+        return None, e, process.pid, process.memory_info().rss
+    return result, None, process.pid, process.memory_info().rss
+
+
+def _workers_rss():
+    rss = 0
+    for child in psutil.Process().children(recursive=True):
+        try:
+            rss += child.memory_info().rss
+        except psutil.NoSuchProcess:
+            pass
+    return rss
+
+
+class _Budget(concurrent.futures.Executor):
+    """
+    Executor that processes sources in a pool of worker processes while
+    keeping their memory in check. New sources are only admitted while the
+    RSS of all workers is below ``max_memory``, unless no source is running,
+    and workers whose RSS is above ``max_source_memory`` once done with a
+    source are replaced by new ones.
+
+    :param workers: Number of worker processes, defaults to the number of CPUs
+    :type workers: int
+    :param max_memory: Memory budget for all workers, in bytes
+    :type max_memory: int
+    :param max_source_memory: Memory ceiling per worker, in bytes
+    :type max_source_memory: int
+    :param poll: Seconds between RSS checks while the budget is exceeded
+    :type poll: float
+    :param context: Multiprocessing context used to start worker processes
+    :type context: Optional[multiprocessing.context.BaseContext]
+    """
+
+    def __init__(
+        self,
+        workers=None,
+        max_memory=None,
+        max_source_memory=None,
+        poll=0.1,
+        context=None,
+    ):
+        self.workers = workers if workers is not None else os.cpu_count()
+        self.max_memory = max_memory
+        self.max_source_memory = max_source_memory
+        self.poll = poll
+        self.context = context
+
+        # every slot is a single worker, so it can be replaced on its own
+        self.slots = [None] * self.workers
+        self.idle = collections.deque(range(self.workers))
+        self.recycled = set()
+        self.pending = collections.deque()
+        self.condition = threading.Condition()
+        self.closed = False
+
+        self.dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self.dispatcher.start()
+
+    def _is_over_budget(self):
+        if self.max_memory is None:
+            return False
+        return _workers_rss() >= self.max_memory
+
+    def _admit(self):
+        stalled = None
+
+        with self.condition:
+            while self._is_over_budget() and len(self.idle) < self.workers:
+                if stalled is None:
+                    stalled = time.time()
+                    __logger__.warning(
+                        "stalled",
+                        extra={
+                            "props": {
+                                "rss": _workers_rss(),
+                                "max_memory": self.max_memory,
+                                "running": self.workers - len(self.idle),
+                                "pending": len(self.pending),
+                            }
+                        },
+                    )
+                self.condition.wait(self.poll)
+
+        if stalled is not None:
+            __logger__.info(
+                "admitted",
+                extra={
+                    "props": {
+                        "stalled": time.time() - stalled,
+                        "pending": len(self.pending),
+                    }
+                },
+            )
+
+    def _slot(self, slot):
+        if slot in self.recycled:
+            self.slots[slot].shutdown(wait=False)
+            self.slots[slot] = None
+            self.recycled.discard(slot)
+        if self.slots[slot] is None:
+            self.slots[slot] = concurrent.futures.ProcessPoolExecutor(
+                max_workers=1, mp_context=self.context
+            )
+        return self.slots[slot]
+
+    def _dispatch(self):
+        while True:
+            with self.condition:
+                while not (self.pending and self.idle):
+                    if self.closed and not self.pending:
+                        return
+                    self.condition.wait()
+
+            self._admit()
+
+            with self.condition:
+                future, function, source, args, kargs = self.pending.popleft()
+                if not future.set_running_or_notify_cancel():
+                    continue
+                slot = self.idle.popleft()
+                executor = self._slot(slot)
+
+            _future = executor.submit(_measured, function, source, *args, **kargs)
+            _future.add_done_callback(
+                functools.partial(self._done, future, source, slot)
+            )
+
+    def _done(self, future, source, slot, _future):
+        recycle = False
+
+        if _future.exception() is not None:
+            # the worker died, e.g., killed by the OOM killer
+            future.set_exception(_future.exception())
+            recycle = True
+        else:
+            result, error, pid, rss = _future.result()
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+            if self.max_source_memory is not None and rss > self.max_source_memory:
+                __logger__.warning(
+                    "recycled",
+                    extra={
+                        "props": {
+                            "source": source.id,
+                            "worker": pid,
+                            "rss": rss,
+                            "max_source_memory": self.max_source_memory,
+                        }
+                    },
+                )
+                recycle = True
+
+        with self.condition:
+            if recycle:
+                self.recycled.add(slot)
+            self.idle.append(slot)
+            self.condition.notify_all()
+
+    def submit(self, function, source, *args, **kargs):
+        future = concurrent.futures.Future()
+
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            self.pending.append((future, function, source, args, kargs))
+            self.condition.notify_all()
+
+        return future
+
+    def shutdown(self, wait=True, **kargs):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+        if wait:
+            self.dispatcher.join()
+
+        for executor in self.slots:
+            if executor is not None:
+                executor.shutdown(wait=wait)
+
+
+def _process_pool(workers, max_memory=None, max_source_memory=None, context=None):
+    if max_memory is None and max_source_memory is None:
+        return concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, mp_context=context
+        )
+    return _Budget(workers, max_memory, max_source_memory, context=context)
+
+
+class _Pools(concurrent.futures.Executor):
+    """
+    Executor that dispatches manifest sources to a bounded pool of workers
+    per resource class of their pipelines, threads for IO-bound sources and
+    processes for the others, and reports the deepest queue and utilization
+    of every pool on shutdown.
+
+    :param sizes: Number of workers per resource class, see :data:`POOLS`
+    :type sizes: Dict[str, int]
+    :param classes: Resource class per pipeline name
+    :type classes: Dict[str, str]
+    :param max_memory: Memory budget for all worker processes, in bytes
+    :type max_memory: int
+    :param max_source_memory: Memory ceiling per worker process, in bytes
+    :type max_source_memory: int
+    :param context: Multiprocessing context used to start worker processes
+    :type context: Optional[multiprocessing.context.BaseContext]
+    """
+
+    def __init__(
+        self,
+        sizes,
+        classes,
+        max_memory=None,
+        max_source_memory=None,
+        context=None,
+    ):
+        self.sizes = {**POOLS, **sizes}
+        self.classes = classes
+        self.max_memory = max_memory
+        self.max_source_memory = max_source_memory
+        self.context = context
+        self.executors = {}
+        self.timings = {}
+
+    def _executor(self, resource_class):
+        if resource_class not in self.executors:
+            size = self.sizes[resource_class]
+            if resource_class == transformers.base.IO:
+                executor = concurrent.futures.ThreadPoolExecutor(max_workers=size)
+            else:
+                executor = _process_pool(
+                    size, self.max_memory, self.max_source_memory, self.context
+                )
+            self.executors[resource_class] = executor
+
+        return self.executors[resource_class]
+
+    def submit(self, function, source, *args, **kargs):
+        resource_class = self.classes.get(source.pipeline, transformers.base.CPU)
+        submitted = time.time()
+
+        future = concurrent.futures.Future()
+        _future = self._executor(resource_class).submit(
+            functools.partial(_timed, function), source, *args, **kargs
+        )
+
+        def done(_future):
+            if future.cancelled():
+                return
+            if _future.cancelled():
+                future.cancel()
+                return
+            if _future.exception() is not None:
+                future.set_exception(_future.exception())
+                return
+
+            result, error, started, finished = _future.result()
+            timings = self.timings.setdefault(resource_class, [])
+            timings.append((submitted, started, finished))
+
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+        _future.add_done_callback(done)
+        future.add_done_callback(lambda f: f.cancelled() and _future.cancel())
+
+        return future
+
+    def report(self):
+        """
+        :return: For every resource class used, the number of workers and of
+            sources processed, the deepest queue of sources waiting for a
+            worker, the mean wait in seconds, and the ratio of time workers
+            were busy
+        :rtype: List[dict]
+        """
+
+        report = []
+
+        for resource_class, timings in self.timings.items():
+            workers = self.sizes[resource_class]
+
+            events = sorted(
+                [(submitted, 1) for submitted, _, _ in timings]
+                + [(started, -1) for _, started, _ in timings]
+            )
+            depth = max_depth = 0
+            for _, delta in events:
+                depth += delta
+                max_depth = max(max_depth, depth)
+
+            begin = min(submitted for submitted, _, _ in timings)
+            end = max(finished for _, _, finished in timings)
+            busy = sum(finished - started for _, started, finished in timings)
+            wait = sum(started - submitted for submitted, started, _ in timings)
+
+            report.append(
+                {
+                    "class": resource_class,
+                    "workers": workers,
+                    "sources": len(timings),
+                    "max_queue_depth": max_depth,
+                    "mean_wait": wait / len(timings),
+                    "utilization": busy / (workers * (end - begin))
+                    if end > begin
+                    else 0.0,
+                }
+            )
+
+        return report
+
+    def shutdown(self, wait=True, **kargs):
+        for executor in self.executors.values():
+            executor.shutdown(wait=wait, **kargs)
+
+        for row in self.report():
+            __logger__.info("pool", extra={"props": row})
+
+
+def _warm_transformer(transformer, warmed):
+    if type(transformer) not in warmed:
+        warmed.add(type(transformer))
+        transformer.warm()
+
+    for value in transformer.arguments.__dict__.values():
+        if isinstance(value, transformers.base.BaseTransformer):
+            _warm_transformer(value, warmed)
+
+
+def _warm(manifest, pipelines, pipelines_dir):
+    """
+    Parses the pipelines of the manifest sources, imports the transformers
+    they use and loads their expensive resources, see
+    :meth:`transformers.base.BaseTransformer.warm`, so that worker processes
+    forked afterwards share all of it instead of loading their own.
+    """
+
+    warmed = set()
+    names = set()
+
+    for source in manifest.sources:
+        if source.pipeline in names:
+            continue
+        names.add(source.pipeline)
+
+        try:
+            pipeline = _find_template(source, pipelines, pipelines_dir)
+        except (OSError, ValueError):
+            # left to fail when the source gets processed
+            continue
+
+        if pipeline is None:
+            continue
+
+        for pipe in pipeline.pipes:
+            for step in pipe.steps:
+                _warm_transformer(step, warmed)
+
+    __logger__.info(
+        "warmed",
+        extra={"props": {"pipelines": len(names), "transformers": len(warmed)}},
+    )
+
+
+_freezing = 0
+_freezing_lock = threading.Lock()
+
+
+def _freeze_before_fork():
+    # keeps the collector of forked workers from touching, and so copying,
+    # the pages they share with this process
+    if _freezing:
+        gc.freeze()
+
+
+def _unfreeze_after_fork():
+    if _freezing:
+        gc.unfreeze()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(
+        before=_freeze_before_fork, after_in_parent=_unfreeze_after_fork
+    )
+
+
+@contextlib.contextmanager
+def _frozen():
+    """
+    Freezes the objects of this process, see :func:`gc.freeze`, for every
+    worker process forked within, and unfreezes them right after, so this
+    process goes on collecting them as usual.
+    """
+
+    global _freezing
+
+    with _freezing_lock:
+        _freezing += 1
+    try:
+        yield
+    finally:
+        with _freezing_lock:
+            _freezing -= 1
+
+
+def _has_process_pool(jobs, executor, pools):
+    if executor is not None:
+        return False
+    return pools is not None or (jobs is not None and jobs > 1)
+
+
+def _fingerprints(manifest, pipelines, pipelines_dir, journal):
+    fingerprints = {}
+    if journal is None:
+        return fingerprints
+
+    definitions = {}
+    for index, source in enumerate(manifest.sources):
+        if source.pipeline not in definitions:
+            definitions[source.pipeline] = pipeline_json(
+                source, pipelines, pipelines_dir
+            )
+        fingerprints[index] = fingerprint(source, definitions[source.pipeline])
+
+    return fingerprints
+
+
+def _record(journal, source, digest, result):
+    if journal is None:
+        return
+
+    # both run_source flavors return the locations last
+    artifact_location, document_location = result[-2:]
+    journal.record(source, digest, artifact_location, document_location)
+
+
+def _in_executor(executor, function):
+    async def _function(*args, **kargs):
+        return await asyncio.wrap_future(executor.submit(function, *args, **kargs))
+
+    return _function
+
+
+@contextlib.asynccontextmanager
+async def _aclosing(outcomes):
+    try:
+        yield outcomes
+    finally:
+        await outcomes.aclose()
+
+
+async def _arun_sources(
+    manifest,
+    pipelines,
+    pipelines_dir,
+    artifacts_dir=None,
+    workspace_dir=None,
+    refs_only=False,
+    stop_on_error=False,
+    journal=False,
+    resume=False,
+    jobs=None,
+    executor=None,
+    limit=None,
+    pipes_cache_size=None,
+    pipes_jobs=None,
+    pipes_pool="thread",
+    sink=None,
+    pools=None,
+    max_memory=None,
+    max_source_memory=None,
+    step_timeouts=None,
+    prefetch=None,
+    max_prefetch_size=None,
+    warm=False,
+    start_method=None,
+    optimize=False,
+):
+    """
+    Processes every manifest source through its pipeline and yields a tuple
+    of (index, source, result, error) as each source finishes. The result is
+    a tuple of the output document, or ``None`` when ``refs_only`` is set,
+    and the artifact and document locations. This is the scheduler behind
+    :func:`arun`, :func:`run`, :func:`run_refs_only` and :func:`iter_run`,
+    see these for the other parameters.
+
+    Up to ``limit`` sources are in flight at once, and yielded in manifest
+    order if only one. When running in a pool, every source is submitted to
+    it at once and sources are yielded in order of completion. When
+    ``stop_on_error`` is set, sources not started yet when one fails, other
+    than by timing out, are skipped.
+
+    When ``journal`` is set, every completed source is recorded in the
+    workspace journal, which is compacted once all sources are done. When
+    ``resume`` is set as well, sources already completed with the same
+    source and pipeline definitions are skipped and their recorded
+    locations are yielded instead.
+    """
+
+    limit = limit if limit is not None else 1
+    in_pool = _is_parallel(jobs, executor, pools)
+    parallel = in_pool or limit > 1
+    killable = _has_timeouts(manifest, step_timeouts)
+    total = len(manifest.sources)
+
+    with run_directories(
+        artifacts_dir, workspace_dir
+    ) as directories, contextlib.ExitStack() as stack:
+        artifacts_dir, workspace_dir, cache_dir = directories
+        journal = Journal(workspace_dir) if journal else None
+        fingerprints = _fingerprints(manifest, pipelines, pipelines_dir, journal)
+        context = multiprocessing.get_context(start_method)
+        pending = []
+
+        if warm and not _has_process_pool(jobs, executor, pools):
+            __logger__.debug("not warming, no process pool is used")
+        elif warm and context.get_start_method() != "fork":
+            __logger__.warning(
+                "not warming, worker processes are not forked",
+                extra={"props": {"start_method": context.get_start_method()}},
+            )
+        elif warm:
+            _warm(manifest, pipelines, pipelines_dir)
+            stack.enter_context(_frozen())
+
+        for index, source in enumerate(manifest.sources):
+            refs = journal.find(fingerprints[index]) if resume else None
+            if refs is None:
+                pending.append((index, source))
+                continue
+
+            __logger__.info(
+                "resuming",
+                extra={
+                    "props": {"source": source.id, "progress": f"{index + 1}/{total}"}
+                },
+            )
+            yield index, source, (None, *refs), None
+
+        # sources whose location is shared with others are fetched only once
+        shared = stack.enter_context(_shared_locations(manifest.sources, workspace_dir))
+
+        if optimize and set(step_timeouts or {}) & optimizer.fused_types():
+            __logger__.warning(
+                "not optimizing, step timeouts target fused steps",
+                extra={"props": {"step_timeouts": step_timeouts}},
+            )
+            optimize = False
+
+        options = {
+            "pipes_cache_size": pipes_cache_size,
+            "pipes_jobs": pipes_jobs,
+            "pipes_pool": pipes_pool,
+            "sink": sink,
+            "optimize": optimize,
+        }
+        function = run_source_refs_only if refs_only else run_source
+        if killable:
+            function = _killable(function, step_timeouts, start_method)
+
+        if in_pool:
+            if pools is not None:
+                classes = _resource_classes(manifest, pipelines, pipelines_dir)
+                executor = stack.enter_context(
+                    _Pools(pools, classes, max_memory, max_source_memory, context)
+                )
+            elif executor is None:
+                executor = stack.enter_context(
+                    _process_pool(jobs, max_memory, max_source_memory, context)
+                )
+            # the pool limits how many sources run at once
+            function = _in_executor(executor, function)
+            limit = max(len(pending), 1)
+        elif killable:
+            # every source is processed in a process of its own
+            executor = stack.enter_context(
+                concurrent.futures.ThreadPoolExecutor(max_workers=limit)
+            )
+            function = _in_executor(executor, function)
+        else:
+            pipes_executor = stack.enter_context(
+                _pipes_executor(pipes_jobs, pipes_pool)
+            )
+            if pipes_executor is None and limit > 1:
+                # pipes running in the loop would stall every other source
+                pipes_executor = stack.enter_context(
+                    concurrent.futures.ThreadPoolExecutor(max_workers=limit)
+                )
+            function = arun_source
+            options = {
+                "pipes_cache_size": pipes_cache_size,
+                "executor": pipes_executor,
+                "io_executor": stack.enter_context(
+                    concurrent.futures.ThreadPoolExecutor(max_workers=limit)
+                ),
+                "sink": sink,
+                "optimize": optimize,
+            }
+
+        if not parallel:
+            prefetcher = stack.enter_context(
+                _Prefetcher(
+                    [shared[i] for i, _ in pending],
+                    workspace_dir,
+                    cache_dir,
+                    prefetch,
+                    max_prefetch_size,
+                )
+            )
+            function = _prefetched(prefetcher, function)
+
+        semaphore = asyncio.Semaphore(limit)
+        failed = False
+
+        async def _arun_source(index, source):
+            nonlocal failed
+
+            async with semaphore:
+                if failed:
+                    return index, source, None, None
+
+                __logger__.info(
+                    "processing",
+                    extra={
+                        "props": {
+                            "source": source.id,
+                            "progress": f"{index + 1}/{total}",
+                        }
+                    },
+                )
+
+                try:
+                    result = await function(
+                        shared[index],
+                        pipelines,
+                        pipelines_dir,
+                        cache_dir,
+                        artifacts_dir,
+                        workspace_dir,
+                        **options,
+                    )
+                except Exception as e:
+                    __logger__.error(
+                        "failed",
+                        extra={"props": {"source": source.id, "error": str(e)}},
+                    )
+                    # timed out sources never interrupt the run
+                    failed = failed or (
+                        stop_on_error and not isinstance(e, errors.SourceTimeoutError)
+                    )
+                    return index, source, None, e
+
+            if refs_only:
+                result = (None, *result[-2:])
+            _record(journal, source, fingerprints.get(index), result)
+
+            return index, source, result, None
+
+        tasks = [asyncio.ensure_future(_arun_source(i, s)) for i, s in pending]
+        try:
+            for count, task in enumerate(asyncio.as_completed(tasks)):
+                index, source, result, error = await task
+                if result is None and error is None:
+                    # skipped after an earlier source failed
+                    continue
+
+                if parallel:
+                    __logger__.info(
+                        "processed",
+                        extra={
+                            "props": {
+                                "source": source.id,
+                                "progress": f"{count + 1}/{total}",
+                            }
+                        },
+                    )
+
+                yield index, source, result, error
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if journal is not None:
+            journal.compact()
+
+
+async def _acollect(manifest, parallel, **kargs):
+    documents = [None] * len(manifest.sources)
+    artifacts_locations = [None] * len(manifest.sources)
+    documents_locations = [None] * len(manifest.sources)
+
+    sink = kargs.get("sink")
+    sources = len(manifest.sources)
+
+    with instrumentation.traced(sink, "manifest", "manifest", sources=sources):
+        outcomes = _arun_sources(manifest, stop_on_error=not parallel, **kargs)
+        async with _aclosing(outcomes):
+            async for index, _, result, error in outcomes:
+                if _interrupts(error, parallel):
+                    raise error
+                if result is None:
+                    continue
+
+                document, artifact_location, document_location = result
+
+                documents[index] = document
+                artifacts_locations[index] = artifact_location
+                documents_locations[index] = document_location
+
+    return documents, artifacts_locations, documents_locations
+
+
+def _complete(coroutine):
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    # e.g., from Jupyter or async web handlers, whose loop can't run ours
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as thread:
+        return thread.submit(asyncio.run, coroutine).result()
+
+
+def _iterate(outcomes):
+    """
+    Iterates over an asynchronous generator from synchronous code, in an
+    event loop of its own, run in a dedicated thread when called from code
+    already running in a loop.
+    """
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        thread = None
+    else:
+        thread = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+    loop = asyncio.new_event_loop()
+
+    def _step(awaitable):
+        if thread is None:
+            return loop.run_until_complete(awaitable)
+        return thread.submit(loop.run_until_complete, awaitable).result()
+
+    try:
+        while True:
+            try:
+                outcome = _step(outcomes.__anext__())
+            except StopAsyncIteration:
+                return
+            yield outcome
+    finally:
+        try:
+            _step(outcomes.aclose())
+            _step(loop.shutdown_asyncgens())
+        finally:
+            loop.close()
+            if thread is not None:
+                thread.shutdown(wait=True)
+
+
+async def arun(
+    manifest,
+    pipelines,
+    pipelines_dir,
+    artifacts_dir=None,
+    workspace_dir=None,
+    jobs=None,
+    executor=None,
+    limit=None,
+    pipes_cache_size=None,
+    pipes_jobs=None,
+    pipes_pool="thread",
+    sink=None,
+    pools=None,
+    max_memory=None,
+    max_source_memory=None,
+    step_timeouts=None,
+    prefetch=None,
+    max_prefetch_size=None,
+    warm=False,
+    start_method=None,
+    optimize=False,
+):
+    """
+    Coroutine version of :func:`run`, meant for manifests of sources that
+    spend most of their time waiting on remote services.
+
+    Up to ``limit`` sources are in flight at once. Their locations are
+    fetched, and their network-bound transformers run, in a pool of as many
+    threads. Other transformers run in the pipes pool when ``pipes_jobs`` is
+    greater than one, or in a pool of as many threads when ``limit`` is,
+    and in the loop otherwise. As with a worker pool, a failing source is
+    logged and reported as ``None`` when ``limit`` is greater than one.
+
+    When ``jobs`` is greater than one, or ``executor`` or ``pools`` are
+    set, sources are processed in those pools instead, as with :func:`run`.
+    """
+
+    parallel = _is_parallel(jobs, executor, pools) or (limit or 1) > 1
+
+    return await _acollect(
+        manifest,
+        parallel,
+        pipelines=pipelines,
+        pipelines_dir=pipelines_dir,
+        artifacts_dir=artifacts_dir,
+        workspace_dir=workspace_dir,
+        jobs=jobs,
+        executor=executor,
+        limit=limit,
+        pipes_cache_size=pipes_cache_size,
+        pipes_jobs=pipes_jobs,
+        pipes_pool=pipes_pool,
+        sink=sink,
+        pools=pools,
+        max_memory=max_memory,
+        max_source_memory=max_source_memory,
+        step_timeouts=step_timeouts,
+        prefetch=prefetch,
+        max_prefetch_size=max_prefetch_size,
+        warm=warm,
+        start_method=start_method,
+        optimize=optimize,
+    )
+
+
+def run(
+    manifest,
+    pipelines,
+    pipelines_dir,
+    artifacts_dir=None,
+    workspace_dir=None,
+    jobs=None,
+    executor=None,
+    pipes_cache_size=None,
+    pipes_jobs=None,
+    pipes_pool="thread",
+    sink=None,
+    pools=None,
+    max_memory=None,
+    max_source_memory=None,
+    step_timeouts=None,
+    prefetch=None,
+    max_prefetch_size=None,
+    warm=False,
+    start_method=None,
+    optimize=False,
+):
+    """
+    Runs every manifest source through its pipeline and returns the output
+    documents along with their artifacts and documents locations, all in
+    manifest order.
+
+    When ``jobs`` is greater than one, sources are processed by a pool of
+    worker processes. Alternatively, an existing ``concurrent.futures``
+    executor can be provided. When running in a pool, a failing source is
+    logged and reported as ``None`` instead of interrupting the whole batch.
+
+    When ``pipes_cache_size`` is set, the output of every pipe is stored
+    in the workspace cache, up to that many bytes, and re-used by later
+    runs of the same pipe with the same inputs.
+
+    When ``pipes_jobs`` is greater than one, pipes that don't depend on
+    each other run concurrently, in a pool of threads, or processes if
+    ``pipes_pool`` is set to ``"process"``. The latter is preferred for
+    pipes that rely on libraries that are not thread-safe.
+
+    When ``sink`` is set, it receives the wall time, CPU time, RSS growth
+    and content sizes of every transformer call, along with spans for the
+    whole manifest and every source, fetch, pipe and store, see
+    :mod:`ingestum.instrumentation`.
+
+    When ``pools`` is set, sources are processed by a separate pool for
+    every resource class, see :meth:`pipelines.base.Pipeline.get_resource_class`,
+    with as many workers as given for that class, or as in :data:`POOLS`
+    otherwise. Threads are used for IO-bound sources, and processes for the
+    others. The deepest queue and utilization of every pool are logged at
+    the end of the run.
+
+    When ``max_memory`` is set, worker processes created by the engine stop
+    taking new sources while their combined RSS is above that many bytes,
+    and resume as running sources finish. When ``max_source_memory`` is
+    set, workers above that many bytes once done with a source are replaced
+    by new ones. Both stalls and replacements are logged.
+
+    When a manifest source has a ``timeout``, or ``step_timeouts`` maps
+    transformer types to seconds, every source is processed in a process of
+    its own, started from the pool worker the source is scheduled to, if
+    any, and killed once the source or one of those steps takes longer than
+    allowed, in seconds. The source is then reported as failed with an
+    :class:`errors.SourceTimeoutError` naming the step that was running,
+    and the run continues with the next source, even when not running in a
+    pool.
+
+    When ``prefetch`` is set and sources are processed one at a time, the
+    remote locations of up to that many sources ahead are fetched into their
+    workspace directories, in a pool of threads, while the current source is
+    processed. When ``max_prefetch_size`` is set, sources are prefetched one
+    at a time, and no more while the ones not processed yet take that many
+    bytes.
+
+    Remote locations listed by several manifest sources, e.g., the same PDF
+    processed by different pipelines, are only fetched once per run, and
+    every source gets a hard link to the read-only fetched file.
+
+    When ``start_method`` is set, worker pools start their processes with
+    that :mod:`multiprocessing` start method, e.g., ``"fork"``, instead of
+    the platform default.
+
+    When ``warm`` is set and sources are processed in a process pool,
+    pipelines are parsed, and the transformers they use imported and
+    warmed, e.g., loading dictionaries, before starting worker processes.
+    When these are forked, which is the default start method on Linux only,
+    they share all of it instead of loading their own. Warming is skipped
+    otherwise.
+
+    When ``optimize`` is set, runs of adjacent steps that can be applied in
+    a single pass are fused into one, see :func:`pipelines.optimize`. Fused
+    steps are measured, traced and timed out under their own types and
+    indices, so steps are never fused when ``step_timeouts`` targets them.
+
+    This is a thin wrapper around :func:`arun`, run in an event loop of its
+    own, in a dedicated thread when called from code already running in a
+    loop, which could otherwise await :func:`arun` directly.
+    """
+
+    return _complete(
+        arun(
+            manifest,
             pipelines,
             pipelines_dir,
-            cache_dir,
-            artifacts_dir,
-            workspace_dir,
+            artifacts_dir=artifacts_dir,
+            workspace_dir=workspace_dir,
+            jobs=jobs,
+            executor=executor,
+            pipes_cache_size=pipes_cache_size,
+            pipes_jobs=pipes_jobs,
+            pipes_pool=pipes_pool,
+            sink=sink,
+            pools=pools,
+            max_memory=max_memory,
+            max_source_memory=max_source_memory,
+            step_timeouts=step_timeouts,
+            prefetch=prefetch,
+            max_prefetch_size=max_prefetch_size,
+            warm=warm,
+            start_method=start_method,
+            optimize=optimize,
         )
+    )
 
-        artifacts_locations.append(artifact_location)
-        documents_locations.append(document_location)
 
-    if "artifacts_tmp" in locals():
-        artifacts_tmp.cleanup()
-    if "workspace_tmp" in locals():
-        workspace_tmp.cleanup()
+def run_source_refs_only(
+    source,
+    pipelines,
+    pipelines_dir,
+    cache_dir,
+    artifacts_dir,
+    workspace_dir,
+    **options,
+):
+    _, artifact_location, document_location = run_source(
+        source,
+        pipelines,
+        pipelines_dir,
+        cache_dir,
+        artifacts_dir,
+        workspace_dir,
+        **options,
+    )
+
+    return artifact_location, document_location
+
+
+def run_refs_only(
+    manifest,
+    pipelines,
+    pipelines_dir,
+    artifacts_dir=None,
+    workspace_dir=None,
+    jobs=None,
+    executor=None,
+    resume=False,
+    pipes_cache_size=None,
+    pipes_jobs=None,
+    pipes_pool="thread",
+    sink=None,
+    pools=None,
+    max_memory=None,
+    max_source_memory=None,
+    step_timeouts=None,
+    prefetch=None,
+    max_prefetch_size=None,
+    warm=False,
+    start_method=None,
+    optimize=False,
+):
+    """
+    Same as :func:`run`, but only returns the artifacts and documents
+    locations, so output documents don't need to be kept in memory.
+
+    Completed sources are recorded in a journal inside the workspace. When
+    ``resume`` is set, sources already completed by a previous run with the
+    same source and pipeline definitions are not processed again, and
+    their recorded locations are returned instead.
+    """
+
+    parallel = _is_parallel(jobs, executor, pools)
+
+    _, artifacts_locations, documents_locations = _complete(
+        _acollect(
+            manifest,
+            parallel,
+            pipelines=pipelines,
+            pipelines_dir=pipelines_dir,
+            artifacts_dir=artifacts_dir,
+            workspace_dir=workspace_dir,
+            refs_only=True,
+            journal=True,
+            resume=resume,
+            jobs=jobs,
+            executor=executor,
+            pipes_cache_size=pipes_cache_size,
+            pipes_jobs=pipes_jobs,
+            pipes_pool=pipes_pool,
+            sink=sink,
+            pools=pools,
+            max_memory=max_memory,
+            max_source_memory=max_source_memory,
+            step_timeouts=step_timeouts,
+            prefetch=prefetch,
+            max_prefetch_size=max_prefetch_size,
+            warm=warm,
+            start_method=start_method,
+            optimize=optimize,
+        )
+    )
 
     return artifacts_locations, documents_locations
+
+
+def iter_run(
+    manifest,
+    pipelines,
+    pipelines_dir,
+    artifacts_dir=None,
+    workspace_dir=None,
+    refs_only=False,
+    jobs=None,
+    executor=None,
+    resume=False,
+    pipes_cache_size=None,
+    pipes_jobs=None,
+    pipes_pool="thread",
+    sink=None,
+    pools=None,
+    max_memory=None,
+    max_source_memory=None,
+    step_timeouts=None,
+    prefetch=None,
+    max_prefetch_size=None,
+    warm=False,
+    start_method=None,
+    optimize=False,
+):
+    """
+    Generator version of :func:`run` that yields a tuple of
+    (source id, result, error) as soon as each source is finished, so
+    results don't need to be kept in memory until the whole manifest is
+    done.
+
+    The result is the output document, or a tuple with the artifact and
+    document locations when ``refs_only`` is set, and ``None`` if the
+    source failed. Failing sources never interrupt the run, the exception
+    is yielded as error instead. When running in a pool, results are
+    yielded in order of completion instead of manifest order.
+
+    When ``refs_only`` is set, completed sources are recorded in the
+    workspace journal and can be skipped with ``resume``, as with
+    :func:`run_refs_only`.
+    """
+
+    if resume and not refs_only:
+        raise ValueError("resume is only supported with refs_only")
+
+    outcomes = _arun_sources(
+        manifest,
+        pipelines,
+        pipelines_dir,
+        artifacts_dir=artifacts_dir,
+        workspace_dir=workspace_dir,
+        refs_only=refs_only,
+        journal=refs_only,
+        resume=resume,
+        jobs=jobs,
+        executor=executor,
+        pipes_cache_size=pipes_cache_size,
+        pipes_jobs=pipes_jobs,
+        pipes_pool=pipes_pool,
+        sink=sink,
+        pools=pools,
+        max_memory=max_memory,
+        max_source_memory=max_source_memory,
+        step_timeouts=step_timeouts,
+        prefetch=prefetch,
+        max_prefetch_size=max_prefetch_size,
+        warm=warm,
+        start_method=start_method,
+        optimize=optimize,
+    )
+
+    for _, source, result, error in _iterate(outcomes):
+        if result is not None:
+            result = result[1:] if refs_only else result[0]
+
+        yield source.id, result, error
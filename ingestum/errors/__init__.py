@@ -24,3 +24,35 @@
 class BackendUnavailableError(Exception):
     def __init__(self):
         super().__init__("BackendUnavailableError")
+
+
+class SourceTimeoutError(Exception):
+    """
+    Raised when a manifest source, or one of its pipeline steps, takes
+    longer than allowed.
+
+    :param source: Manifest source ID
+    :type source: str
+    :param seconds: Time allowed, in seconds
+    :type seconds: float
+    :param pipe: Name of the pipe that was running, if any
+    :type pipe: Optional[str]
+    :param step: Index of the step that was running, if any
+    :type step: Optional[int]
+    :param transformer: Type of the transformer that was running, if any
+    :type transformer: Optional[str]
+    """
+
+    def __init__(self, source, seconds, pipe=None, step=None, transformer=None):
+        super().__init__(source, seconds, pipe, step, transformer)
+        self.source = source
+        self.seconds = seconds
+        self.pipe = pipe
+        self.step = step
+        self.transformer = transformer
+
+    def __str__(self):
+        message = f"source {self.source} timed out after {self.seconds}s"
+        if self.transformer is not None:
+            message += f" in step {self.step} ({self.transformer}) of pipe {self.pipe}"
+        return message
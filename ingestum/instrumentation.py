@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (c) 2023 Sorcero, Inc.
+#
+# This file is part of Sorcero's Language Intelligence platform
+# (see https://www.sorcero.com).
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import os
+import json
+import time
+import threading
+import logging
+import contextlib
+
+import psutil
+
+__logger__ = logging.getLogger("ingestum")
+
+
+def _rss():
+    # kilobytes
+    return psutil.Process().memory_info().rss // 1024
+
+
+def content_size(_input):
+    """
+    :return: The number of items or characters of a document content, or
+        None for anything else, e.g., sources
+    :rtype: Optional[int]
+    """
+
+    content = getattr(_input, "content", None)
+
+    try:
+        return len(content)
+    except TypeError:
+        return None
+
+
+@contextlib.contextmanager
+def span(category, name, **props):
+    """
+    Measures a span of work, e.g., fetching a source or running a pipe.
+
+    Yields the record, so more properties can be added to it, and completes
+    it with the start time and the process and thread it ran on, along with
+    the wall time and CPU time in seconds, and the growth of the RSS in
+    kilobytes, once the span is done, even if it failed.
+
+    The CPU time is that of the calling thread only, so it leaves out work
+    the span hands over to other threads or processes, e.g., pipes run in
+    a pool. The RSS growth is that of the whole process, so it includes
+    memory allocated meanwhile by other threads, and is negative when more
+    memory was released than allocated.
+
+    :param category: Kind of span, e.g., ``source``, ``pipe`` or
+        ``transformer``
+    :type category: str
+    :param name: Name of the span
+    :type name: str
+    """
+
+    record = {"span": category, "name": name, **props}
+
+    rss = _rss()
+    cpu_time = time.thread_time()
+    timestamp = time.time()
+    wall_time = time.perf_counter()
+
+    try:
+        yield record
+    finally:
+        record["wall_time"] = time.perf_counter() - wall_time
+        record["cpu_time"] = time.thread_time() - cpu_time
+        record["rss_delta"] = _rss() - rss
+        record["ts"] = timestamp
+        record["pid"] = os.getpid()
+        record["tid"] = threading.get_ident()
+
+
+@contextlib.contextmanager
+def traced(sink, category, name, **props):
+    """
+    Same as :func:`span`, but writes the record to the given sink once the
+    span is done. Does nothing if there is no sink.
+
+    :param sink: Sink receiving the record
+    :type sink: Optional[Sink]
+    """
+
+    if sink is None:
+        yield None
+        return
+
+    record = None
+    try:
+        with span(category, name, **props) as record:
+            yield record
+    finally:
+        if record is not None:
+            sink.write(record)
+
+
+def measure(transformer, inputs):
+    """
+    Measures a single transformer call, see :func:`span`.
+
+    The yielded record is meant to be filled with the size of the
+    transformer output, under the ``output_size`` key.
+
+    :param transformer: The transformer being called
+    :type transformer: transformers.base.BaseTransformer
+    :param inputs: The transformer inputs
+    :type inputs: list
+    """
+
+    sizes = [content_size(i) for i in inputs]
+
+    return span(
+        "transformer",
+        transformer.type,
+        transformer=transformer.type,
+        input_size=sum(s for s in sizes if s is not None),
+        output_size=None,
+    )
+
+
+class Sink:
+    """
+    Receives one record for every span of work, e.g., every transformer
+    call made by a pipeline, with the source, pipe and step it belongs to.
+    """
+
+    def write(self, record):
+        raise NotImplementedError
+
+
+class JSONLinesSink(Sink):
+    """
+    Appends records to a JSON Lines file. The file is re-opened for every
+    record, so the sink can be shared by worker processes.
+
+    :param path: Path to the JSON Lines file
+    :type path: str
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def write(self, record):
+        with open(self.path, "a") as file:
+            file.write(json.dumps(record) + "\n")
+
+    def read(self):
+        with open(self.path) as file:
+            return [json.loads(line) for line in file if line.strip()]
+
+
+class LoggerSink(Sink):
+    """
+    Sends records to the ingestum structured logger.
+    """
+
+    def write(self, record):
+        __logger__.info("measured", extra={"props": record})
+
+
+class MemorySink(Sink):
+    """
+    Keeps records in memory, e.g., for tests. Records written by worker
+    processes are not collected.
+    """
+
+    def __init__(self):
+        self.records = []
+
+    def write(self, record):
+        self.records.append(record)
+
+
+def summarize(records):
+    """
+    Aggregates transformer records per pipe and step.
+
+    :param records: Records written to a sink
+    :type records: List[dict]
+
+    :return: One row per pipe and step, in order of appearance, with the
+        number of calls, total wall and CPU time, the largest RSS growth
+        and the total input and output sizes
+    :rtype: List[dict]
+    """
+
+    rows = {}
+
+    for record in records:
+        if record.get("span") != "transformer":
+            continue
+
+        key = (record["pipe"], record["step"], record["transformer"])
+        row = rows.setdefault(
+            key,
+            {
+                "pipe": record["pipe"],
+                "step": record["step"],
+                "transformer": record["transformer"],
+                "calls": 0,
+                "wall_time": 0.0,
+                "cpu_time": 0.0,
+                "rss_delta": 0,
+                "input_size": 0,
+                "output_size": 0,
+            },
+        )
+        row["calls"] += 1
+        row["wall_time"] += record["wall_time"]
+        row["cpu_time"] += record["cpu_time"]
+        row["rss_delta"] = max(row["rss_delta"], record["rss_delta"])
+        row["input_size"] += record["input_size"] or 0
+        row["output_size"] += record["output_size"] or 0
+
+    return list(rows.values())
+
+
+def write_chrome_trace(records, path):
+    """
+    Writes records to a Chrome Trace Event file, to be opened with Perfetto
+    or chrome://tracing. Spans are nested by time, with one track per worker
+    process and thread.
+
+    :param records: Records written to a sink
+    :type records: List[dict]
+    :param path: Path to the trace file
+    :type path: str
+    """
+
+    events = []
+    workers = set()
+    internal = {"span", "name", "ts", "wall_time", "pid", "tid"}
+
+    for record in records:
+        events.append(
+            {
+                "name": record["name"],
+                "cat": record["span"],
+                "ph": "X",
+                "ts": record["ts"] * 1e6,
+                "dur": record["wall_time"] * 1e6,
+                "pid": record["pid"],
+                "tid": record["tid"],
+                "args": {k: v for k, v in record.items() if k not in internal},
+            }
+        )
+        workers.add(record["pid"])
+
+    for index, pid in enumerate(sorted(workers)):
+        events.append(
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": f"worker {index}"},
+            }
+        )
+
+    with open(path, "w") as file:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (c) 2023 Sorcero, Inc.
+#
+# This file is part of Sorcero's Language Intelligence platform
+# (see https://www.sorcero.com).
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import os
+import json
+import hashlib
+import logging
+
+from .manifests.sources import locations
+
+__logger__ = logging.getLogger("ingestum")
+
+JOURNAL_NAME = "journal.jsonl"
+
+
+def location_from_dict(location_dict):
+    """
+    Returns the location described by the given dictionary, as recorded by
+    :func:`location_to_dict`.
+
+    :param location_dict: Location dictionary
+    :type location_dict: Optional[dict]
+
+    :return: Location, or None if missing or of an unknown type
+    :rtype: Optional[manifests.sources.locations.base.BaseLocation]
+    """
+
+    if location_dict is None:
+        return None
+
+    try:
+        location = locations.registry.get(location_dict.get("type"))
+    except ValueError:
+        return None
+
+    return location.parse_obj(location_dict)
+
+
+def location_to_dict(location):
+    """
+    Returns a JSON-serializable dictionary describing the given location.
+
+    :param location: Location
+    :type location: Optional[manifests.sources.locations.base.BaseLocation]
+
+    :return: Location dictionary
+    :rtype: Optional[dict]
+    """
+
+    if location is None:
+        return None
+
+    return location.dict()
+
+
+def pipeline_json(source, pipelines, pipelines_dir):
+    """
+    Returns the JSON representation of the pipeline used by the given
+    manifest source, as defined before any source-specific preparation.
+
+    :param source: Manifest source
+    :type source: manifests.sources.base.BaseSource
+    :param pipelines: List of pipelines
+    :type pipelines: Optional[List[pipelines.Base]]
+    :param pipelines_dir: Path to the pipelines directory
+    :type pipelines_dir: Optional[str]
+
+    :return: Pipeline JSON
+    :rtype: str
+    """
+
+    if pipelines is not None:
+        pipeline = next((p for p in pipelines if source.pipeline == p.name), None)
+        if pipeline is not None:
+            return pipeline.json(sort_keys=True)
+
+    if pipelines_dir is not None:
+        pipeline_path = os.path.join(pipelines_dir, f"{source.pipeline}.json")
+        if os.path.exists(pipeline_path):
+            with open(pipeline_path) as pipeline_file:
+                return pipeline_file.read()
+
+    return ""
+
+
+def fingerprint(source, pipeline):
+    """
+    Returns a fingerprint for processing a manifest source with a pipeline.
+
+    :param source: Manifest source
+    :type source: manifests.sources.base.BaseSource
+    :param pipeline: Pipeline JSON
+    :type pipeline: str
+
+    :return: SHA256 digest
+    :rtype: str
+    """
+
+    digest = hashlib.sha256()
+    digest.update(source.json(sort_keys=True).encode("utf-8"))
+    digest.update(pipeline.encode("utf-8"))
+
+    return digest.hexdigest()
+
+
+class Journal:
+    """
+    Record of the manifest sources completed in a workspace, used to resume
+    interrupted manifest runs. Sources are appended as they complete, and
+    the journal is compacted once a run completes.
+
+    :param workspace_dir: Path to the workspace directory
+    :type workspace_dir: str
+    """
+
+    def __init__(self, workspace_dir):
+        self.path = os.path.join(workspace_dir, JOURNAL_NAME)
+        self.entries = None
+
+    def load(self):
+        self.entries = {}
+
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path) as journal_file:
+            for line in journal_file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # an interrupted run can leave a truncated line behind
+                    __logger__.warning("skipping", extra={"props": {"line": line}})
+                    continue
+                self.entries[entry["fingerprint"]] = entry
+
+    def find(self, fingerprint):
+        """
+        :return: The recorded artifact and document locations, or None if
+            no source with this fingerprint was completed
+        :rtype: Optional[Tuple]
+        """
+
+        if self.entries is None:
+            self.load()
+
+        entry = self.entries.get(fingerprint)
+        if entry is None:
+            return None
+
+        return (
+            location_from_dict(entry["artifact"]),
+            location_from_dict(entry["document"]),
+        )
+
+    def record(self, source, fingerprint, artifact_location, document_location):
+        entry = {
+            "id": source.id,
+            "fingerprint": fingerprint,
+            "artifact": location_to_dict(artifact_location),
+            "document": location_to_dict(document_location),
+        }
+
+        with open(self.path, "a") as journal_file:
+            journal_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+        if self.entries is not None:
+            self.entries[fingerprint] = entry
+
+    def compact(self):
+        """
+        Rewrites the journal with a single line per recorded fingerprint,
+        dropping duplicated and truncated lines left by previous runs.
+        """
+
+        if self.entries is None:
+            self.load()
+
+        if not os.path.exists(self.path):
+            return
+
+        path = f"{self.path}.tmp"
+        with open(path, "w") as journal_file:
+            for entry in self.entries.values():
+                journal_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+        os.replace(path, self.path)
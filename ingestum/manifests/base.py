@@ -22,20 +22,19 @@
 
 
 from pydantic import BaseModel
-from typing import List, Union
+from typing import List
 from typing_extensions import Literal
 
 from . import sources
-from ..utils import find_subclasses
-
-__sources__ = tuple(find_subclasses(sources.base.BaseSource))
 
 
 class Manifest(BaseModel):
     """
     :param sources: Collection of sources to be included in the manifest
-    :type sources: List[Union[__sources__]]
+    :type sources: List[BaseSource]
     """
 
     type: Literal["base"] = "base"
-    sources: List[Union[__sources__]]
+    sources: List[sources.base.BaseSource]
+
+    validate_sources = sources.registry.validator("sources")
@@ -66,5 +66,12 @@ Biorxiv = biorxiv.Source
 EuropePMC = europepmc.Source
 PPTX = pptx.Source
 
+registry = base.registry
+
 # Load plugins
 manager.default.register(sys.modules[__name__], "manifests.sources", base.BaseSource)
+
+
+def __getattr__(name):
+    # plugin classes are imported on first use
+    return manager.default.resolve(__name__, name)
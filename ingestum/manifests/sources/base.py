@@ -20,15 +20,16 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
 
-from typing import Union, Optional
+import functools
+
+from typing import Optional
 from typing_extensions import Literal
 
 from pydantic import BaseModel
 
 from . import destinations
-from ...utils import find_subclasses
-
-__destinations__ = tuple(find_subclasses(destinations.base.BaseDestination))
+from ...plugins import manager
+from ...utils import Registry
 
 
 class BaseSource(BaseModel):
@@ -38,14 +39,32 @@ class BaseSource(BaseModel):
     :param pipeline: Pipeline name
     :type pipeline: str
     :param destination: Destination of manifest results
-    :type destination: Union[__destinations__]
+    :type destination: BaseDestination
+    :param timeout: Seconds after which processing this source is given up
+    :type timeout: Optional[float]
     """
 
     type: Literal["base"] = "base"
     id: str
     pipeline: str
-    destination: Union[__destinations__]
+    destination: destinations.base.BaseDestination
     context: Optional[dict]
+    timeout: Optional[float]
+
+    validate_destination = destinations.registry.validator("destination")
 
     def get_source(self, **kargs):
         return kargs["cls"](context=self.context, **kargs)
+
+    async def aget_source(self, executor=None, **kargs):
+        """
+        Coroutine version of :meth:`get_source`, for sources that need to be
+        fetched first, see :meth:`locations.base.BaseLocation.afetch`.
+        """
+
+        return self.get_source(**kargs)
+
+
+registry = Registry(
+    BaseSource, loader=functools.partial(manager.default.load, "manifests.sources")
+)
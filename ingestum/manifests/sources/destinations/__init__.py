@@ -35,7 +35,14 @@ Local = local.Destination
 Remote = remote.Destination
 GoogleDatalake = google_datalake.Destination
 
+registry = base.registry
+
 # Load plugins
 manager.default.register(
     sys.modules[__name__], "manifests.sources.destinations", base.BaseDestination
 )
+
+
+def __getattr__(name):
+    # plugin classes are imported on first use
+    return manager.default.resolve(__name__, name)
@@ -24,12 +24,14 @@ import os
 import uuid
 import shutil
 import logging
+import functools
 
 from pydantic import BaseModel
 from typing import Optional
 from typing_extensions import Literal
 
-from ingestum.utils import write_document_to_path
+from ingestum.plugins import manager
+from ingestum.utils import write_document_to_path, Registry
 
 __logger__ = logging.getLogger("sorcero.ingestion.services")
 
@@ -75,3 +77,9 @@ class BaseDestination(BaseModel):
 
     def store(self, document, output_dir, artifacts_dir):
         raise NotImplementedError
+
+
+registry = Registry(
+    BaseDestination,
+    loader=functools.partial(manager.default.load, "manifests.sources.destinations"),
+)
@@ -21,25 +21,59 @@
 #
 
 
-from typing import Union
 from typing_extensions import Literal
 
 from . import locations
 from .base import BaseSource
-from ...utils import find_subclasses
-
-__locations__ = tuple(find_subclasses(locations.base.BaseLocation))
 
 
 class Source(BaseSource):
     """
     :param location: Manifest source location
-    :type location: Union[__locations__]
+    :type location: BaseLocation
     """
 
     type: Literal["located"] = "located"
-    location: Union[__locations__]
+    location: locations.base.BaseLocation
+
+    validate_location = locations.registry.validator("location")
 
     def get_source(self, **kargs):
         path = self.location.fetch(kargs["output_dir"], kargs["cache_dir"])
         return super().get_source(path=path, uri=self.location.uri, **kargs)
+
+    async def aget_source(self, executor=None, **kargs):
+        path = await self.location.afetch(
+            kargs["output_dir"], kargs["cache_dir"], executor
+        )
+
+        # sub-classes build their source in get_source, minus the fetch
+        return self.fetched(path).get_source(**kargs)
+
+    def fetched(self, path):
+        """
+        :param path: Path the location was already fetched to
+        :type path: str
+
+        :return: A copy of this source that uses the given path instead of
+            fetching its location again
+        :rtype: Source
+        """
+
+        return self.copy(update={"location": _Fetched(path, self.location.uri)})
+
+
+class _Fetched:
+    """
+    Stands for a location already fetched, see :meth:`Source.aget_source`.
+    """
+
+    def __init__(self, path, uri):
+        self.path = path
+        self.uri = uri
+
+    def fetch(self, output_dir, cache_dir=None):
+        return self.path
+
+    async def afetch(self, output_dir, cache_dir=None, executor=None):
+        return self.path
@@ -35,7 +35,14 @@ Local = local.Location
 RemoteVideo = remote_video.Location
 GoogleDatalake = google_datalake.Location
 
+registry = base.registry
+
 # Load plugins
 manager.default.register(
     sys.modules[__name__], "manifests.sources.locations", base.BaseLocation
 )
+
+
+def __getattr__(name):
+    # plugin classes are imported on first use
+    return manager.default.resolve(__name__, name)
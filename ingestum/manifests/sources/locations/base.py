@@ -21,13 +21,39 @@
 #
 
 
+import asyncio
+import functools
+
+from typing import ClassVar
 from typing_extensions import Literal
 
 from pydantic import BaseModel
 
+from ....plugins import manager
+from ....utils import Registry
+
 
 class BaseLocation(BaseModel):
     type: Literal["base"] = "base"
 
+    # whether fetching is worth doing ahead of processing, e.g., downloads
+    prefetch: ClassVar[bool] = False
+
     def fetch(self, path, cache_dir=None):
         raise NotImplementedError
+
+    async def afetch(self, path, cache_dir=None, executor=None):
+        """
+        Coroutine version of :meth:`fetch`, so many locations can be fetched
+        at once. Unless a location provides its own, :meth:`fetch` runs in
+        the given executor, or the loop's default one.
+        """
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.fetch, path, cache_dir)
+
+
+registry = Registry(
+    BaseLocation,
+    loader=functools.partial(manager.default.load, "manifests.sources.locations"),
+)
@@ -25,7 +25,7 @@ import logging
 import mimetypes
 
 from pydantic import Field
-from typing import Optional
+from typing import ClassVar, Optional
 from typing_extensions import Literal
 
 from google.cloud import storage
@@ -52,6 +52,7 @@ class Location(BaseLocation):
     """
 
     type: Literal["google_datalake"] = "google_datalake"
+    prefetch: ClassVar[bool] = True
 
     project: str = Field(
         default_factory=lambda: os.environ.get("INGESTUM_GOOGLE_DATALAKE_PROJECT")
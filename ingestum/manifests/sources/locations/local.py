@@ -47,3 +47,6 @@ class Location(BaseLocation):
     def fetch(self, output_dir=None, cache_dir=None):
         __logger__.debug("re-using", extra={"props": {"source": self.path}})
         return self.path
+
+    async def afetch(self, output_dir=None, cache_dir=None, executor=None):
+        return self.fetch(output_dir, cache_dir)
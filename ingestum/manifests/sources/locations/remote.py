@@ -27,7 +27,7 @@ import cgi
 import logging
 import mimetypes
 
-from typing import Optional, Union
+from typing import ClassVar, Optional, Union
 from typing_extensions import Literal
 from urllib.parse import urlparse
 
@@ -54,6 +54,7 @@ class Location(BaseLocation):
     """
 
     type: Literal["remote"] = "remote"
+    prefetch: ClassVar[bool] = True
 
     url: str
     credential: Optional[Union[__credentials__]] = None
@@ -25,6 +25,7 @@ import os
 import logging
 import youtube_dl
 
+from typing import ClassVar
 from typing_extensions import Literal
 
 from .base import BaseLocation
@@ -39,6 +40,7 @@ class Location(BaseLocation):
     """
 
     type: Literal["remote_video"] = "remote_video"
+    prefetch: ClassVar[bool] = True
 
     url: str
 
@@ -22,5 +22,9 @@
 
 
 from . import base
+from . import cache
+from . import optimizer
 
 Base = base.Pipeline
+Cache = cache.Cache
+optimize = optimizer.optimize
@@ -21,15 +21,22 @@
 #
 
 
+import asyncio
+import contextlib
+import concurrent.futures
+import functools
+
 from pydantic import BaseModel, ValidationError
 from pydantic.class_validators import ROOT_KEY
 from pydantic.error_wrappers import ErrorWrapper
-from typing import List, Union
+from typing import List, Optional
 from typing_extensions import Literal
 
 from . import sources
+from .. import instrumentation
 from .. import transformers
-from ..utils import find_subclasses
+
+_observer = None
 
 
 class Pipe(BaseModel):
@@ -37,15 +44,19 @@ class Pipe(BaseModel):
     :param name: Pipe name
     :type name: str
     :param sources: List of sources to be ingested
-    :type sources: List[Union[tuple(find_subclasses(sources.Base))]]
+    :type sources: List[sources.base.BaseSource]
     :param steps: List of transformers in the order in which they will be applied
-    :type steps: List[Union[tuple(find_subclasses(transformers.base.BaseTransformer))]]
+    :type steps: List[transformers.base.BaseTransformer]
     """
 
     type: Literal["base"] = "base"
     name: str = ""
-    sources: List[Union[tuple(find_subclasses(sources.Base))]]
-    steps: List[Union[tuple(find_subclasses(transformers.base.BaseTransformer))]]
+    sources: List[sources.base.BaseSource]
+    steps: List[transformers.base.BaseTransformer]
+
+    validate_sources = sources.registry.validator("sources")
+    # only imports the modules of the transformers this pipe uses
+    validate_steps = transformers.registry.validator("steps")
 
 
 class Pipeline(BaseModel):
@@ -54,11 +65,15 @@ class Pipeline(BaseModel):
     :type name: str
     :param pipes: Collection of pipes
     :type pipes: List[Pipe]
+    :param resource_class: Resource the pipeline needs the most, used to
+        schedule manifest sources, see :meth:`get_resource_class`
+    :type resource_class: Optional[str]
     """
 
     type: Literal["base"] = "base"
     name: str = ""
     pipes: List[Pipe]
+    resource_class: Optional[Literal["cpu", "io", "memory"]] = None
 
     def __init__(self, **kargs):
         # XXX silence unuseful backtrace until pydantic discriminators lands
@@ -72,6 +87,29 @@ class Pipeline(BaseModel):
                 [ErrorWrapper(e, loc=ROOT_KEY)], self.__class__
             ) from None
 
+    def get_resource_class(self):
+        """
+        :return: The resource class declared by the pipeline or, if none, the
+            one its transformers need the most: memory first, then IO, and
+            CPU otherwise
+        :rtype: str
+        """
+
+        if self.resource_class is not None:
+            return self.resource_class
+
+        classes = {
+            getattr(step, "resource_class", transformers.base.CPU)
+            for pipe in self.pipes
+            for step in pipe.steps
+        }
+
+        for resource_class in [transformers.base.MEMORY, transformers.base.IO]:
+            if resource_class in classes:
+                return resource_class
+
+        return transformers.base.CPU
+
     def _treat_sources(
         self, output_dir, manifest_source, documents, pipe_sources, cache_dir
     ):  # noqa: E501
@@ -91,24 +129,404 @@ class Pipeline(BaseModel):
 
         return _sources
 
-    def run(self, output_dir, manifest_source, cache_dir=None):
-        documents = {}
-        document = None
-
-        for pipe in self.pipes:
-            for index, transformer in enumerate(pipe.steps):
-                if index == 0:
-                    document = transformer.transform(
-                        *self._treat_sources(
-                            output_dir,
-                            manifest_source,
-                            documents,
-                            pipe.sources,
-                            cache_dir,
-                        )
+    def dependencies(self):
+        """
+        Resolves the pipes each pipe takes its input from.
+
+        A pipe source refers to the closest previous pipe with that name,
+        and a pipe without steps simply passes along the document from the
+        previous pipe.
+
+        :return: For every pipe, a dictionary with the index of each pipe it
+            depends on, by name
+        :rtype: List[Dict[str, int]]
+        """
+
+        dependencies = []
+
+        for index, pipe in enumerate(self.pipes):
+            _dependencies = {}
+
+            if not pipe.steps and index > 0:
+                _dependencies[self.pipes[index - 1].name] = index - 1
+
+            for source in pipe.sources:
+                if not isinstance(source, sources.Pipe):
+                    continue
+                for _index in reversed(range(index)):
+                    if self.pipes[_index].name == source.name:
+                        _dependencies[source.name] = _index
+                        break
+
+            dependencies.append(_dependencies)
+
+        return dependencies
+
+    def _prepare(self, index, dependencies, results, source, cache):
+        pipe = self.pipes[index]
+        documents = {n: results[i] for n, i in dependencies[index].items()}
+
+        if not pipe.steps:
+            document = next(iter(documents.values()), None)
+            return True, document, None, None
+
+        inputs = self._treat_sources(
+            source.output_dir,
+            source,
+            documents,
+            pipe.sources,
+            source.cache_dir,
+        )
+
+        key = cache.key(pipe, inputs) if cache is not None else None
+        cached = cache.get(key) if key is not None else None
+
+        return cached is not None, cached, inputs, key
+
+    def _emit(self, sink, source, records):
+        for record in records:
+            sink.write({"source": source.manifest_source.id, **record})
+
+    def _finish(self, source, cache, sink, key, document, records):
+        if sink is not None:
+            self._emit(sink, source, records)
+        if key is not None:
+            cache.put(key, document)
+
+    def _run_sequentially(self, dependencies, source, cache, sink):
+        results = {}
+
+        for index, pipe in enumerate(self.pipes):
+            ready, document, inputs, key = self._prepare(
+                index, dependencies, results, source, cache
+            )
+
+            if not ready:
+                document, records = _run_pipe(pipe, inputs, sink is not None)
+                self._finish(source, cache, sink, key, document, records)
+
+            results[index] = document
+
+        return results
+
+    def _run_concurrently(self, dependencies, source, cache, sink, executor):
+        results = {}
+        pending = list(range(len(self.pipes)))
+        futures = {}
+
+        try:
+            while pending or futures:
+                for index in list(pending):
+                    if any(i not in results for i in dependencies[index].values()):
+                        continue
+
+                    pending.remove(index)
+                    ready, document, inputs, key = self._prepare(
+                        index, dependencies, results, source, cache
                     )
-                else:
-                    document = transformer.transform(document)
-            documents[pipe.name] = document
 
-        return document
+                    if ready:
+                        results[index] = document
+                        continue
+
+                    future = executor.submit(
+                        _run_pipe, self.pipes[index], inputs, sink is not None
+                    )
+                    futures[future] = (index, key)
+
+                if not futures:
+                    continue
+
+                done, _ = concurrent.futures.wait(
+                    futures, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    index, key = futures.pop(future)
+                    document, records = future.result()
+                    self._finish(source, cache, sink, key, document, records)
+                    results[index] = document
+        finally:
+            for future in futures:
+                future.cancel()
+
+        return results
+
+    async def _arun_pipes(
+        self, dependencies, source, cache, sink, executor, io_executor
+    ):
+        loop = asyncio.get_running_loop()
+        results = {}
+        pending = list(range(len(self.pipes)))
+        futures = {}
+
+        try:
+            while pending or futures:
+                for index in list(pending):
+                    if any(i not in results for i in dependencies[index].values()):
+                        continue
+
+                    pending.remove(index)
+                    ready, document, inputs, key = self._prepare(
+                        index, dependencies, results, source, cache
+                    )
+
+                    if ready:
+                        results[index] = document
+                        continue
+
+                    pipe = self.pipes[index]
+                    measured = sink is not None
+
+                    if _is_network_bound(pipe):
+                        future = loop.run_in_executor(
+                            io_executor, _run_pipe, pipe, inputs, measured
+                        )
+                    elif executor is not None:
+                        future = loop.run_in_executor(
+                            executor, _run_pipe, pipe, inputs, measured
+                        )
+                    else:
+                        document, records = _run_pipe(pipe, inputs, measured)
+                        self._finish(source, cache, sink, key, document, records)
+                        results[index] = document
+                        continue
+
+                    futures[future] = (index, key)
+
+                if not futures:
+                    continue
+
+                done, _ = await asyncio.wait(
+                    futures, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    index, key = futures.pop(future)
+                    document, records = future.result()
+                    self._finish(source, cache, sink, key, document, records)
+                    results[index] = document
+        finally:
+            for future in futures:
+                future.cancel()
+
+        return results
+
+    def run(
+        self,
+        output_dir,
+        manifest_source,
+        cache_dir=None,
+        cache=None,
+        executor=None,
+        sink=None,
+    ):
+        """
+        :param output_dir: Path to the directory where sources are fetched
+        :type output_dir: str
+        :param manifest_source: Manifest source to be ingested
+        :type manifest_source: manifests.sources.base.BaseSource
+        :param cache_dir: Path to the directory for requests caching
+        :type cache_dir: Optional[str]
+        :param cache: Optional store to skip pipes already ran with the same
+            inputs
+        :type cache: Optional[pipelines.cache.Cache]
+        :param executor: Optional thread or process pool to run independent
+            pipes concurrently, as soon as the pipes they depend on are done
+        :type executor: Optional[concurrent.futures.Executor]
+        :param sink: Optional sink receiving timing and memory measurements
+            for every transformer call
+        :type sink: Optional[instrumentation.Sink]
+
+        :return: The document produced by the last pipe
+        :rtype: documents.base.BaseDocument
+        """
+
+        if not self.pipes:
+            return None
+
+        dependencies = self.dependencies()
+        source = _FetchedSource(manifest_source, output_dir, cache_dir, sink)
+
+        if executor is None:
+            results = self._run_sequentially(dependencies, source, cache, sink)
+        else:
+            results = self._run_concurrently(
+                dependencies, source, cache, sink, executor
+            )
+
+        return results[len(self.pipes) - 1]
+
+    async def arun(
+        self,
+        output_dir,
+        manifest_source,
+        cache_dir=None,
+        cache=None,
+        executor=None,
+        io_executor=None,
+        sink=None,
+    ):
+        """
+        Coroutine version of :meth:`run`, so many manifest sources can be in
+        flight at once.
+
+        The manifest source is fetched without blocking the loop, and pipes
+        with network-bound transformers run in ``io_executor``. Other pipes
+        run in ``executor``, or in the loop itself if not set. Pipes that
+        don't depend on each other run concurrently.
+
+        :param io_executor: Optional thread pool for fetching the manifest
+            source and network-bound pipes, the loop's default one otherwise
+        :type io_executor: Optional[concurrent.futures.Executor]
+
+        See :meth:`run` for the other parameters.
+
+        :return: The document produced by the last pipe
+        :rtype: documents.base.BaseDocument
+        """
+
+        if not self.pipes:
+            return None
+
+        dependencies = self.dependencies()
+        source = _FetchedSource(manifest_source, output_dir, cache_dir, sink)
+
+        if any(isinstance(s, sources.Manifest) for p in self.pipes for s in p.sources):
+            await source.aget_source(
+                io_executor, output_dir=output_dir, cache_dir=cache_dir
+            )
+
+        results = await self._arun_pipes(
+            dependencies, source, cache, sink, executor, io_executor
+        )
+
+        return results[len(self.pipes) - 1]
+
+
+@contextlib.contextmanager
+def observed(observer):
+    """
+    Calls observer with the pipe name, step index and transformer before
+    every transformer call made by pipelines in this process, e.g., to find
+    out which step hangs. Once the last step of a pipe is done, observer is
+    called once more with the number of steps and ``None``.
+
+    :param observer: Callable receiving the pipe name, step index and
+        transformer
+    :type observer: Callable[[str, int, Optional[BaseTransformer]], None]
+    """
+
+    global _observer
+
+    previous = _observer
+    _observer = observer
+    try:
+        yield
+    finally:
+        _observer = previous
+
+
+def run_steps(steps, inputs, records=None, observer=None):
+    """
+    Applies every transformer to the output of the previous one, starting
+    with the given inputs.
+
+    :param steps: List of transformers
+    :type steps: List[transformers.base.BaseTransformer]
+    :param inputs: Inputs for the first transformer
+    :type inputs: list
+    :param records: Optional list where a measurement is appended for every
+        transformer call
+    :type records: Optional[List[dict]]
+    :param observer: Optional callable receiving the step index and
+        transformer before every transformer call, and the number of steps
+        and ``None`` once done
+    :type observer: Optional[Callable[[int, Optional[BaseTransformer]], None]]
+
+    :return: The document produced by the last transformer
+    :rtype: documents.base.BaseDocument
+    """
+
+    document = None
+
+    for index, transformer in enumerate(steps):
+        _inputs = inputs if index == 0 else [document]
+
+        if observer is not None:
+            observer(index, transformer)
+
+        if records is None:
+            document = transformer.transform(*_inputs)
+            continue
+
+        with instrumentation.measure(transformer, _inputs) as record:
+            record["step"] = index
+            records.append(record)
+            document = transformer.transform(*_inputs)
+            record["output_size"] = instrumentation.content_size(document)
+
+    if observer is not None:
+        observer(len(steps), None)
+
+    return document
+
+
+def _is_network_bound(pipe):
+    return any(
+        getattr(step, "resource_class", None) == transformers.base.IO
+        for step in pipe.steps
+    )
+
+
+def _run_pipe(pipe, inputs, measured):
+    observer = None
+    if _observer is not None:
+        observer = functools.partial(_observer, pipe.name)
+
+    if not measured:
+        return run_steps(pipe.steps, inputs, observer=observer), None
+
+    records = []
+    with instrumentation.span("pipe", pipe.name, pipe=pipe.name) as record:
+        records.append(record)
+        document = run_steps(pipe.steps, inputs, records, observer)
+
+    for record in records:
+        record["pipe"] = pipe.name
+
+    return document, records
+
+
+class _FetchedSource:
+    """
+    Wraps a manifest source so its location is only fetched once, no matter
+    how many pipes take it as input.
+    """
+
+    def __init__(self, manifest_source, output_dir, cache_dir, sink=None):
+        self.manifest_source = manifest_source
+        self.output_dir = output_dir
+        self.cache_dir = cache_dir
+        self.sink = sink
+        self.source = None
+
+    def get_source(self, **kargs):
+        if self.source is None:
+            with instrumentation.traced(
+                self.sink,
+                "fetch",
+                self.manifest_source.type,
+                source=self.manifest_source.id,
+            ):
+                self.source = self.manifest_source.get_source(**kargs)
+        return self.source
+
+    async def aget_source(self, executor=None, **kargs):
+        if self.source is None:
+            with instrumentation.traced(
+                self.sink,
+                "fetch",
+                self.manifest_source.type,
+                source=self.manifest_source.id,
+            ):
+                self.source = await self.manifest_source.aget_source(executor, **kargs)
+        return self.source
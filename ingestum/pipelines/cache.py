@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (c) 2023 Sorcero, Inc.
+#
+# This file is part of Sorcero's Language Intelligence platform
+# (see https://www.sorcero.com).
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import os
+import sys
+import json
+import uuid
+import hashlib
+import logging
+import pathlib
+import functools
+import threading
+
+import ingestum
+
+from .. import sources
+from .. import documents
+from ..utils import stringify_document, get_document_from_path
+
+__logger__ = logging.getLogger("ingestum")
+
+CHUNK_SIZE = 1024 * 1024
+EVICTION_RATIO = 0.9
+
+# sizes of the stores known to this process, kept across the caches created
+# for every source, so stores are only listed once they grow too big
+_sizes = {}
+_sizes_lock = threading.Lock()
+
+
+def _has_side_effects(transformer):
+    if hasattr(transformer.arguments, "directory"):
+        return True
+
+    for attribute in transformer.arguments.__dict__.keys():
+        value = getattr(transformer.arguments, attribute)
+        values = value if isinstance(value, list) else [value]
+        if any(hasattr(v, "arguments") and _has_side_effects(v) for v in values):
+            return True
+
+    return False
+
+
+def _classes(transformer):
+    yield type(transformer)
+
+    for attribute in transformer.arguments.__dict__.keys():
+        value = getattr(transformer.arguments, attribute)
+        values = value if isinstance(value, list) else [value]
+        for _value in values:
+            if hasattr(_value, "arguments"):
+                yield from _classes(_value)
+
+
+def _code_version(cls):
+    """
+    Version of the code behind a transformer or conditional class, so that
+    entries don't outlive upgrades changing their behavior.
+    """
+
+    if cls.__module__.split(".")[0] == "ingestum":
+        return ingestum.__version__
+
+    return _plugin_version(cls.__module__)
+
+
+@functools.lru_cache(maxsize=None)
+def _plugin_version(module_name):
+    # plugins are versioned by their module, or by when it was last changed
+    module = sys.modules.get(module_name)
+    version = getattr(module, "__version__", None)
+    if version is not None:
+        return f"{module_name}:{version}"
+
+    try:
+        mtime = os.stat(module.__file__).st_mtime_ns
+    except (AttributeError, TypeError, OSError):
+        mtime = None
+
+    return f"{module_name}:{mtime}"
+
+
+def _digest_file(path):
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def _digest_input(_input):
+    if _input is None:
+        return "none"
+
+    if isinstance(_input, documents.base.BaseDocument):
+        document = stringify_document(_input, formatted=False)
+        return hashlib.sha256(document.encode("utf-8")).hexdigest()
+
+    # only sources backed by a local file can be safely addressed by content,
+    # API-backed sources depend on the remote state at the time of the run
+    if isinstance(_input, sources.Local) and os.path.isfile(_input.path):
+        # fetched sources also carry where these were fetched to
+        exclude = {"path", "cls", "output_dir", "cache_dir"}
+        source = json.dumps(_input.dict(exclude=exclude), sort_keys=True, default=str)
+        source = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        return f"{source}:{_digest_file(_input.path)}"
+
+    return None
+
+
+class Cache:
+    """
+    Content-addressed store of pipes output documents.
+
+    Entries are keyed by the serialized pipe steps, the version of the code
+    running them and the digests of the pipe inputs. Once the store grows
+    beyond the given size, the least recently used entries are evicted until
+    it is back under :data:`EVICTION_RATIO` of that size. The size of the
+    store is tracked per process, across the caches created for it, so
+    entries are only listed once the store grows too big.
+
+    Pipes whose transformers write files to a directory, or with inputs
+    that can't be addressed by their content, are never cached.
+
+    :param directory: Path to the directory where entries are stored
+    :type directory: str
+    :param max_size: Maximum size of the stored entries, in bytes
+    :type max_size: int
+    """
+
+    def __init__(self, directory, max_size):
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+        pathlib.Path(self.directory).mkdir(parents=True, exist_ok=True)
+
+    @property
+    def size(self):
+        """
+        Size of the stored entries, in bytes, as last known by this process,
+        or None until entries are listed, see :meth:`evict`.
+        """
+
+        return _sizes.get(self.directory)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def key(self, pipe, inputs):
+        """
+        :return: The key for the given pipe and inputs, or None if this pipe
+            can't be cached
+        :rtype: Optional[str]
+        """
+
+        if any(_has_side_effects(t) for t in pipe.steps):
+            return None
+
+        digests = [_digest_input(i) for i in inputs]
+        if None in digests:
+            return None
+
+        digest = hashlib.sha256()
+        digest.update(pipe.json(include={"steps"}, sort_keys=True).encode("utf-8"))
+        for version in sorted(
+            {_code_version(c) for t in pipe.steps for c in _classes(t)}
+        ):
+            digest.update(version.encode("utf-8"))
+        for _digest in digests:
+            digest.update(_digest.encode("utf-8"))
+
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        :return: The stored document, or None if there is no entry for key
+        :rtype: Optional[documents.base.BaseDocument]
+        """
+
+        path = self._path(key)
+
+        try:
+            document = get_document_from_path(path)
+            # keep track of usage for eviction
+            os.utime(path)
+        except (OSError, ValueError) as e:
+            self.misses += 1
+            __logger__.debug("missed", extra={"props": {"key": key, "error": str(e)}})
+            return None
+
+        self.hits += 1
+        __logger__.debug("hit", extra={"props": {"key": key}})
+
+        return document
+
+    def put(self, key, document):
+        path = self._path(key)
+        tmp_path = f"{path}.{uuid.uuid4()}.tmp"
+
+        try:
+            with open(tmp_path, "w") as entry:
+                entry.write(stringify_document(document, formatted=False))
+            size = os.path.getsize(tmp_path)
+            replaced = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            __logger__.warning("caching", extra={"props": {"error": str(e)}})
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        with _sizes_lock:
+            known = _sizes.get(self.directory)
+            if known is not None:
+                known = _sizes[self.directory] = known + size - replaced
+
+        if known is None or known > self.max_size:
+            self.evict()
+
+    def evict(self):
+        """
+        Lists the stored entries and, when these take more than the maximum
+        size, removes the least recently used ones. Other workers sharing
+        the directory are only accounted for here, so the store can grow
+        beyond the maximum size until the next eviction.
+        """
+
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        size = sum(e[1] for e in entries)
+        if size > self.max_size:
+            for _, entry_size, entry_path in sorted(entries):
+                if size <= self.max_size * EVICTION_RATIO:
+                    break
+                try:
+                    os.remove(entry_path)
+                except FileNotFoundError:
+                    # already evicted by another worker
+                    pass
+                size -= entry_size
+                __logger__.debug("evicted", extra={"props": {"entry": entry_path}})
+
+        with _sizes_lock:
+            _sizes[self.directory] = size
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (c) 2023 Sorcero, Inc.
+#
+# This file is part of Sorcero's Language Intelligence platform
+# (see https://www.sorcero.com).
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import re
+import functools
+
+from pydantic import BaseModel
+from typing import List, Optional, Tuple
+from typing_extensions import Literal
+
+from .. import documents
+from .. import transformers
+from ..transformers.base import BaseTransformer
+
+
+@functools.lru_cache(maxsize=None)
+def _compile(regexp):
+    return re.compile(regexp, re.MULTILINE)
+
+
+class FusedStringReplace(BaseTransformer):
+    """
+    Stands for a run of adjacent `TextDocumentStringReplace` steps, applying
+    every replacement in order but only producing a single `Text` document.
+
+    :param replacements: Regular expressions and their replacements, in the
+        order in which they are applied
+    :type replacements: List[Tuple[str, str]]
+    """
+
+    class ArgumentsModel(BaseModel):
+        replacements: List[Tuple[str, str]]
+
+    class InputsModel(BaseModel):
+        document: documents.Text
+
+    class OutputsModel(BaseModel):
+        document: documents.Text
+
+    arguments: ArgumentsModel
+    inputs: Optional[InputsModel]
+    outputs: Optional[OutputsModel]
+
+    type: Literal["fused_string_replace"] = "fused_string_replace"
+
+    def replace(self, content):
+        for regexp, replacement in self.arguments.replacements:
+            content = _compile(regexp).sub(replacement, content)
+        return content
+
+    def transform(self, document: documents.Text) -> documents.Text:
+        super().transform(document=document)
+
+        content = self.replace(document.content)
+
+        return document.new_from(document, content=content)
+
+
+class FusedCollectionTransform(BaseTransformer):
+    """
+    Stands for a run of adjacent `CollectionDocumentTransform` steps, applying
+    every transformer in order to each document but only producing a single
+    `Collection` document.
+
+    :param transformers: Transformers applied to each document, in order
+    :type transformers: List[BaseTransformer]
+    """
+
+    class ArgumentsModel(BaseModel):
+        transformers: List[BaseTransformer]
+
+        validate_transformers = transformers.registry.validator("transformers")
+
+    class InputsModel(BaseModel):
+        collection: documents.Collection
+
+    class OutputsModel(BaseModel):
+        document: documents.Collection
+
+    arguments: ArgumentsModel
+    inputs: Optional[InputsModel]
+    outputs: Optional[OutputsModel]
+
+    type: Literal["fused_collection_transform"] = "fused_collection_transform"
+
+    def transform(self, collection: documents.Collection) -> documents.Collection:
+        super().transform(collection=collection)
+
+        content = []
+        for document in collection.content:
+            for transformer in self.arguments.transformers:
+                document = transformer.transform(document)
+            content.append(document)
+
+        return collection.new_from(collection, content=content)
+
+
+def _fuse_string_replace(steps):
+    replacements = [(s.arguments.regexp, s.arguments.replacement) for s in steps]
+    return FusedStringReplace(
+        arguments=FusedStringReplace.ArgumentsModel(replacements=replacements)
+    )
+
+
+def _fuse_collection_transform(steps):
+    inner = optimize_steps([s.arguments.transformer for s in steps])
+    return FusedCollectionTransform(
+        arguments=FusedCollectionTransform.ArgumentsModel.construct(transformers=inner)
+    )
+
+
+def _fusions():
+    return [
+        (transformers.TextDocumentStringReplace, _fuse_string_replace),
+        (transformers.CollectionDocumentTransform, _fuse_collection_transform),
+    ]
+
+
+def fused_types():
+    """
+    :return: The types of the transformers whose adjacent steps are fused
+    :rtype: Set[str]
+    """
+
+    return {cls.__fields__["type"].default for cls, _ in _fusions()}
+
+
+def optimize_steps(steps):
+    """
+    Rewrites runs of adjacent steps that can be applied in a single pass
+    into one equivalent step.
+
+    :param steps: List of transformers
+    :type steps: list
+
+    :return: An equivalent, possibly shorter, list of steps
+    :rtype: list
+    """
+
+    fusions = _fusions()
+    optimized = []
+    index = 0
+
+    while index < len(steps):
+        step = steps[index]
+        end = index + 1
+
+        for cls, fuse in fusions:
+            if type(step) is not cls:
+                continue
+            while end < len(steps) and type(steps[end]) is cls:
+                end += 1
+            if end - index > 1:
+                step = fuse(steps[index:end])
+            break
+
+        optimized.append(step)
+        index = end
+
+    return optimized
+
+
+def optimize(pipeline):
+    """
+    Compiles a pipeline into an equivalent one, where runs of adjacent
+    `TextDocumentStringReplace` steps and adjacent `CollectionDocumentTransform`
+    steps are fused, so documents are only rebuilt once per run.
+
+    Fused steps stand for several steps of the original pipeline, so
+    measurements, traces and timeouts refer to their own types and indices
+    instead, see ``optimize`` in :func:`engine.run`.
+
+    The given pipeline is left untouched.
+
+    :param pipeline: Pipeline to optimize
+    :type pipeline: pipelines.base.Pipeline
+
+    :return: The optimized pipeline
+    :rtype: pipelines.base.Pipeline
+    """
+
+    pipes = [
+        pipe.copy(update={"steps": optimize_steps(pipe.steps)})
+        for pipe in pipeline.pipes
+    ]
+
+    return pipeline.copy(update={"pipes": pipes})
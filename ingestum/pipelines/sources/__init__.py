@@ -30,3 +30,5 @@ Base = base.BaseSource
 Manifest = manifest.Source
 Pipe = pipe.Source
 Nothing = nothing.Source
+
+registry = base.registry
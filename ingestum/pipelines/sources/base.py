@@ -24,7 +24,12 @@
 from pydantic import BaseModel
 from typing_extensions import Literal
 
+from ...utils import Registry
+
 
 class BaseSource(BaseModel):
 
     type: Literal["base"] = "base"
+
+
+registry = Registry(BaseSource)
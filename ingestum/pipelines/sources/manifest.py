@@ -23,8 +23,7 @@
 
 from typing_extensions import Literal
 
-from ...utils import find_subclasses
-from ...manifests.sources.base import BaseSource as ManifestBaseSource
+from ...manifests.sources.base import registry
 from .base import BaseSource
 
 
@@ -38,7 +37,7 @@ class Source(BaseSource):
     source: str
 
     def get_source_class(self):
-        for source in find_subclasses(ManifestBaseSource):
-            if self.source == source.__fields__["type"].default:
-                return source
-        return None
+        try:
+            return registry.get(self.source)
+        except ValueError:
+            return None
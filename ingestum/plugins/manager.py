@@ -23,41 +23,197 @@
 
 import os
 import sys
+import json
 import inspect
 import logging
+import importlib
 
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 from typing_extensions import Literal
 
 __logger__ = logging.getLogger("ingestum")
 
 PLUGINS_DEFAULT_DIR = os.path.join(os.path.expanduser("~"), ".ingestum", "plugins")
 PLUGINS_DIRS = os.environ.get("INGESTUM_PLUGINS_DIR", PLUGINS_DEFAULT_DIR).split(":")
+PLUGINS_INDEX = os.environ.get(
+    "INGESTUM_PLUGINS_INDEX",
+    os.path.join(os.path.expanduser("~"), ".ingestum", "plugins.json"),
+)
+
+
+def _mtimes(directory):
+    """
+    Modification times of the plugins directory and of every directory in the
+    plugins, used to tell whether the index is still up to date.
+    """
+
+    mtimes = {".": os.stat(directory).st_mtime_ns}
+
+    for plugin in os.listdir(directory):
+        path = os.path.join(directory, plugin)
+        if not os.path.isdir(path):
+            continue
+        mtimes[plugin] = os.stat(path).st_mtime_ns
+
+        for root, dirs, _ in os.walk(os.path.join(path, "plugin")):
+            dirs[:] = [d for d in dirs if d != "__pycache__"]
+            mtimes[os.path.relpath(root, directory)] = os.stat(root).st_mtime_ns
+
+    return mtimes
+
+
+def _is_fresh(directory, entry):
+    for path, mtime in entry["mtimes"].items():
+        try:
+            if os.stat(os.path.join(directory, path)).st_mtime_ns != mtime:
+                return False
+        except OSError:
+            return False
+
+    return True
 
 
 class Manager(BaseModel):
+    """
+    Discovers plugin classes and makes them available in the modules of their
+    concepts, e.g., transformers or sources.
+
+    Discovery results are kept in an index, mapping each concept to the plugin
+    modules providing it and their class names, so that plugin modules are
+    only imported when their classes are used. The index of a plugins directory
+    is rebuilt when any directory in it changes, or with ``refresh``.
+
+    :param directories: Plugins directories
+    :type directories: List[str]
+    :param index_path: Path to the discovery index
+    :type index_path: str
+    """
+
     type: Literal["manager"] = "manager"
     directories: List = PLUGINS_DIRS
+    index_path: str = PLUGINS_INDEX
+    index: Optional[dict] = None
+    concepts: dict = {}
+    classes: dict = {}
 
     def register(self, module, concept_name, concept_class):
+        self.concepts[concept_name] = (module.__name__, concept_class)
+        classes = self.classes.setdefault(module.__name__, {})
+
         for directory in self.directories:
-            self._do_register(directory, module, concept_name, concept_class)
+            classes.update(self._do_register(directory, concept_name, concept_class))
 
-    def _do_register(self, directory, module, concept_name, concept_class):
-        if not os.path.exists(directory):
+    def resolve(self, module_name, name):
+        """
+        Imports a plugin class registered in the given module, to be used from
+        the module's ``__getattr__``.
+
+        :param module_name: Name of the module of the concept
+        :type module_name: str
+        :param name: Name of the class
+        :type name: str
+
+        :raises AttributeError: If no plugin provides that class
+        """
+
+        plugin_import = self.classes.get(module_name, {}).get(name)
+        if plugin_import is None:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+
+        class_ = getattr(importlib.import_module(plugin_import), name)
+        setattr(sys.modules[module_name], name, class_)
+
+        return class_
+
+    def load(self, concept_name):
+        """
+        Imports every plugin class of a concept, e.g., before looking them up
+        by type.
+
+        :param concept_name: Name of the concept
+        :type concept_name: str
+        """
+
+        if concept_name not in self.concepts:
             return
 
+        module_name, _ = self.concepts[concept_name]
+        for name in list(self.classes.get(module_name, {})):
+            self.resolve(module_name, name)
+
+    def refresh(self):
+        """
+        Rebuilds the index of every plugins directory, for the concepts
+        registered so far.
+        """
+
+        index = self._load_index()
+        for directory in self.directories:
+            index.pop(os.path.abspath(directory), None)
+
+        for concept_name, (module_name, concept_class) in list(self.concepts.items()):
+            self.register(sys.modules[module_name], concept_name, concept_class)
+
+    def _load_index(self):
+        if self.index is None:
+            try:
+                with open(self.index_path) as index_file:
+                    self.index = json.load(index_file)
+            except (OSError, ValueError):
+                self.index = {}
+
+        return self.index
+
+    def _save_index(self):
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            path = f"{self.index_path}.{os.getpid()}"
+            with open(path, "w") as index_file:
+                json.dump(self.index, index_file)
+            os.replace(path, self.index_path)
+        except OSError as e:
+            __logger__.debug(str(e), extra={"props": {"index": self.index_path}})
+
+    def _do_register(self, directory, concept_name, concept_class):
+        if not os.path.exists(directory):
+            return {}
+
         if directory not in sys.path:
             sys.path.append(directory)
 
+        index = self._load_index()
+        key = os.path.abspath(directory)
+
+        entry = index.get(key)
+        if entry is None or not _is_fresh(directory, entry):
+            entry = {"mtimes": {}, "concepts": {}}
+            index[key] = entry
+
+        if concept_name not in entry["concepts"]:
+            entry["concepts"][concept_name] = self._scan(
+                directory, concept_name, concept_class
+            )
+            # after scanning, as importing plugins may create directories
+            entry["mtimes"] = _mtimes(directory)
+            self._save_index()
+
+        return {
+            name: plugin_import
+            for plugin_import, names in entry["concepts"][concept_name].items()
+            for name in names
+        }
+
+    def _scan(self, directory, concept_name, concept_class):
+        plugins = {}
+
         for plugin in os.listdir(directory):
             path_to_concept = f"plugin.{concept_name}".replace(".", "/")
             if not os.path.isdir(os.path.join(directory, plugin, path_to_concept)):
                 continue
 
+            plugin_import = f"{plugin}.plugin.{concept_name}"
             try:
-                plugin_import = f"{plugin}.plugin.{concept_name}"
                 __logger__.debug(
                     "loading",
                     extra={
@@ -68,14 +224,12 @@ class Manager(BaseModel):
                         }
                     },
                 )
-                plugin_module = __import__(plugin_import)
+                plugin_module = importlib.import_module(plugin_import)
             except ImportError as e:
                 __logger__.debug(str(e), extra={"props": {"plugin": plugin}})
                 continue
 
-            for component in f"plugin.{concept_name}".split("."):
-                plugin_module = getattr(plugin_module, component)
-
+            names = []
             for name in dir(plugin_module):
                 if name.startswith("__"):
                     continue
@@ -85,7 +239,11 @@ class Manager(BaseModel):
                     continue
 
                 if issubclass(class_, concept_class):
-                    setattr(module, name, class_)
+                    names.append(name)
+
+            plugins[plugin_import] = names
+
+        return plugins
 
 
 default = Manager()
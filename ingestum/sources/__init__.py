@@ -71,3 +71,8 @@ PPTX = pptx.Source
 
 # Load plugins
 manager.default.register(sys.modules[__name__], "sources", Base)
+
+
+def __getattr__(name):
+    # plugin classes are imported on first use
+    return manager.default.resolve(__name__, name)
@@ -22,337 +22,166 @@
 
 
 import sys
+import importlib
 
 from ingestum.plugins import manager
 
 from . import base
-
-from . import html_source_create_document
-from . import html_source_create_image_source
-from . import html_document_sub_replace_for_unicode
-from . import html_document_sup_replace_for_unicode
-from . import html_document_images_extract
-
-from . import image_source_create_text_document
-from . import image_source_create_reference_text_document
-from . import image_source_create_tabular_document
-
-from . import pdf_source_tables_extract
-from . import pdf_source_images_extract
-from . import pdf_source_shapes_extract
-from . import pdf_source_crop_extract
-from . import pdf_source_text_extract
-from . import pdf_source_create_text_document
-from . import pdf_source_create_text_document_ocr
-from . import pdf_source_create_text_document_replaced_extractables
-from . import pdf_source_create_text_document_hybrid
-from . import pdf_source_create_text_document_hybrid_replaced_extractables
-from . import pdf_source_create_form_document
-from . import pdf_source_create_tabular_collection_document
-from . import pdf_source_create_tabular_collection_document_with_regexp
-from . import pdf_source_create_tabular_collection_document_with_dividers
-from . import pdf_source_create_tabular_collection_document_hybrid
-from . import pdf_source_images_create_resource_collection_document
-from . import pdf_source_shapes_create_resource_collection_document
-from . import pdf_source_text_create_text_collection_document
-from . import pdf_source_crop_create_image_source
-from . import pdf_source_create_publication_document
-from . import pptx_source_create_text_document
-
-from . import text_source_create_document
-from . import text_document_hyphens_remove
-from . import text_document_string_replace
-from . import text_document_add_passage_marker
-from . import text_document_join
-from . import text_split_into_collection_document
-from . import text_create_passage_document
-from . import text_create_xml_document
-
-from . import xml_source_create_document
-from . import xml_create_text_document
-from . import xml_document_tag_replace
-
-from . import passage_document_add_metadata
-from . import passage_document_add_metadata_on_attribute
-from . import passage_document_string_split
-from . import passage_document_add_metadata_from_metadata
-
-from . import collection_document_add
-from . import collection_document_merge
-from . import collection_document_remove_on_conditional
-
-from . import csv_source_create_tabular_document
-
-from . import xls_source_create_image
-from . import xls_source_create_tabular_document
-from . import xls_source_create_tabular_collection_document
-
-from . import tabular_document_join
-from . import tabular_document_fit
-from . import tabular_document_create_form_collection
-from . import tabular_document_create_md_passage
-from . import tabular_document_cell_transpose_on_conditional
-from . import tabular_document_row_remove_on_conditional
-from . import tabular_document_row_merge_on_conditional
-from . import tabular_document_columns_insert
-from . import tabular_document_columns_string_replace
-from . import tabular_document_columns_update_with_extractables
-from . import tabular_document_create_form_collection_with_headers
-from . import tabular_document_strip_until_conditional
-
-from . import resource_create_text_document
-
-from . import document_extract
-
-from . import audio_source_create_text_document
-
-from . import twitter_source_create_form_collection_document
-from . import twitter_source_create_publication_collection_document
-
-from . import document_source_create_document
-
-from . import email_source_create_text_collection_document
-from . import email_source_create_html_collection_document
-
-from . import proquest_source_create_xml_collection_document
-from . import proquest_source_create_publication_collection_document
-
-from . import docx_source_create_image
-from . import docx_source_create_text_document
-
-from . import form_document_set
-
-from . import pubmed_source_create_xml_collection_document
-from . import pubmed_source_create_text_collection_document
-from . import pubmed_source_create_publication_collection_document
-from . import pubmed_xml_create_publication_document
-
-from . import reddit_source_create_form_collection_document
-from . import reddit_source_create_publication_collection_document
-
-from . import litcovid_source_create_publication_collection_document
-
-from . import biorxiv_source_create_publication_collection_document
-from . import biorxiv_source_create_xml_collection_document
-from . import biorxiv_xml_create_publication_document
-
-from . import europepmc_source_create_publication_collection_document
-from . import europepmc_source_create_xml_collection_document
-from . import europepmc_xml_create_publication_document
-
-# Load plugins BEFORE recursive transformers so these can include plugin transformers
-# as well. This means that plugins will need the full import path to sub-class, e.g:
-#
-# class Transformer(transformers.form_document_set.Trasformer):
-#     pass
-#
-# And can't use the short-handed classes we define below.
-#
-manager.default.register(sys.modules[__name__], "transformers", base.BaseTransformer)
-
-# XXX these transformers need to import ALL other transformers
-from . import passage_document_transform_on_conditional  # noqa E402
-from . import collection_document_join  # noqa E402
-from . import collection_document_transform  # noqa E402
-from . import collection_document_transform_on_conditional  # noqa E402
-
-HTMLDocumentSubReplaceForUnicode = html_document_sub_replace_for_unicode.Transformer
-HTMLDocumentSupReplaceForUnicode = html_document_sup_replace_for_unicode.Transformer
-HTMLSourceCreateDocument = html_source_create_document.Transformer
-HTMLSourceCreateImageSource = html_source_create_image_source.Transformer
-HTMLDocumentImagesExtract = html_document_images_extract.Transformer
-
-ImageSourceCreateTextDocument = image_source_create_text_document.Transformer
-ImageSourceCreateTabularDocument = image_source_create_tabular_document.Transformer
-ImageSourceCreateReferenceTextDocument = (
-    image_source_create_reference_text_document.Transformer
-)
-
-PDFSourceTablesExtract = pdf_source_tables_extract.Transformer
-PDFSourceImagesExtract = pdf_source_images_extract.Transformer
-PDFSourceShapesExtract = pdf_source_shapes_extract.Transformer
-PDFSourceCropExtract = pdf_source_crop_extract.Transformer
-PDFSourceTextExtract = pdf_source_text_extract.Transformer
-PDFSourceCreateTextDocument = pdf_source_create_text_document.Transformer
-PDFSourceCreateTextDocumentOCR = pdf_source_create_text_document_ocr.Transformer
-PDFSourceCreateTextDocumentReplacedExtractables = (
-    pdf_source_create_text_document_replaced_extractables.Transformer
-)
-PDFSourceCreateTextDocumentHybrid = pdf_source_create_text_document_hybrid.Transformer
-PDFSourceCreateTextDocumentHybridReplacedExtractables = (
-    pdf_source_create_text_document_hybrid_replaced_extractables.Transformer
-)
-PDFSourceCreateFormDocument = pdf_source_create_form_document.Transformer
-PDFSourceCreateTabularCollectionDocument = (
-    pdf_source_create_tabular_collection_document.Transformer
-)
-PDFSourceCreateTabularCollectionDocumentWithRegexp = (
-    pdf_source_create_tabular_collection_document_with_regexp.Transformer
-)
-PDFSourceCreateTabularCollectionDocumentWithDividers = (
-    pdf_source_create_tabular_collection_document_with_dividers.Transformer
-)
-PDFSourceCreateTabularCollectionDocumentHybrid = (
-    pdf_source_create_tabular_collection_document_hybrid.Transformer
-)
-PDFSourceImagesCreateResourceCollectionDocument = (
-    pdf_source_images_create_resource_collection_document.Transformer
-)
-PDFSourceShapesCreateResourceCollectionDocument = (
-    pdf_source_shapes_create_resource_collection_document.Transformer
-)
-PDFSourceTextCreateTextCollectionDocument = (
-    pdf_source_text_create_text_collection_document.Transformer
-)
-PDFSourceCropCreateImageSource = pdf_source_crop_create_image_source.Transformer
-PDFSourceCreatePublicationDocument = pdf_source_create_publication_document.Transformer
-PPTXSourceCreateTextDocument = pptx_source_create_text_document.Transformer
-
-TwitterSourceCreateFormCollectionDocument = (
-    twitter_source_create_form_collection_document.Transformer
-)
-TwitterSourceCreatePublicationCollectionDocument = (
-    twitter_source_create_publication_collection_document.Transformer
-)
-
-TextSourceCreateDocument = text_source_create_document.Transformer
-TextDocumentHyphensRemove = text_document_hyphens_remove.Transformer
-TextDocumentStringReplace = text_document_string_replace.Transformer
-TextDocumentAddPassageMarker = text_document_add_passage_marker.Transformer
-TextDocumentJoin = text_document_join.Transformer
-TextCreatePassageDocument = text_create_passage_document.Transformer
-TextCreateXMLDocument = text_create_xml_document.Transformer
-TextSplitIntoCollectionDocument = text_split_into_collection_document.Transformer
-
-XMLSourceCreateDocument = xml_source_create_document.Transformer
-XMLCreateTextDocument = xml_create_text_document.Transformer
-XMLDocumentTagReplace = xml_document_tag_replace.Transformer
-
-PassageDocumentAddMetadata = passage_document_add_metadata.Transformer
-PassageDocumentAddMetadataOnAttribute = (
-    passage_document_add_metadata_on_attribute.Transformer
-)
-PassageDocumentStringSplit = passage_document_string_split.Transformer
-PassageDocumentTransformOnConditional = (
-    passage_document_transform_on_conditional.Transformer
-)
-PassageDocumentAddMetadataFromMetadata = (
-    passage_document_add_metadata_from_metadata.Transformer
-)
-
-CollectionDocumentAdd = collection_document_add.Transformer
-CollectionDocumentJoin = collection_document_join.Transformer
-CollectionDocumentMerge = collection_document_merge.Transformer
-CollectionDocumentTransform = collection_document_transform.Transformer
-CollectionDocumentTransformOnConditional = (
-    collection_document_transform_on_conditional.Transformer
-)
-CollectionDocumentRemoveOnConditional = (
-    collection_document_remove_on_conditional.Transformer
-)
-
-CSVSourceCreateTabularDocument = csv_source_create_tabular_document.Transformer
-
-XLSSourceCreateImage = xls_source_create_image.Transformer
-XLSSourceCreateTabularDocument = xls_source_create_tabular_document.Transformer
-XLSSourceCreateTabularCollectionDocument = (
-    xls_source_create_tabular_collection_document.Transformer
-)
-
-TabularDocumentJoin = tabular_document_join.Transformer
-TabularDocumentFit = tabular_document_fit.Transformer
-TabularDocumentCreateFormCollection = (
-    tabular_document_create_form_collection.Transformer
-)
-TabularDocumentCreateMDPassage = tabular_document_create_md_passage.Transformer
-TabularDocumentRowRemoveOnConditional = (
-    tabular_document_row_remove_on_conditional.Transformer
-)
-TabularDocumentCellTransposeOnConditional = (
-    tabular_document_cell_transpose_on_conditional.Transformer
-)
-TabularDocumentRowMergeOnConditional = (
-    tabular_document_row_merge_on_conditional.Transformer
-)
-TabularDocumentColumnsInsert = tabular_document_columns_insert.Transformer
-TabularDocumentColumnsStringReplace = (
-    tabular_document_columns_string_replace.Transformer
-)
-TabularDocumentColumnsUpdateWithExtractables = (
-    tabular_document_columns_update_with_extractables.Transformer
-)
-TabularDocumentCreateFormCollectionWithHeaders = (
-    tabular_document_create_form_collection_with_headers.Transformer
-)
-TabularDocumentStripUntilConditional = (
-    tabular_document_strip_until_conditional.Transformer
-)
-
-ResourceCreateTextDocument = resource_create_text_document.Transformer
-
-DocumentExtract = document_extract.Transformer
-
-AudioSourceCreateTextDocument = audio_source_create_text_document.Transformer
-
-DocumentSourceCreateDocument = document_source_create_document.Transformer
-
-EmailSourceCreateTextCollectionDocument = (
-    email_source_create_text_collection_document.Transformer
-)
-EmailSourceCreateHTMLCollectionDocument = (
-    email_source_create_html_collection_document.Transformer
-)
-
-ProQuestSourceCreateXMLCollectionDocument = (
-    proquest_source_create_xml_collection_document.Transformer
-)
-ProQuestSourceCreatePublicationCollectionDocument = (
-    proquest_source_create_publication_collection_document.Transformer
-)
-
-DOCXSourceCreateImage = docx_source_create_image.Transformer
-DOCXSourceCreateTextDocument = docx_source_create_text_document.Transformer
-
-FormDocumentSet = form_document_set.Transformer
-
-PubmedSourceCreateXMLCollectionDocument = (
-    pubmed_source_create_xml_collection_document.Transformer
-)
-PubmedSourceCreateTextCollectionDocument = (
-    pubmed_source_create_text_collection_document.Transformer
-)
-PubmedSourceCreatePublicationCollectionDocument = (
-    pubmed_source_create_publication_collection_document.Transformer
-)
-PubmedXMLCreatePublicationDocument = pubmed_xml_create_publication_document.Transformer
-
-RedditSourceCreateFormCollectionDocument = (
-    reddit_source_create_form_collection_document.Transformer
-)
-RedditSourceCreatePublicationCollectionDocument = (
-    reddit_source_create_publication_collection_document.Transformer
-)
-
-LitCovidSourceCreatePublicationCollectionDocument = (
-    litcovid_source_create_publication_collection_document.Transformer
-)
-
-BiorxivSourceCreatePublicationCollectionDocument = (
-    biorxiv_source_create_publication_collection_document.Transformer
-)
-BiorxivSourceCreateXMLCollectionDocument = (
-    biorxiv_source_create_xml_collection_document.Transformer
-)
-BiorxivXMLCreatePublicationDocument = (
-    biorxiv_xml_create_publication_document.Transformer
-)
-
-EuropePMCSourceCreatePublicationCollectionDocument = (
-    europepmc_source_create_publication_collection_document.Transformer
-)
-EuropePMCSourceCreateXMLCollectionDocument = (
-    europepmc_source_create_xml_collection_document.Transformer
-)
-EuropePMCXMLCreatePublicationDocument = (
-    europepmc_xml_create_publication_document.Transformer
-)
+from ..utils import Registry
+
+# Transformer modules are only imported when first used, as some of these pull
+# in heavy dependencies, e.g. OCR or speech recognition libraries.
+__transformers__ = {
+    "HTMLDocumentSubReplaceForUnicode": "html_document_sub_replace_for_unicode",
+    "HTMLDocumentSupReplaceForUnicode": "html_document_sup_replace_for_unicode",
+    "HTMLSourceCreateDocument": "html_source_create_document",
+    "HTMLSourceCreateImageSource": "html_source_create_image_source",
+    "HTMLDocumentImagesExtract": "html_document_images_extract",
+    "ImageSourceCreateTextDocument": "image_source_create_text_document",
+    "ImageSourceCreateTabularDocument": "image_source_create_tabular_document",
+    "ImageSourceCreateReferenceTextDocument": "image_source_create_reference_text_document",
+    "PDFSourceTablesExtract": "pdf_source_tables_extract",
+    "PDFSourceImagesExtract": "pdf_source_images_extract",
+    "PDFSourceShapesExtract": "pdf_source_shapes_extract",
+    "PDFSourceCropExtract": "pdf_source_crop_extract",
+    "PDFSourceTextExtract": "pdf_source_text_extract",
+    "PDFSourceCreateTextDocument": "pdf_source_create_text_document",
+    "PDFSourceCreateTextDocumentOCR": "pdf_source_create_text_document_ocr",
+    "PDFSourceCreateTextDocumentReplacedExtractables": "pdf_source_create_text_document_replaced_extractables",
+    "PDFSourceCreateTextDocumentHybrid": "pdf_source_create_text_document_hybrid",
+    "PDFSourceCreateTextDocumentHybridReplacedExtractables": "pdf_source_create_text_document_hybrid_replaced_extractables",
+    "PDFSourceCreateFormDocument": "pdf_source_create_form_document",
+    "PDFSourceCreateTabularCollectionDocument": "pdf_source_create_tabular_collection_document",
+    "PDFSourceCreateTabularCollectionDocumentWithRegexp": "pdf_source_create_tabular_collection_document_with_regexp",
+    "PDFSourceCreateTabularCollectionDocumentWithDividers": "pdf_source_create_tabular_collection_document_with_dividers",
+    "PDFSourceCreateTabularCollectionDocumentHybrid": "pdf_source_create_tabular_collection_document_hybrid",
+    "PDFSourceImagesCreateResourceCollectionDocument": "pdf_source_images_create_resource_collection_document",
+    "PDFSourceShapesCreateResourceCollectionDocument": "pdf_source_shapes_create_resource_collection_document",
+    "PDFSourceTextCreateTextCollectionDocument": "pdf_source_text_create_text_collection_document",
+    "PDFSourceCropCreateImageSource": "pdf_source_crop_create_image_source",
+    "PDFSourceCreatePublicationDocument": "pdf_source_create_publication_document",
+    "PPTXSourceCreateTextDocument": "pptx_source_create_text_document",
+    "TwitterSourceCreateFormCollectionDocument": "twitter_source_create_form_collection_document",
+    "TwitterSourceCreatePublicationCollectionDocument": "twitter_source_create_publication_collection_document",
+    "TextSourceCreateDocument": "text_source_create_document",
+    "TextDocumentHyphensRemove": "text_document_hyphens_remove",
+    "TextDocumentStringReplace": "text_document_string_replace",
+    "TextDocumentAddPassageMarker": "text_document_add_passage_marker",
+    "TextDocumentJoin": "text_document_join",
+    "TextCreatePassageDocument": "text_create_passage_document",
+    "TextCreateXMLDocument": "text_create_xml_document",
+    "TextSplitIntoCollectionDocument": "text_split_into_collection_document",
+    "XMLSourceCreateDocument": "xml_source_create_document",
+    "XMLCreateTextDocument": "xml_create_text_document",
+    "XMLDocumentTagReplace": "xml_document_tag_replace",
+    "PassageDocumentAddMetadata": "passage_document_add_metadata",
+    "PassageDocumentAddMetadataOnAttribute": "passage_document_add_metadata_on_attribute",
+    "PassageDocumentStringSplit": "passage_document_string_split",
+    "PassageDocumentTransformOnConditional": "passage_document_transform_on_conditional",
+    "PassageDocumentAddMetadataFromMetadata": "passage_document_add_metadata_from_metadata",
+    "CollectionDocumentAdd": "collection_document_add",
+    "CollectionDocumentJoin": "collection_document_join",
+    "CollectionDocumentMerge": "collection_document_merge",
+    "CollectionDocumentTransform": "collection_document_transform",
+    "CollectionDocumentTransformOnConditional": "collection_document_transform_on_conditional",
+    "CollectionDocumentRemoveOnConditional": "collection_document_remove_on_conditional",
+    "CSVSourceCreateTabularDocument": "csv_source_create_tabular_document",
+    "XLSSourceCreateImage": "xls_source_create_image",
+    "XLSSourceCreateTabularDocument": "xls_source_create_tabular_document",
+    "XLSSourceCreateTabularCollectionDocument": "xls_source_create_tabular_collection_document",
+    "TabularDocumentJoin": "tabular_document_join",
+    "TabularDocumentFit": "tabular_document_fit",
+    "TabularDocumentCreateFormCollection": "tabular_document_create_form_collection",
+    "TabularDocumentCreateMDPassage": "tabular_document_create_md_passage",
+    "TabularDocumentRowRemoveOnConditional": "tabular_document_row_remove_on_conditional",
+    "TabularDocumentCellTransposeOnConditional": "tabular_document_cell_transpose_on_conditional",
+    "TabularDocumentRowMergeOnConditional": "tabular_document_row_merge_on_conditional",
+    "TabularDocumentColumnsInsert": "tabular_document_columns_insert",
+    "TabularDocumentColumnsStringReplace": "tabular_document_columns_string_replace",
+    "TabularDocumentColumnsUpdateWithExtractables": "tabular_document_columns_update_with_extractables",
+    "TabularDocumentCreateFormCollectionWithHeaders": "tabular_document_create_form_collection_with_headers",
+    "TabularDocumentStripUntilConditional": "tabular_document_strip_until_conditional",
+    "ResourceCreateTextDocument": "resource_create_text_document",
+    "DocumentExtract": "document_extract",
+    "AudioSourceCreateTextDocument": "audio_source_create_text_document",
+    "DocumentSourceCreateDocument": "document_source_create_document",
+    "EmailSourceCreateTextCollectionDocument": "email_source_create_text_collection_document",
+    "EmailSourceCreateHTMLCollectionDocument": "email_source_create_html_collection_document",
+    "ProQuestSourceCreateXMLCollectionDocument": "proquest_source_create_xml_collection_document",
+    "ProQuestSourceCreatePublicationCollectionDocument": "proquest_source_create_publication_collection_document",
+    "DOCXSourceCreateImage": "docx_source_create_image",
+    "DOCXSourceCreateTextDocument": "docx_source_create_text_document",
+    "FormDocumentSet": "form_document_set",
+    "PubmedSourceCreateXMLCollectionDocument": "pubmed_source_create_xml_collection_document",
+    "PubmedSourceCreateTextCollectionDocument": "pubmed_source_create_text_collection_document",
+    "PubmedSourceCreatePublicationCollectionDocument": "pubmed_source_create_publication_collection_document",
+    "PubmedXMLCreatePublicationDocument": "pubmed_xml_create_publication_document",
+    "RedditSourceCreateFormCollectionDocument": "reddit_source_create_form_collection_document",
+    "RedditSourceCreatePublicationCollectionDocument": "reddit_source_create_publication_collection_document",
+    "LitCovidSourceCreatePublicationCollectionDocument": "litcovid_source_create_publication_collection_document",
+    "BiorxivSourceCreatePublicationCollectionDocument": "biorxiv_source_create_publication_collection_document",
+    "BiorxivSourceCreateXMLCollectionDocument": "biorxiv_source_create_xml_collection_document",
+    "BiorxivXMLCreatePublicationDocument": "biorxiv_xml_create_publication_document",
+    "EuropePMCSourceCreatePublicationCollectionDocument": "europepmc_source_create_publication_collection_document",
+    "EuropePMCSourceCreateXMLCollectionDocument": "europepmc_source_create_xml_collection_document",
+    "EuropePMCXMLCreatePublicationDocument": "europepmc_xml_create_publication_document",
+}
+
+__plugins_loaded__ = False
+
+
+def load_plugins():
+    """
+    Registers plugin transformers in this module, once. Plugins need the full
+    import path to sub-class built-in transformers, e.g:
+
+    class Transformer(transformers.form_document_set.Transformer):
+        pass
+    """
+
+    global __plugins_loaded__
+
+    if __plugins_loaded__:
+        return
+
+    __plugins_loaded__ = True
+    manager.default.register(
+        sys.modules[__name__], "transformers", base.BaseTransformer
+    )
+
+
+def _import_plugins():
+    """
+    Imports every plugin transformer, so they can be looked up by type.
+    """
+
+    load_plugins()
+    manager.default.load("transformers")
+
+
+registry = Registry(base.BaseTransformer, __name__, loader=_import_plugins)
+
+
+def __getattr__(name):
+    if name.startswith("__"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    if name in __transformers__:
+        module = importlib.import_module(f"{__name__}.{__transformers__[name]}")
+        globals()[name] = module.Transformer
+        return module.Transformer
+
+    try:
+        return importlib.import_module(f"{__name__}.{name}")
+    except ModuleNotFoundError as e:
+        if e.name != f"{__name__}.{name}":
+            raise
+
+    load_plugins()
+    return manager.default.resolve(__name__, name)
+
+
+def __dir__():
+    load_plugins()
+    plugins = manager.default.classes.get(__name__, {})
+    return sorted(set(globals()) | set(__transformers__) | set(plugins))
@@ -22,19 +22,21 @@
 
 
 import os
+import logging
 import multiprocessing as mp
 import numpy as np
 import wave
 
 from deepspeech import Model
 from pydantic import BaseModel
-from typing import Optional
+from typing import ClassVar, Optional
 from typing_extensions import Literal
 
 from .. import documents
 from .. import sources
-from .base import BaseTransformer, WrongTransformerInput
+from .base import BaseTransformer, WrongTransformerInput, MEMORY
 
+__logger__ = logging.getLogger("ingestum")
 __script__ = os.path.basename(__file__).replace(".py", "")
 
 DATA_DIR_DEFAULT = os.path.join(os.path.expanduser("~"), ".deepspeech")
@@ -88,6 +90,23 @@ class Transformer(BaseTransformer):
     outputs: Optional[OutputsModel]
 
     type: Literal[__script__] = __script__
+    resource_class: ClassVar[str] = MEMORY
+
+    @classmethod
+    def warm(cls):
+        # the model is loaded by a process of its own for every call, so
+        # only make sure it's there
+        for path in [MODEL_PATH, SCORER_PATH]:
+            if not os.path.exists(path):
+                __logger__.warning(
+                    "model for speech-to-text",
+                    extra={
+                        "props": {
+                            "transformer": __script__,
+                            "warning": f"{path} not found",
+                        }
+                    },
+                )
 
     @staticmethod
     def extract(source):
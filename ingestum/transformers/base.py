@@ -24,7 +24,7 @@
 import os
 import logging
 import datetime
-from typing import Dict
+from typing import ClassVar, Dict
 
 from pydantic import BaseModel
 from typing_extensions import Literal
@@ -33,6 +33,12 @@ __logger__ = logging.getLogger("ingestum")
 __script__ = os.path.basename(__file__).replace(".py", "")
 
 
+CPU = "cpu"
+IO = "io"
+MEMORY = "memory"
+RESOURCE_CLASSES = (CPU, IO, MEMORY)
+
+
 class WrongTransformerInput(Exception):
     pass
 
@@ -50,11 +56,18 @@ class BaseTransformer(BaseModel):
 
     As a result, another document is generated. The resulting document schema
     can differ from the original document.
+
+    Transformers declare the resource they need the most in
+    ``resource_class``, so the engine can schedule them accordingly: ``cpu``
+    by default, ``io`` for those mostly waiting on remote services, and
+    ``memory`` for those loading large models.
     """
 
     class Config:
         extra = "allow"
 
+    resource_class: ClassVar[str] = CPU
+
     class ArgumentsModel(BaseModel):
         pass
 
@@ -96,6 +109,14 @@ class BaseTransformer(BaseModel):
                 "inputs and outputs members " "should be Optional"
             )
 
+    @classmethod
+    def warm(cls) -> None:
+        """
+        Loads ahead of time the expensive resources this transformer needs,
+        e.g., dictionaries, so that worker processes forked afterwards share
+        them instead of loading their own. Does nothing by default.
+        """
+
     def transform(self, **kargs) -> None:
         __logger__.debug("transforming", extra={"props": {"transformer": self.type}})
         self.InputsModel.validate(kargs)
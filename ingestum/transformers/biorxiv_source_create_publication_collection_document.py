@@ -29,7 +29,7 @@ import datetime
 import pycountry
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import ClassVar, Optional
 from typing_extensions import Literal
 from bs4 import BeautifulSoup
 from urllib.parse import urlencode, urljoin, quote
@@ -38,7 +38,7 @@ from .. import documents
 from .. import sources
 from .. import errors
 from .. import utils
-from .base import BaseTransformer
+from .base import BaseTransformer, IO
 
 __logger__ = logging.getLogger("ingestum")
 __script__ = os.path.basename(__file__).replace(".py", "")
@@ -125,6 +125,7 @@ class Transformer(BaseTransformer):
     outputs: Optional[OutputsModel]
 
     type: Literal[__script__] = __script__
+    resource_class: ClassVar[str] = IO
 
     def get_authors(self, xml):
         authors = []
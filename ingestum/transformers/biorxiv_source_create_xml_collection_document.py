@@ -23,11 +23,12 @@
 import os
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import ClassVar, Optional
 from typing_extensions import Literal
 from bs4 import BeautifulSoup
 
 from .. import documents
+from .base import IO
 from .. import sources
 from .biorxiv_source_create_publication_collection_document import (
     Transformer as BaseTransformer,
@@ -81,6 +82,7 @@ class Transformer(BaseTransformer):
     arguments: ArgumentsModel
 
     type: Literal[__script__] = __script__
+    resource_class: ClassVar[str] = IO
 
     def get_publication(self, xml, url):
         # handle XML
@@ -28,6 +28,7 @@ from typing import Optional
 from typing_extensions import Literal
 
 from .. import documents
+from ..documents.base import derive
 from .base import BaseTransformer
 
 __script__ = os.path.basename(__file__).replace(".py", "")
@@ -61,10 +62,8 @@ class Transformer(BaseTransformer):
         super().transform(collection=collection, document=document)
 
         if collection is None:
-            _collection = documents.Collection.new_from(document)
-        else:
-            _collection = collection.new_from(collection)
+            collection = documents.Collection.new_from(document)
 
-        _collection.content.append(document)
-
-        return _collection
+        return collection.new_from(
+            collection, content=derive(collection.content + [document])
+        )
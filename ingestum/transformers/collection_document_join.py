@@ -24,21 +24,18 @@
 import os
 
 from pydantic import BaseModel
-from typing import Optional, Union
+from typing import Optional
 from typing_extensions import Literal
-from ..utils import find_subclasses
 
 from .. import documents
+from . import registry
 from .base import BaseTransformer
 
 __script__ = os.path.basename(__file__).replace(".py", "")
-__transformers__ = tuple(
-    [
-        t
-        for t in find_subclasses(BaseTransformer)
-        if "merge" in t.__module__ or "join" in t.__module__
-    ]
-)
+
+
+def accept(transformer):
+    return "merge" in transformer.__module__ or "join" in transformer.__module__
 
 
 class Transformer(BaseTransformer):
@@ -52,7 +49,9 @@ class Transformer(BaseTransformer):
     """
 
     class ArgumentsModel(BaseModel):
-        transformer: Union[__transformers__]
+        transformer: BaseTransformer
+
+        validate_transformer = registry.validator("transformer", accept=accept)
 
     class InputsModel(BaseModel):
         collection: documents.Collection
@@ -28,6 +28,7 @@ from typing import Optional
 from typing_extensions import Literal
 
 from .. import documents
+from ..documents.base import derive
 from .base import BaseTransformer
 
 __script__ = os.path.basename(__file__).replace(".py", "")
@@ -59,9 +60,8 @@ class Transformer(BaseTransformer):
     ) -> documents.Collection:
         super().transform(collection_1=collection_1, collection_2=collection_2)
 
-        collection = collection_1.new_from(
-            collection_1, title=f"{collection_1.title} - {collection_2.title}"
+        return collection_1.new_from(
+            collection_1,
+            title=f"{collection_1.title} - {collection_2.title}",
+            content=derive(collection_1.content + collection_2.content),
         )
-        collection.content.extend(collection_2.content)
-
-        return collection
@@ -24,16 +24,15 @@
 import os
 
 from pydantic import BaseModel
-from typing import Optional, Union
+from typing import Optional
 from typing_extensions import Literal
 
 from .. import documents
+from ..documents.base import derive
 from .. import conditionals
 from .base import BaseTransformer
-from ..utils import find_subclasses
 
 __script__ = os.path.basename(__file__).replace(".py", "")
-__conditionals__ = tuple(find_subclasses(conditionals.base.BaseConditional))
 
 
 class Transformer(BaseTransformer):
@@ -47,7 +46,9 @@ class Transformer(BaseTransformer):
     """
 
     class ArgumentsModel(BaseModel):
-        conditional: Union[__conditionals__]
+        conditional: conditionals.base.BaseConditional
+
+        validate_conditional = conditionals.registry.validator("conditional")
 
     class InputsModel(BaseModel):
         collection: documents.Collection
@@ -67,6 +68,6 @@ class Transformer(BaseTransformer):
         content = []
         for document in collection.content:
             if self.arguments.conditional.evaluate(document) is False:
-                content.append(document.new_from(document))
+                content.append(derive(document))
 
         return collection.new_from(collection, content=content)
@@ -24,15 +24,14 @@
 import os
 
 from pydantic import BaseModel
-from typing import Optional, Union
+from typing import Optional
 from typing_extensions import Literal
 
 from .. import documents
+from . import registry
 from .base import BaseTransformer
-from ..utils import find_subclasses
 
 __script__ = os.path.basename(__file__).replace(".py", "")
-__transformers__ = tuple(list(find_subclasses(BaseTransformer)) + ["Transformer"])
 
 
 class Transformer(BaseTransformer):
@@ -45,7 +44,9 @@ class Transformer(BaseTransformer):
     """
 
     class ArgumentsModel(BaseModel):
-        transformer: Union[__transformers__]
+        transformer: BaseTransformer
+
+        validate_transformer = registry.validator("transformer")
 
     class InputsModel(BaseModel):
         collection: documents.Collection
@@ -70,7 +71,3 @@ class Transformer(BaseTransformer):
             content.append(self.arguments.transformer.transform(document))
 
         return collection.new_from(collection, content=content)
-
-
-Transformer.ArgumentsModel.update_forward_refs()
-Transformer.update_forward_refs()
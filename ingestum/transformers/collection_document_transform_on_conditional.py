@@ -24,17 +24,16 @@
 import os
 
 from pydantic import BaseModel
-from typing import Optional, Union
+from typing import Optional
 from typing_extensions import Literal
 
 from .. import documents
+from ..documents.base import derive
 from .. import conditionals
+from . import registry
 from .base import BaseTransformer
-from ..utils import find_subclasses
 
 __script__ = os.path.basename(__file__).replace(".py", "")
-__transformers__ = tuple(list(find_subclasses(BaseTransformer)) + ["Transformer"])
-__conditionals__ = tuple(find_subclasses(conditionals.base.BaseConditional))
 
 
 class Transformer(BaseTransformer):
@@ -51,8 +50,11 @@ class Transformer(BaseTransformer):
     """
 
     class ArgumentsModel(BaseModel):
-        conditional: Union[__conditionals__]
-        transformer: Union[__transformers__]
+        conditional: conditionals.base.BaseConditional
+        transformer: BaseTransformer
+
+        validate_conditional = conditionals.registry.validator("conditional")
+        validate_transformer = registry.validator("transformer")
 
     class InputsModel(BaseModel):
         collection: documents.Collection
@@ -74,10 +76,6 @@ class Transformer(BaseTransformer):
             if self.arguments.conditional.evaluate(document) is True:
                 content.append(self.arguments.transformer.transform(document))
             else:
-                content.append(document.new_from(document))
+                content.append(derive(document))
 
         return collection.new_from(collection, content=content)
-
-
-Transformer.ArgumentsModel.update_forward_refs()
-Transformer.update_forward_refs()
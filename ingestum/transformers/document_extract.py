@@ -30,10 +30,28 @@ from typing_extensions import Literal
 
 from .. import documents
 from .base import BaseTransformer
-from ..utils import stringify_document
+from ..utils import write_document
 
 __script__ = os.path.basename(__file__).replace(".py", "")
 
+REPLACE = "[file:///%s]"
+
+
+class _Replaced:
+    """
+    Writes to a file, replacing the original names of images with their
+    unique names on the way.
+    """
+
+    def __init__(self, file, table):
+        self.file = file
+        self.table = table
+
+    def write(self, text):
+        for name, unique in self.table.items():
+            text = text.replace(REPLACE % name, REPLACE % unique)
+        self.file.write(text)
+
 
 class Transformer(BaseTransformer):
     """
@@ -90,22 +108,11 @@ class Transformer(BaseTransformer):
 
         return table
 
-    def preprocess_document(self, document):
-        document = stringify_document(document)
-
-        replace = "[file:///%s]"
-        table = self.preprocess_images()
-        for name, unique in table.items():
-            document = document.replace(replace % name, replace % unique)
-
-        return document
-
     def extract(self, document):
-        document = self.preprocess_document(document)
         path = os.path.join(self.arguments.directory, self.arguments.output)
         with open(path, "w") as file:
-            file.write(document)
-        return document
+            write_document(document, _Replaced(file, self.preprocess_images()))
+        return path
 
     def transform(self, document: documents.Base) -> documents.Base:
         super().transform(document=document)
@@ -113,6 +120,6 @@ class Transformer(BaseTransformer):
         if not os.path.exists(self.arguments.directory):
             os.makedirs(self.arguments.directory)
 
-        retval = self.extract(document)
+        path = self.extract(document)
 
-        return documents.Collection.parse_raw(retval)
+        return documents.Collection.parse_file(path)
@@ -24,16 +24,15 @@
 import os
 
 from pydantic import BaseModel
-from typing import Union, Optional
+from typing import Optional
 from typing_extensions import Literal
 
 from .. import documents
 from .. import sources
 from .base import BaseTransformer
-from ..utils import find_subclasses, get_document_from_path
+from ..utils import get_document_from_path
 
 __script__ = os.path.basename(__file__).replace(".py", "")
-__documents__ = tuple(find_subclasses(documents.Base))
 
 
 class Transformer(BaseTransformer):
@@ -48,7 +47,7 @@ class Transformer(BaseTransformer):
         source: sources.Document
 
     class OutputsModel(BaseModel):
-        document: Union[__documents__]
+        document: documents.Base
 
     arguments: ArgumentsModel
     inputs: Optional[InputsModel]
@@ -56,7 +55,7 @@ class Transformer(BaseTransformer):
 
     type: Literal[__script__] = __script__
 
-    def transform(self, source: sources.Document) -> Union[__documents__]:
+    def transform(self, source: sources.Document) -> documents.Base:
         super().transform(source=source)
 
         return get_document_from_path(source.path)
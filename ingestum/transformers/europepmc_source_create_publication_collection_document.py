@@ -26,7 +26,7 @@ import logging
 import requests
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import ClassVar, Optional
 from typing_extensions import Literal
 from bs4 import BeautifulSoup
 from urllib.parse import urlencode, urljoin
@@ -37,7 +37,7 @@ from .. import documents
 from .. import sources
 from .. import errors
 from .. import utils
-from .base import BaseTransformer
+from .base import BaseTransformer, IO
 
 __logger__ = logging.getLogger("ingestum")
 __script__ = os.path.basename(__file__).replace(".py", "")
@@ -100,6 +100,7 @@ class Transformer(BaseTransformer):
     outputs: Optional[OutputsModel]
 
     type: Literal[__script__] = __script__
+    resource_class: ClassVar[str] = IO
 
     def get_abstract(self, res_abstract):
         soup = BeautifulSoup(res_abstract, "html.parser")
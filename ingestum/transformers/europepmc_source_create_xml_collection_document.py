@@ -24,10 +24,11 @@ import os
 import logging
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import ClassVar, Optional
 from typing_extensions import Literal
 
 from .. import documents
+from .base import IO
 from .. import sources
 from .europepmc_source_create_publication_collection_document import (
     Transformer as TTransformer,
@@ -66,6 +67,7 @@ class Transformer(TTransformer):
     arguments: ArgumentsModel
 
     type: Literal[__script__] = __script__
+    resource_class: ClassVar[str] = IO
 
     def get_document(self, result):
         # Get provider id
@@ -61,7 +61,6 @@ class Transformer(BaseTransformer):
     ) -> documents.Text:
         super().transform(document=document, key=key, value=value)
 
-        document = documents.Form.new_from(document)
-        document.content[key.content] = value.content
-
-        return document
+        return documents.Form.new_from(
+            document, content={**document.content, key.content: value.content}
+        )
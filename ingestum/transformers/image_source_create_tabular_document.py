@@ -34,6 +34,7 @@ from typing_extensions import Literal
 from .. import documents
 from .. import sources
 from .. import utils
+from ..plugins import manager
 from .base import BaseTransformer
 
 __script__ = os.path.basename(__file__).replace(".py", "")
@@ -88,6 +89,11 @@ class Transformer(BaseTransformer):
 
     type: Literal[__script__] = __script__
 
+    @classmethod
+    def warm(cls):
+        # import all OCR engine classes, including plugins
+        manager.default.load("transformers")
+
     def preprocess_for_lines(self, img):
         """Returns an image consisting solely of table lines in white on a
         black background."""
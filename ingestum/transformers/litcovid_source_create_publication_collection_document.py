@@ -25,7 +25,7 @@ import os
 import asyncio
 import time
 
-from typing import Optional
+from typing import ClassVar, Optional
 from typing_extensions import Literal
 from pyppeteer import launch
 from bs4 import BeautifulSoup
@@ -34,6 +34,7 @@ from urllib.parse import urlencode, urljoin, quote
 from .. import sources
 from .. import documents
 from .base import BaseTransformer as _BaseTransformer
+from .base import IO
 from .pubmed_source_create_publication_collection_document import (
     Transformer as BaseTransformer,
 )
@@ -84,6 +85,7 @@ class Transformer(BaseTransformer):
     outputs: Optional[OutputsModel]
 
     type: Literal[__script__] = __script__
+    resource_class: ClassVar[str] = IO
 
     async def get_page_body_html(self, page_no):
         # Create a browser and navigate to query
@@ -24,23 +24,19 @@
 import os
 
 from pydantic import BaseModel
-from typing import Optional, Union
+from typing import Optional
 from typing_extensions import Literal
-from ..utils import find_subclasses
 
 from .. import documents
 from .. import conditionals
+from . import registry
 from .base import BaseTransformer
 
 __script__ = os.path.basename(__file__).replace(".py", "")
-__conditionals__ = tuple(find_subclasses(conditionals.base.BaseConditional))
-__transformers__ = tuple(
-    [
-        t
-        for t in find_subclasses(BaseTransformer)
-        if ".passage_" in t.__module__ or ".text" in t.__module__
-    ]
-)
+
+
+def accept(transformer):
+    return ".passage_" in transformer.__module__ or ".text" in transformer.__module__
 
 
 class Transformer(BaseTransformer):
@@ -57,8 +53,11 @@ class Transformer(BaseTransformer):
     """
 
     class ArgumentsModel(BaseModel):
-        conditional: Union[__conditionals__]
-        transformer: Union[__transformers__]
+        conditional: conditionals.base.BaseConditional
+        transformer: BaseTransformer
+
+        validate_conditional = conditionals.registry.validator("conditional")
+        validate_transformer = registry.validator("transformer", accept=accept)
 
     class InputsModel(BaseModel):
         document: documents.Passage
@@ -41,6 +41,7 @@ from pytesseract import Output
 from .. import documents
 from .. import sources
 from .. import utils
+from ..plugins import manager
 from .base import BaseTransformer
 
 __script__ = os.path.basename(__file__).replace(".py", "")
@@ -154,6 +155,11 @@ class Transformer(BaseTransformer):
 
     type: Literal[__script__] = __script__
 
+    @classmethod
+    def warm(cls):
+        # import all OCR engine classes, including plugins
+        manager.default.load("transformers")
+
     @staticmethod
     def get_size(source):
         pdf = open(source.path, "rb")
@@ -25,10 +25,10 @@ import os
 
 from bs4 import BeautifulSoup
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import ClassVar, Optional, List
 from typing_extensions import Literal
 
-from .base import BaseTransformer
+from .base import BaseTransformer, IO
 from .. import sources
 from .. import documents
 from ..utils import create_request
@@ -73,6 +73,7 @@ class Transformer(BaseTransformer):
     outputs: Optional[OutputsModel]
 
     type: Literal[__script__] = __script__
+    resource_class: ClassVar[str] = IO
 
     def get_document(self, source, origin, content):
         return documents.XML.new_from(source, origin=origin, content=content)
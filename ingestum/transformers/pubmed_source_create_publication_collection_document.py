@@ -27,9 +27,10 @@ import logging
 
 from bs4 import BeautifulSoup
 from typing_extensions import Literal
-from typing import Optional
+from typing import ClassVar, Optional
 
 from .pubmed_source_create_xml_collection_document import Transformer as TTransformer
+from .base import IO
 from .. import sources
 from .. import documents
 from ..utils import (
@@ -77,6 +78,7 @@ class Transformer(TTransformer):
     arguments: ArgumentsModel
 
     type: Literal[__script__] = __script__
+    resource_class: ClassVar[str] = IO
 
     def get_authors(self, res_authors):
         authors = []
@@ -29,11 +29,11 @@ import datetime
 from bs4 import BeautifulSoup
 from urllib.parse import urlencode, urljoin
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import ClassVar, Optional, List
 from typing_extensions import Literal
 from requests.exceptions import RequestException
 
-from .base import BaseTransformer
+from .base import BaseTransformer, IO
 from .. import sources
 from .. import documents
 from .. import errors
@@ -190,6 +190,7 @@ class Transformer(BaseTransformer):
     outputs: Optional[OutputsModel]
 
     type: Literal[__script__] = __script__
+    resource_class: ClassVar[str] = IO
 
     def get_start(self):
         delta = datetime.timedelta(hours=self.arguments.hours)
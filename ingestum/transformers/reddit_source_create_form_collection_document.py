@@ -25,12 +25,12 @@ import os
 import logging
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import ClassVar, Optional
 from typing_extensions import Literal
 
 from .. import documents
 from .. import sources
-from .base import BaseTransformer
+from .base import BaseTransformer, IO
 
 __logger__ = logging.getLogger("ingestum")
 __script__ = os.path.basename(__file__).replace(".py", "")
@@ -71,6 +71,7 @@ class Transformer(BaseTransformer):
     outputs: Optional[OutputsModel]
 
     type: Literal[__script__] = __script__
+    resource_class: ClassVar[str] = IO
 
     def search_reddit(self, source, search_query, subreddit_name):
         # Get Reddit instance.
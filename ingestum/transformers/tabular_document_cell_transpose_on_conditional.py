@@ -31,10 +31,8 @@ from typing_extensions import Literal
 from .. import documents
 from .. import conditionals
 from .base import BaseTransformer
-from ..utils import find_subclasses
 
 __script__ = os.path.basename(__file__).replace(".py", "")
-__conditionals__ = tuple(find_subclasses(conditionals.base.BaseConditional))
 
 
 class Transformer(BaseTransformer):
@@ -56,11 +54,13 @@ class Transformer(BaseTransformer):
     """
 
     class ArgumentsModel(BaseModel):
-        conditional: Union[__conditionals__]
+        conditional: conditionals.base.BaseConditional
         column: int
         position: Union[int, None]
         reverse: bool = False
 
+        validate_conditional = conditionals.registry.validator("conditional")
+
     class InputsModel(BaseModel):
         document: documents.Tabular
 
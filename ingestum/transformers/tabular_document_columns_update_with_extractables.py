@@ -107,9 +107,13 @@ class Transformer(BaseTransformer):
     ) -> documents.Collection:
         super().transform(collection=collection, extractables=extractables)
 
-        _collection = collection.new_from(collection)
-
-        for document in _collection.content:
+        content = []
+        for document in collection.content:
+            # tables are updated in place, so only copy their rows
+            document = document.new_from(
+                document, content=[list(row) for row in document.content]
+            )
             self.update_table(document, extractables)
+            content.append(document)
 
-        return _collection
+        return collection.new_from(collection, content=content)
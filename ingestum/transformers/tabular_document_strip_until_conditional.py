@@ -26,16 +26,14 @@ import copy
 import numpy as np
 
 from pydantic import BaseModel
-from typing import Optional, Union
+from typing import Optional
 from typing_extensions import Literal
 
 from .. import documents
 from .. import conditionals
 from .base import BaseTransformer
-from ..utils import find_subclasses
 
 __script__ = os.path.basename(__file__).replace(".py", "")
-__conditionals__ = tuple(find_subclasses(conditionals.base.BaseConditional))
 
 
 class Transformer(BaseTransformer):
@@ -50,9 +48,11 @@ class Transformer(BaseTransformer):
     """
 
     class ArgumentsModel(BaseModel):
-        conditional: Union[__conditionals__]
+        conditional: conditionals.base.BaseConditional
         transpose: bool = False
 
+        validate_conditional = conditionals.registry.validator("conditional")
+
     class InputsModel(BaseModel):
         document: documents.Tabular
 
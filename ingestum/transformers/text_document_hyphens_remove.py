@@ -22,6 +22,7 @@
 
 import os
 import logging
+import functools
 
 import nltk
 from nltk.corpus import words
@@ -41,6 +42,29 @@ NLTK_DATA = os.environ.get("NLTK_DATA", NLTK_DATA_DIR_DEFAULT)
 EN_DICTIONARY_PATH = os.path.join(NLTK_DATA, "corpora", "words", "en")
 
 
+@functools.lru_cache(maxsize=None)
+def load_dictionary():
+    """
+    :return: The common words likely to be hyphenated, loaded once per process
+    :rtype: FrozenSet[str]
+    """
+
+    if not os.path.exists(EN_DICTIONARY_PATH):
+        __logger__.warning(
+            "dictionary for dehyphenation",
+            extra={
+                "props": {
+                    "transformer": __script__,
+                    "warning": str(EN_DICTIONARY_PATH + " not found"),
+                }
+            },
+        )
+        nltk.download("words")
+
+    # Short words are not likely to be hyphenated, so...
+    return frozenset(word for word in words.words() if len(word) > 5)
+
+
 class Transformer(BaseTransformer):
     """
     Transforms a `Text` document with words separated by hyphens into another
@@ -61,10 +85,12 @@ class Transformer(BaseTransformer):
     inputs: Optional[InputsModel]
     outputs: Optional[OutputsModel]
 
-    dictionary = []
-
     type: Literal[__script__] = __script__
 
+    @classmethod
+    def warm(cls):
+        load_dictionary()
+
     def strip_text(self, text):
         """
         Remove common HTML tags and some punctuation.
@@ -131,6 +157,8 @@ class Transformer(BaseTransformer):
         hlist = []
         # and a list of words we will dehyphenate.
         remove_hyphen_list = []
+        # and the common-word dictionary.
+        dictionary = load_dictionary()
 
         for text in lines:
             words = text.split()
@@ -153,11 +181,11 @@ class Transformer(BaseTransformer):
             term = hw.replace("-", "")
             if term in wlist:
                 remove_hyphen_list.append(hw)
-            elif term in self.dictionary:
+            elif term in dictionary:
                 remove_hyphen_list.append(hw)
-            elif self.simple_singular(term) in self.dictionary:
+            elif self.simple_singular(term) in dictionary:
                 remove_hyphen_list.append(hw)
-            elif self.simple_present(term) in self.dictionary:
+            elif self.simple_present(term) in dictionary:
                 remove_hyphen_list.append(hw)
 
         __logger__.debug(
@@ -196,23 +224,6 @@ class Transformer(BaseTransformer):
     def transform(self, document: documents.Text) -> documents.Text:
         super().transform(document=document)
 
-        # Read the common word dictionary
-        if not os.path.exists(EN_DICTIONARY_PATH):
-            __logger__.warning(
-                "dictionary for dehyphenation",
-                extra={
-                    "props": {
-                        "transformer": self.type,
-                        "warning": str(EN_DICTIONARY_PATH + " not found"),
-                    }
-                },
-            )
-            nltk.download("words")
-        for word in words.words():
-            # Short words are not likely to be hyphenated, so...
-            if len(word) > 5:
-                self.dictionary.append(word)
-
         content = self.dehyphenate(document.content)
 
         return document.new_from(document, content=content)
@@ -26,12 +26,12 @@ import logging
 import tweepy
 
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import ClassVar, Optional, List
 from typing_extensions import Literal
 
 from .. import documents
 from .. import sources
-from .base import BaseTransformer
+from .base import BaseTransformer, IO
 
 __logger__ = logging.getLogger("ingestum")
 __script__ = os.path.basename(__file__).replace(".py", "")
@@ -77,6 +77,7 @@ class Transformer(BaseTransformer):
     outputs: Optional[OutputsModel]
 
     type: Literal[__script__] = __script__
+    resource_class: ClassVar[str] = IO
 
     def search_twitter(self, source):
         python_api = source.get_api()
@@ -22,15 +22,16 @@
 
 import os
 import json
+import importlib
 import time
 import requests
 import logging
 
+from pydantic import BaseModel, validator
 from urllib3.util.retry import Retry
 from requests.adapters import HTTPAdapter
 
 from json.decoder import JSONDecodeError
-from nltk.tokenize import RegexpTokenizer
 
 from requests_cache import CachedSession
 from datetime import datetime
@@ -72,6 +73,127 @@ def find_subclasses(cls):
     )
 
 
+class Registry:
+    """
+    Maps the type names of a family of models, e.g., transformers, to their
+    classes, without requiring every model module to be imported upfront.
+
+    On a miss, the module named after the type is imported from the given
+    package, and then the given loader is called, e.g., to load plugins,
+    before giving up.
+
+    :param base: Base class of the family
+    :type base: type
+    :param package: Package where modules are named after their types
+    :type package: Optional[str]
+    :param loader: Called once when a type can't be found otherwise
+    :type loader: Optional[Callable]
+    """
+
+    def __init__(self, base, package=None, loader=None):
+        self.base = base
+        self.package = package
+        self.loader = loader
+        self.classes = {}
+
+    def refresh(self):
+        classes = {}
+
+        for cls in find_subclasses(self.base):
+            field = cls.__fields__.get("type")
+            if field is None:
+                continue
+            # prefer the class defined in the module named after its type
+            name = field.default
+            if name in classes and not cls.__module__.endswith(f".{name}"):
+                continue
+            classes[name] = cls
+
+        self.classes = classes
+
+    def _import(self, name):
+        if self.package is None:
+            return
+
+        module = f"{self.package}.{name}"
+        try:
+            importlib.import_module(module)
+        except ModuleNotFoundError as e:
+            # only a missing module is a miss, missing dependencies are not
+            if e.name != module:
+                raise
+
+    def get(self, name):
+        """
+        :param name: Type name
+        :type name: str
+
+        :raises ValueError: If no class has that type name
+
+        :return: The class with the given type name
+        :rtype: type
+        """
+
+        if name not in self.classes:
+            self.refresh()
+
+        if name not in self.classes:
+            self._import(name)
+            self.refresh()
+
+        if name not in self.classes and self.loader is not None:
+            self.loader()
+            self.refresh()
+
+        if name not in self.classes:
+            raise ValueError(f"unknown {self.base.__name__} type {name}")
+
+        return self.classes[name]
+
+    def validate(self, value, accept=None):
+        """
+        Turns a dictionary into an instance of the class matching its type,
+        to be used as a pre-validator for fields typed with the base class.
+
+        :param value: Dictionary or instance
+        :type value: Any
+        :param accept: Optional predicate on the class, for fields that only
+            take a subset of the family
+        :type accept: Optional[Callable]
+
+        :return: The instance, or the given value if it is not a dictionary
+        :rtype: Any
+        """
+
+        cls = type(value)
+        if isinstance(value, dict) and "type" in value:
+            cls = self.get(value["type"])
+            value = cls(**value)
+
+        if accept is not None and isinstance(value, self.base) and not accept(cls):
+            raise ValueError(f"{cls.__fields__['type'].default} is not accepted")
+
+        return value
+
+    def validator(self, *fields, accept=None):
+        """
+        Creates a pydantic pre-validator for the given fields, see
+        :meth:`validate`. Lists are validated item by item.
+
+        :param fields: Names of the fields, typed with the base class
+        :type fields: str
+        :param accept: Optional predicate on the class
+        :type accept: Optional[Callable]
+        """
+
+        def validate(cls, value):
+            if isinstance(value, list):
+                return [self.validate(v, accept=accept) for v in value]
+            return self.validate(value, accept=accept)
+
+        return validator(*fields, pre=True, allow_reuse=True)(validate)
+
+
 def safe_json_load(string):
     try:
         return json.loads(string)
@@ -120,16 +242,155 @@ def get_document_from_dict(document_dict):
     :rtype: documents.base.BaseDocument
     """
 
-    from pydantic import BaseModel
-    from typing import Union
     from . import documents
 
-    class Parser(BaseModel):
-        document: Union[tuple(find_subclasses(documents.base.BaseDocument))]
+    cls = documents.registry.get(document_dict.get("type"))
+
+    return cls(**document_dict)
+
+
+class _JSONReader:
+    """
+    Reads JSON values from a file one at a time, keeping in memory only the
+    part of the file not consumed yet.
+    """
+
+    def __init__(self, file, chunk_size):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.position = 0
+        self.decoder = json.JSONDecoder()
+
+    def _read(self, size=None):
+        chunk = self.file.read(size or self.chunk_size)
+        self.buffer = self.buffer[self.position :] + chunk
+        self.position = 0
+        return chunk != ""
+
+    def _grow(self):
+        # doubling what is buffered keeps parsing a large value linear, as
+        # it is parsed, and copied, from its start after every read
+        return self._read(max(self.chunk_size, len(self.buffer) - self.position))
+
+    def peek(self):
+        while True:
+            while self.position < len(self.buffer):
+                if not self.buffer[self.position].isspace():
+                    return self.buffer[self.position]
+                self.position += 1
+            if not self._read():
+                raise ValueError("unexpected end of JSON document")
+
+    def expect(self, characters):
+        character = self.peek()
+        if character not in characters:
+            raise ValueError(f"expected {characters!r} but found {character!r}")
+        self.position += 1
+        return character
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                # incomplete, unless the whole file was read already
+                if not self._grow():
+                    raise
+                continue
+
+            # numbers and literals could go on in the part not read yet
+            if end < len(self.buffer) or not self._grow():
+                self.position = end
+                return value
+
+
+def iter_collection_dicts(path, chunk_size=1024 * 1024):
+    """
+    Parses a collection's JSON file incrementally, yielding the dictionaries
+    of its documents one at a time, so that collections larger than the
+    memory available can be read. Other fields of the collection are parsed
+    and checked but not kept.
+
+    The type of the collection is checked as soon as it is read. Files
+    written with sorted keys have the content first, in which case the
+    type is only checked once every document was yielded.
+
+    :param path: Path to the JSON collection file
+    :type path: string
+    :param chunk_size: Number of characters read from the file at once
+    :type chunk_size: int
+
+    :raises ValueError: If the file is not a collection or not valid JSON
+
+    :return: Ingestum Document dictionaries
+    :rtype: Iterator[dict]
+    """
+
+    from . import documents
+
+    def check(_type):
+        if not issubclass(documents.registry.get(_type), documents.Collection):
+            raise ValueError(f"{path} is a {_type} document, not a collection")
 
-    parsed = Parser(document=document_dict)
+    checked = False
 
-    return parsed.document
+    with open(path) as json_file:
+        reader = _JSONReader(json_file, chunk_size)
+        reader.expect("{")
+        if reader.peek() == "}":
+            reader.expect("}")
+        else:
+            while True:
+                name = reader.value()
+                reader.expect(":")
+
+                if name == "type":
+                    check(reader.value())
+                    checked = True
+                elif name != "content":
+                    reader.value()
+                elif reader.peek() != "[":
+                    raise ValueError(f"{path} is not a collection")
+                else:
+                    reader.expect("[")
+                    if reader.peek() == "]":
+                        reader.expect("]")
+                    else:
+                        while True:
+                            item = reader.value()
+                            if not isinstance(item, dict):
+                                raise ValueError(f"{path} is not a collection")
+                            yield item
+                            if reader.expect(",]") == "]":
+                                break
+
+                if reader.expect(",}") == "}":
+                    break
+
+    if not checked:
+        raise ValueError(f"{path} has no document type")
+
+
+def iter_collection_items(path, chunk_size=1024 * 1024):
+    """
+    Same as :func:`iter_collection_dicts`, but yields validated Ingestum
+    Document instances.
+
+    :param path: Path to the JSON collection file
+    :type path: string
+    :param chunk_size: Number of characters read from the file at once
+    :type chunk_size: int
+
+    :raises ValueError: If the file is not a collection or not valid JSON
+
+    :return: Ingestum Document instances
+    :rtype: Iterator[documents.base.BaseDocument]
+    """
+
+    for item in iter_collection_dicts(path, chunk_size):
+        yield get_document_from_dict(item)
 
 
 def get_document_from_path(path):
@@ -162,6 +423,8 @@ def tokenize(words):
     tokenizer : object
         Containing tokens extracted from words
     """
+    from nltk.tokenize import RegexpTokenizer
+
     tokenizer = RegexpTokenizer(PATTERN)
     return tokenizer.tokenize(words)
 
@@ -270,21 +533,114 @@ def date_to_default_format(date: datetime.date) -> str:
     return date.isoformat()
 
 
-def stringify_document(document, formatted=True):
-    params = {}
+def _model_fields(value):
+    # models are encoded straight from their fields, so no dict() copy of
+    # the whole document is built first
+    if isinstance(value, BaseModel):
+        return value.__dict__
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+_encoder = json.JSONEncoder(ensure_ascii=False, default=_model_fields)
+_formatted_encoder = json.JSONEncoder(
+    ensure_ascii=False, indent=4, sort_keys=True, default=_model_fields
+)
 
+
+def stringify_document(document, formatted=False):
+    """
+    Serializes a document, or any other model, to JSON, the same as
+    ``json.dumps(document.dict())`` but without building that dictionary.
+
+    :param document: Document to serialize
+    :type document: pydantic.BaseModel
+    :param formatted: Whether to indent and sort keys, for humans to read
+    :type formatted: bool
+    """
+
+    if formatted is True:
+        return _formatted_encoder.encode(document)
+
+    return _encoder.encode(document)
+
+
+def _is_collection(value):
+    content = getattr(value, "content", None)
+    return (
+        isinstance(value, BaseModel)
+        and isinstance(content, list)
+        and all(isinstance(item, BaseModel) for item in content)
+    )
+
+
+def _write_value(value, document_file, formatted, level):
+    if _is_collection(value):
+        _write_collection(value, document_file, formatted, level)
+        return
+
+    text = stringify_document(value, formatted=formatted)
+    if formatted is True and level > 0:
+        # strings never hold raw line breaks, these are all indentation
+        text = text.replace("\n", "\n" + " " * 4 * level)
+    document_file.write(text)
+
+
+def _write_collection(collection, document_file, formatted, level):
     if formatted is True:
-        params = {
-            "indent": 4,
-            "sort_keys": True,
-        }
+        indent = "\n" + " " * 4 * (level + 1)
+        fields = sorted(collection.__dict__.items())
+        separator = "," + indent
+        closing = "\n" + " " * 4 * level
+    else:
+        indent = ""
+        fields = collection.__dict__.items()
+        separator = ", "
+        closing = ""
+
+    document_file.write("{" + indent)
+    for index, (name, value) in enumerate(fields):
+        if index > 0:
+            document_file.write(separator)
+        document_file.write(json.dumps(name) + ": ")
+
+        if name != "content":
+            _write_value(value, document_file, formatted, level + 1)
+            continue
+
+        if not value:
+            document_file.write("[]")
+            continue
+
+        item_indent = indent + " " * 4 if formatted is True else ""
+        document_file.write("[" + item_indent)
+        for _index, item in enumerate(value):
+            if _index > 0:
+                document_file.write("," + item_indent if formatted is True else ", ")
+            _write_value(item, document_file, formatted, level + 2)
+        document_file.write(indent + "]")
+    document_file.write(closing + "}")
+
+
+def write_document(document, document_file, formatted=False):
+    """
+    Writes a document to a file as JSON, the same as
+    :func:`stringify_document`. Collections are written one item at a
+    time, so the whole collection is never held in memory as a string.
+
+    :param document: Document to write
+    :type document: pydantic.BaseModel
+    :param document_file: File, or anything with a write method
+    :type document_file: TextIO
+    :param formatted: Whether to indent and sort keys, for humans to read
+    :type formatted: bool
+    """
 
-    return json.dumps(document.dict(), ensure_ascii=False, **params)
+    _write_value(document, document_file, formatted, 0)
 
 
-def write_document_to_path(document, path, formatted=True):
+def write_document_to_path(document, path, formatted=False):
     with open(path, "w") as document_file:
-        document_file.write(stringify_document(document, formatted=formatted))
+        write_document(document, document_file, formatted=formatted)
 
 
 def sanitize_string(string):
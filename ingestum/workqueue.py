@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (c) 2023 Sorcero, Inc.
+#
+# This file is part of Sorcero's Language Intelligence platform
+# (see https://www.sorcero.com).
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import os
+import json
+import time
+import socket
+import sqlite3
+import logging
+import threading
+
+from . import engine
+from . import manifests
+from .journal import location_from_dict, location_to_dict
+
+__logger__ = logging.getLogger("ingestum")
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    position INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    state TEXT NOT NULL,
+    worker TEXT,
+    expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    artifact TEXT,
+    document TEXT,
+    error TEXT
+)
+"""
+
+
+def default_worker():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class WorkQueue:
+    """
+    Queue of manifest sources kept in a SQLite file, so workers on several
+    nodes sharing the file can process a manifest together.
+
+    A worker leases a source for a while and keeps renewing the lease while
+    processing it. Sources leased by workers that stopped renewing, e.g.,
+    because they crashed, are leased again by other workers, up to
+    ``max_attempts`` times before being marked as failed.
+
+    :param path: Path to the SQLite file
+    :type path: str
+    :param max_attempts: Number of leases a source gets before giving up
+    :type max_attempts: int
+    """
+
+    def __init__(self, path, max_attempts=3):
+        self.path = path
+        self.max_attempts = max_attempts
+
+        with self._connect() as connection:
+            connection.execute(SCHEMA)
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        return _Transaction(connection)
+
+    def enqueue(self, manifest):
+        """
+        :param manifest: Manifest whose sources are added to the queue
+        :type manifest: manifests.base.Manifest
+        """
+
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT INTO sources (id, source, state) VALUES (?, ?, ?)",
+                [(s.id, s.json(), PENDING) for s in manifest.sources],
+            )
+
+    def lease(self, worker, duration):
+        """
+        Leases the next source available.
+
+        :param worker: Worker name
+        :type worker: str
+        :param duration: Seconds before the lease expires, unless renewed
+        :type duration: float
+
+        :return: The queue position and the manifest source, or None if no
+            source is available
+        :rtype: Optional[Tuple[int, manifests.sources.base.BaseSource]]
+        """
+
+        now = time.time()
+
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE sources SET state = ?, error = ? "
+                "WHERE state = ? AND expires < ? AND attempts >= ?",
+                (FAILED, "lease expired", LEASED, now, self.max_attempts),
+            )
+            row = connection.execute(
+                "SELECT position, source FROM sources "
+                "WHERE state = ? OR (state = ? AND expires < ?) "
+                "ORDER BY position LIMIT 1",
+                (PENDING, LEASED, now),
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            connection.execute(
+                "UPDATE sources SET state = ?, worker = ?, expires = ?, "
+                "attempts = attempts + 1 WHERE position = ?",
+                (LEASED, worker, now + duration, row["position"]),
+            )
+
+        source_dict = json.loads(row["source"])
+        source = manifests.sources.registry.get(source_dict["type"])(**source_dict)
+
+        return row["position"], source
+
+    def heartbeat(self, position, worker, duration):
+        """
+        Renews a lease.
+
+        :return: False if the lease was lost, e.g., it expired and another
+            worker took over the source
+        :rtype: bool
+        """
+
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "UPDATE sources SET expires = ? "
+                "WHERE position = ? AND worker = ? AND state = ?",
+                (time.time() + duration, position, worker, LEASED),
+            )
+
+        return cursor.rowcount == 1
+
+    def complete(self, position, worker, artifact_location, document_location):
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE sources SET state = ?, artifact = ?, document = ?, "
+                "error = NULL WHERE position = ? AND worker = ? AND state = ?",
+                (
+                    DONE,
+                    json.dumps(location_to_dict(artifact_location)),
+                    json.dumps(location_to_dict(document_location)),
+                    position,
+                    worker,
+                    LEASED,
+                ),
+            )
+
+    def fail(self, position, worker, error):
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE sources SET state = ?, error = ? "
+                "WHERE position = ? AND worker = ? AND state = ?",
+                (FAILED, error, position, worker, LEASED),
+            )
+
+    def counts(self):
+        """
+        :return: Number of sources in every state
+        :rtype: Dict[str, int]
+        """
+
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT state, COUNT(*) AS count FROM sources GROUP BY state"
+            ).fetchall()
+
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        counts.update({row["state"]: row["count"] for row in rows})
+
+        return counts
+
+    def results(self):
+        """
+        :return: A tuple of (source id, state, artifact location, document
+            location, error) for every source, in queue order
+        :rtype: List[Tuple]
+        """
+
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT id, state, artifact, document, error FROM sources "
+                "ORDER BY position"
+            ).fetchall()
+
+        return [
+            (
+                row["id"],
+                row["state"],
+                location_from_dict(json.loads(row["artifact"] or "null")),
+                location_from_dict(json.loads(row["document"] or "null")),
+                row["error"],
+            )
+            for row in rows
+        ]
+
+
+class _Transaction:
+    """
+    Runs statements in a single immediate transaction, so concurrent workers
+    never lease the same source, and closes the connection afterwards.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, type, value, traceback):
+        try:
+            self.connection.execute("COMMIT" if type is None else "ROLLBACK")
+        finally:
+            self.connection.close()
+
+
+class _Heartbeat(threading.Thread):
+    def __init__(self, queue, position, worker, duration):
+        super().__init__(daemon=True)
+        self.queue = queue
+        self.position = position
+        self.worker = worker
+        self.duration = duration
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.duration / 3):
+            if not self.queue.heartbeat(self.position, self.worker, self.duration):
+                __logger__.warning(
+                    "lease lost", extra={"props": {"worker": self.worker}}
+                )
+                return
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def work(
+    queue,
+    pipelines,
+    pipelines_dir,
+    artifacts_dir=None,
+    workspace_dir=None,
+    worker=None,
+    lease=60.0,
+    poll=1.0,
+    **options,
+):
+    """
+    Processes sources from a work queue with :func:`engine.run_source` until
+    none is left, and records their results in the queue.
+
+    While some sources are leased by other workers, waits ``poll`` seconds
+    and tries again, in case those workers crash and their leases expire.
+
+    :param queue: Work queue
+    :type queue: WorkQueue
+    :param worker: Worker name, host name and process ID by default
+    :type worker: Optional[str]
+    :param lease: Seconds a lease lasts without a heartbeat
+    :type lease: float
+    :param poll: Seconds to wait between attempts when all remaining sources
+        are leased
+    :type poll: float
+
+    See :func:`engine.run` for the other parameters.
+
+    :return: Number of sources processed by this worker
+    :rtype: int
+    """
+
+    worker = worker if worker is not None else default_worker()
+    processed = 0
+
+    with engine.run_directories(artifacts_dir, workspace_dir) as directories:
+        artifacts_dir, workspace_dir, cache_dir = directories
+
+        while True:
+            leased = queue.lease(worker, lease)
+
+            if leased is None:
+                if queue.counts()[LEASED] == 0:
+                    break
+                time.sleep(poll)
+                continue
+
+            position, source = leased
+            __logger__.info(
+                "processing", extra={"props": {"source": source.id, "worker": worker}}
+            )
+
+            heartbeat = _Heartbeat(queue, position, worker, lease)
+            heartbeat.start()
+            try:
+                _, artifact_location, document_location = engine.run_source(
+                    source,
+                    pipelines,
+                    pipelines_dir,
+                    cache_dir,
+                    artifacts_dir,
+                    workspace_dir,
+                    **options,
+                )
+            except Exception as e:
+                __logger__.error(
+                    "failed", extra={"props": {"source": source.id, "error": str(e)}}
+                )
+                queue.fail(position, worker, str(e))
+            else:
+                queue.complete(position, worker, artifact_location, document_location)
+            finally:
+                heartbeat.stop()
+
+            processed += 1
+
+    return processed
@@ -26,6 +26,8 @@ source env/bin/activate > /dev/null
 pip install . > /dev/null
 ingestum-install-plugins > /dev/null
 
-pyflakes scripts ingestum tests tools && \
-black --check scripts ingestum tests tools && \
-python3 -m pytest
+pyflakes benchmarks scripts ingestum tests tools && \
+black --check benchmarks scripts ingestum tests tools && \
+python3 -m pytest && \
+INGESTUM_VALIDATE_DOCUMENTS=1 python3 -m pytest && \
+INGESTUM_COPY_ON_WRITE=1 python3 -m pytest
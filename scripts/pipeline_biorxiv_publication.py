@@ -150,7 +150,7 @@ def main():
             args.cursor,
         )
 
-    print(stringify_document(output))
+    print(stringify_document(output, formatted=True))
 
 
 if __name__ == "__main__":
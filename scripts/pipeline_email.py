@@ -109,7 +109,7 @@ def main():
     else:
         output = ingest(args.hours, args.sender, args.subject, args.body)
 
-    print(stringify_document(output))
+    print(stringify_document(output, formatted=True))
 
 
 if __name__ == "__main__":
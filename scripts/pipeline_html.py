@@ -120,7 +120,7 @@ def main():
     else:
         output = ingest(args.path, args.target, args.url)
 
-    print(stringify_document(output))
+    print(stringify_document(output, formatted=True))
 
 
 if __name__ == "__main__":
@@ -93,7 +93,7 @@ def main():
     else:
         output = ingest(args.path)
 
-    print(stringify_document(output))
+    print(stringify_document(output, formatted=True))
 
 
 if __name__ == "__main__":
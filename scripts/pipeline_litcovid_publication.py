@@ -122,7 +122,7 @@ def main():
             args.to_date,
         )
 
-    print(stringify_document(output))
+    print(stringify_document(output, formatted=True))
 
 
 if __name__ == "__main__":
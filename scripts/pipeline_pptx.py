@@ -145,7 +145,7 @@ def main():
 
         output = ingest(args.path, args.first_page, args.last_page, crop)
 
-    print(stringify_document(output))
+    print(stringify_document(output, formatted=True))
 
 
 if __name__ == "__main__":
@@ -97,7 +97,7 @@ def main():
     else:
         output = ingest(args.query, args.databases, args.articles)
 
-    print(stringify_document(output))
+    print(stringify_document(output, formatted=True))
 
 
 if __name__ == "__main__":
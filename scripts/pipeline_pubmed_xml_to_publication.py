@@ -98,7 +98,7 @@ def main():
             args.path,
         )
 
-    print(stringify_document(output))
+    print(stringify_document(output, formatted=True))
 
 
 if __name__ == "__main__":
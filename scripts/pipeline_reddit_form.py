@@ -106,7 +106,7 @@ def main():
         else:
             output = ingest(args.search)
 
-    print(stringify_document(output))
+    print(stringify_document(output, formatted=True))
 
 
 if __name__ == "__main__":
@@ -103,7 +103,7 @@ def main():
     else:
         output = ingest(args.search, args.count, args.sort, args.tags)
 
-    print(stringify_document(output))
+    print(stringify_document(output, formatted=True))
 
 
 if __name__ == "__main__":
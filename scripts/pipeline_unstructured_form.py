@@ -231,7 +231,7 @@ def main():
     else:
         output = ingest(args.path, args.first_page, args.last_page)
 
-    print(stringify_document(output))
+    print(stringify_document(output, formatted=True))
 
 
 if __name__ == "__main__":
@@ -18,6 +18,8 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
 
+import re
+
 from os import path
 from setuptools import setup, find_packages
 
@@ -25,11 +27,13 @@ from setuptools import setup, find_packages
 __path__ = path.abspath(path.dirname(__file__))
 with open(path.join(__path__, "requirements.txt")) as f:
     required = f.read().splitlines()
+with open(path.join(__path__, "ingestum", "__init__.py")) as f:
+    version = re.search(r'__version__ = "(.+)"', f.read()).group(1)
 
 
 setup(
     name="ingestum",
-    version="2.15.0",
+    version=version,
     description="Building blocks for document ingestion",
     url="https://gitlab.com/sorcero/community/ingestum",
     author="Sorcero, Inc.",
@@ -47,6 +51,7 @@ setup(
         "tools/ingestum-envelope",
         "tools/ingestum-generate-envelope",
         "tools/ingestum-install-plugins",
+        "tools/ingestum-worker",
     ],
     zip_safe=False,
     python_requires=">=3.7",
@@ -21,6 +21,8 @@
 #
 
 
+import pytest
+
 from ingestum import documents
 from ingestum import transformers
 from ingestum import conditionals
@@ -108,3 +110,45 @@ def test_collection_document_transform_on_conditional():
     assert document.dict() == utils.get_expected(
         "collection_document_transform_on_conditional"
     )
+
+
+def test_collection_document_new_from(monkeypatch):
+    utils.assert_trusted(
+        monkeypatch, documents.Collection, collection_collection_document
+    )
+    utils.assert_trusted(
+        monkeypatch,
+        documents.Collection,
+        collection_document1,
+        content=collection_document1.content + collection_passage_document.content,
+        context={"merged": True},
+    )
+
+
+@pytest.mark.parametrize("copy_on_write", [False, True])
+def test_collection_document_items_copy_on_write(monkeypatch, copy_on_write):
+    monkeypatch.setattr(documents.base, "COPY_ON_WRITE", copy_on_write)
+    never = conditionals.AllAttributeMatchesRegexp(attribute="content", expression="^$")
+    collection = collection_passage_document
+    outputs = [
+        transformers.CollectionDocumentRemoveOnConditional(conditional=never).transform(
+            collection=collection
+        ),
+        transformers.CollectionDocumentTransformOnConditional(
+            conditional=never,
+            transformer=transformers.TextDocumentStringReplace(
+                regexp="Lorem", replacement="Test Replacement"
+            ),
+        ).transform(collection=collection),
+        transformers.CollectionDocumentMerge().transform(
+            collection_1=collection, collection_2=collection_document2
+        ),
+        transformers.CollectionDocumentAdd().transform(
+            collection=collection, document=tabular_document
+        ),
+    ]
+
+    # items are only shared with the input when turned on
+    for output in outputs:
+        assert (output.content[0] is collection.content[0]) is copy_on_write
+        assert output.content[0].dict() == collection.content[0].dict()
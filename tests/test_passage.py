@@ -81,3 +81,25 @@ def test_passage_document_transform_on_conditional():
     assert document.dict() == utils.get_expected(
         "passage_document_transform_on_conditional"
     )
+
+
+def test_passage_document_trusted():
+    values = {
+        "title": "Passage",
+        "content": "Lorem ipsum",
+        "metadata": passage_document.metadata.dict(),
+        "context": {"passage": True},
+    }
+
+    document = documents.Passage.trusted(**values)
+
+    assert isinstance(document.metadata, documents.passage.Metadata)
+    assert document.dict() == documents.Passage(**values).dict()
+    assert document.__fields_set__ == documents.Passage(**values).__fields_set__
+
+
+def test_passage_document_new_from(monkeypatch):
+    utils.assert_trusted(monkeypatch, documents.Passage, passage_document)
+    utils.assert_trusted(
+        monkeypatch, documents.Passage, passage_document, content="Lorem"
+    )
@@ -21,17 +21,34 @@
 #
 
 import os
+import json
+import asyncio
+import concurrent.futures
+import gc
+import multiprocessing
+import shutil
+import stat
 import tempfile
+import threading
+import time
+import psutil
 import pytest
 
+import ingestum
+
 from ingestum import engine
+from ingestum import errors
 from ingestum import manifests
 from ingestum import pipelines
 from ingestum import documents
+from ingestum import instrumentation
+from ingestum import transformers
+from ingestum import workqueue
 
 from tests import utils
 
 skip_dictionary = os.environ.get("NLTK_DATA") is None
+skip_fork = "fork" not in multiprocessing.get_all_start_methods()
 
 destinations = None
 
@@ -58,6 +75,46 @@ def run_pipeline(pipeline, source):
     return results[0]
 
 
+def csv_sources(paths, pipeline="pipeline_csv", destination=None):
+    if destination is None:
+        destination = manifests.sources.destinations.Void()
+
+    return [
+        manifests.sources.CSV(
+            id=f"{index}",
+            pipeline=pipeline,
+            location=manifests.sources.locations.Local(path=path),
+            destination=destination,
+        )
+        for index, path in enumerate(paths)
+    ]
+
+
+def patch_transform(monkeypatch, step, before):
+    transform = type(step).transform
+
+    def patched(self, *args, **kargs):
+        before(*args, **kargs)
+        return transform(self, *args, **kargs)
+
+    # inherited by the processes forked afterwards
+    monkeypatch.setattr(type(step), "transform", patched)
+
+
+def chrome_trace(records):
+    with tempfile.NamedTemporaryFile(suffix=".json") as trace:
+        instrumentation.write_chrome_trace(records, trace.name)
+        return json.load(trace)["traceEvents"]
+
+
+def assert_nested(parent, child):
+    # timestamps and durations come from different clocks
+    tolerance = 1e3
+
+    assert parent["ts"] - tolerance <= child["ts"]
+    assert child["ts"] + child["dur"] <= parent["ts"] + parent["dur"] + tolerance
+
+
 def test_pipeline_audio():
     pipeline = pipelines.Base.parse_file("tests/pipelines/pipeline_audio.json")
     source = manifests.sources.Audio(
@@ -92,6 +149,797 @@ def test_pipeline_csv():
     assert document.dict() == utils.get_expected("pipeline_csv")
 
 
+@pytest.mark.skipif(skip_fork, reason="workers must inherit the patched step")
+def test_pipeline_csv_parallel(monkeypatch, tmp_path):
+    pipeline = pipelines.Base.parse_file("tests/pipelines/pipeline_csv.json")
+    pids = tmp_path / "pids"
+
+    def record_pid(source):
+        with open(pids, "a") as pids_file:
+            pids_file.write(f"{os.getpid()}\n")
+
+    patch_transform(monkeypatch, pipeline.pipes[0].steps[0], record_pid)
+
+    paths = ["tests/data/test.csv", "tests/data/missing.csv", "tests/data/test.csv"]
+    destination = manifests.sources.destinations.Local(directory=str(tmp_path))
+    kwargs = {
+        "manifest": manifests.Base(sources=csv_sources(paths, destination=destination)),
+        "pipelines": [pipeline],
+        "pipelines_dir": None,
+        "jobs": 2,
+        "start_method": "fork",
+    }
+
+    results, *_ = engine.run(**kwargs)
+
+    expected = utils.get_expected("pipeline_csv")
+    assert results[0].dict() == expected
+    assert results[1] is None
+    assert results[2].dict() == expected
+
+    # sources run in worker processes
+    with open(pids) as pids_file:
+        recorded = {int(pid) for pid in pids_file}
+    assert recorded and os.getpid() not in recorded
+
+    _, locations = engine.run_refs_only(**kwargs)
+    assert [location is not None for location in locations] == [True, False, True]
+
+
+def test_pipeline_csv_async():
+    pipeline = pipelines.Base.parse_file("tests/pipelines/pipeline_csv.json")
+    paths = ["tests/data/test.csv", "tests/data/missing.csv", "tests/data/test.csv"]
+    sources = csv_sources(paths)
+
+    results, *_ = asyncio.run(
+        engine.arun(
+            manifest=manifests.Base(sources=sources),
+            pipelines=[pipeline],
+            pipelines_dir=None,
+            limit=2,
+        )
+    )
+
+    expected = utils.get_expected("pipeline_csv")
+    assert results[0].dict() == expected
+    assert results[1] is None
+    assert results[2].dict() == expected
+
+    with pytest.raises(Exception):
+        engine.run(
+            manifest=manifests.Base(sources=sources),
+            pipelines=[pipeline],
+            pipelines_dir=None,
+        )
+
+
+def test_pipeline_csv_running_loop():
+    pipeline = pipelines.Base.parse_file("tests/pipelines/pipeline_csv.json")
+    kwargs = {
+        "manifest": manifests.Base(sources=csv_sources(["tests/data/test.csv"] * 2)),
+        "pipelines": [pipeline],
+        "pipelines_dir": None,
+    }
+
+    # e.g., from Jupyter or an async web handler
+    async def handler():
+        results, *_ = engine.run(**kwargs)
+        outcomes = list(engine.iter_run(**kwargs))
+        return results, outcomes
+
+    results, outcomes = asyncio.run(handler())
+
+    expected = utils.get_expected("pipeline_csv")
+    assert [r.dict() for r in results] == [expected] * 2
+    assert [(i, d.dict(), e) for i, d, e in outcomes] == [
+        ("0", expected, None),
+        ("1", expected, None),
+    ]
+
+
+def test_pipeline_csv_async_offload(monkeypatch):
+    pipeline = pipelines.Base.parse_file("tests/pipelines/pipeline_csv.json")
+    threads = []
+
+    def record_thread(source):
+        threads.append(threading.current_thread())
+
+    patch_transform(monkeypatch, pipeline.pipes[0].steps[0], record_thread)
+
+    asyncio.run(
+        engine.arun(
+            manifest=manifests.Base(sources=csv_sources(["tests/data/test.csv"] * 2)),
+            pipelines=[pipeline],
+            pipelines_dir=None,
+            limit=2,
+        )
+    )
+
+    # never in the loop, where it would stall the other source
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
+
+
+def test_pipeline_csv_workqueue(tmp_path):
+    pipeline = pipelines.Base.parse_file("tests/pipelines/pipeline_csv.json")
+    paths = ["tests/data/test.csv", "tests/data/missing.csv", "tests/data/test.csv"]
+    destination = manifests.sources.destinations.Local(
+        directory=str(tmp_path / "documents")
+    )
+    sources = csv_sources(paths, destination=destination)
+
+    queue = workqueue.WorkQueue(str(tmp_path / "queue.sqlite"))
+    queue.enqueue(manifests.Base(sources=sources))
+
+    # a worker that crashed right after leasing the first source
+    position, source = queue.lease("crashed", 0)
+    assert source == sources[0]
+
+    # workers only share the queue file, so threads stand for nodes
+    processed = []
+    workers = [
+        threading.Thread(
+            target=lambda index: processed.append(
+                workqueue.work(
+                    queue,
+                    [pipeline],
+                    None,
+                    workspace_dir=str(tmp_path / f"workspace{index}"),
+                    worker=f"worker{index}",
+                    lease=5,
+                    poll=0.01,
+                )
+            ),
+            args=(index,),
+        )
+        for index in range(2)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    # including the source leased by the crashed worker, once its lease expired
+    assert sum(processed) == 3
+    assert queue.counts() == {"pending": 0, "leased": 0, "done": 2, "failed": 1}
+
+    expected = utils.get_expected("pipeline_csv")
+    results = queue.results()
+    for index in [0, 2]:
+        _, state, _, document_location, _ = results[index]
+        assert state == "done"
+        with open(document_location.path) as document:
+            assert json.load(document) == expected
+    assert results[1][1] == "failed"
+
+
+@pytest.mark.skipif(skip_fork, reason="workers must inherit the patched step")
+def test_pipeline_csv_pools(monkeypatch, tmp_path):
+    pipeline = pipelines.Base.parse_file("tests/pipelines/pipeline_csv.json")
+    io_pipeline = pipeline.copy(update={"name": "io", "resource_class": "io"})
+    pids = tmp_path / "pids"
+
+    def record_pid(source):
+        with open(pids, "a") as pids_file:
+            pids_file.write(f"{os.getpid()}\n")
+
+    patch_transform(monkeypatch, pipeline.pipes[0].steps[0], record_pid)
+
+    sources = [
+        source.copy(update={"pipeline": name})
+        for source, name in zip(
+            csv_sources(["tests/data/test.csv"] * 3),
+            [pipeline.name, io_pipeline.name, "missing"],
+        )
+    ]
+
+    assert pipeline.get_resource_class() == "cpu"
+    assert io_pipeline.get_resource_class() == "io"
+    path = "tests/pipelines/pipeline_pubmed_xml.json"
+    assert pipelines.Base.parse_file(path).get_resource_class() == "io"
+
+    results, *_ = engine.run(
+        manifest=manifests.Base(sources=sources),
+        pipelines=[pipeline, io_pipeline],
+        pipelines_dir=None,
+        pools={"cpu": 1, "io": 2},
+        start_method="fork",
+    )
+
+    expected = utils.get_expected("pipeline_csv")
+    assert results[0].dict() == expected
+    assert results[1].dict() == expected
+    assert results[2] is None
+
+    # IO-bound sources run in threads, the others in worker processes
+    with open(pids) as pids_file:
+        recorded = [int(pid) for pid in pids_file]
+    assert len(recorded) == 2
+    assert os.getpid() in recorded
+    assert len(set(recorded)) == 2
+
+
+def test_pipeline_csv_budget(caplog):
+    pipeline = pipelines.Base.parse_file("tests/pipelines/pipeline_csv.json")
+
+    # every worker is over budget, so sources can only run one at a time
+    results, *_ = engine.run(
+        manifest=manifests.Base(sources=csv_sources(["tests/data/test.csv"] * 3)),
+        pipelines=[pipeline],
+        pipelines_dir=None,
+        jobs=2,
+        max_memory=1,
+        max_source_memory=1,
+    )
+
+    expected = utils.get_expected("pipeline_csv")
+    assert [r.dict() for r in results] == [expected] * 3
+
+    recycled = [r for r in caplog.records if r.getMessage() == "recycled"]
+    assert len(recycled) == 3
+
+
+@pytest.mark.skipif(skip_fork, reason="sources must inherit the patched step")
+def test_pipeline_csv_timeout(monkeypatch):
+    pipeline = pipelines.Base.parse_file("tests/pipelines/pipeline_csv.json")
+    step = pipeline.pipes[0].steps[0]
+    hang = threading.Event()
+
+    def hang_on(source):
+        if "hang" in source.path:
+            # never set, the process running the source is killed instead
+            hang.wait()
+
+    patch_transform(monkeypatch, step, hang_on)
+
+    data = tempfile.TemporaryDirectory()
+    path = os.path.join(data.name, "hang.csv")
+    shutil.copy("tests/data/test.csv", path)
+
+    sources = [
+        source.copy(update={"timeout": timeout})
+        for source, timeout in zip(
+            csv_sources(["tests/data/test.csv", path, path]), [None, None, 0.1]
+        )
+    ]
+    kwargs = {
+        "pipelines": [pipeline],
+        "pipelines_dir": None,
+        "step_timeouts": {step.type: 0.2},
+        "start_method": "fork",
+    }
+
+    results, *_ = engine.run(manifest=manifests.Base(sources=sources), **kwargs)
+
+    assert results[0].dict() == utils.get_expected("pipeline_csv")
+    assert results[1] is None
+    assert results[2] is None
+
+    outcomes = engine.iter_run(manifest=manifests.Base(sources=sources[1:]), **kwargs)
+
+    for (_, _, error), seconds in zip(outcomes, [0.2, 0.1]):
+        assert isinstance(error, errors.SourceTimeoutError)
+        assert error.seconds == seconds
+        assert error.pipe == pipeline.pipes[0].name
+        assert error.transformer == step.type
+
+    data.cleanup()
+
+
+@pytest.mark.skipif(skip_fork, reason="sources must inherit the patched step")
+@pytest.mark.parametrize("kwargs", [{"jobs": 2}, {"pools": {"cpu": 1}}])
+def test_pipeline_csv_killable_in_pool(monkeypatch, tmp_path, kwargs):
+    pipeline = pipelines.Base.parse_file("tests/pipelines/pipeline_csv.json")
+    step = pipeline.pipes[0].steps[0]
+    pids = tmp_path / "pids"
+
+    def record_pids(source):
+        with open(pids, "a") as pids_file:
+            parent = psutil.Process(os.getppid())
+            pids_file.write(f"{os.getpid()} {parent.pid} {parent.ppid()}\n")
+
+    patch_transform(monkeypatch, step, record_pids)
+
+    results, *_ = engine.run(
+        manifest=manifests.Base(sources=csv_sources(["tests/data/test.csv"] * 2)),
+        pipelines=[pipeline],
+        pipelines_dir=None,
+        step_timeouts={step.type: 10},
+        start_method="fork",
+        **kwargs,
+    )
+
+    expected = utils.get_expected("pipeline_csv")
+    assert [r.dict() for r in results] == [expected] * 2
+
+    # killable processes are started by the pool workers themselves
+    with open(pids) as pids_file:
+        recorded = [tuple(map(int, line.split())) for line in pids_file]
+    assert len(recorded) == 2
+    for pid, parent, grandparent in recorded:
+        assert os.getpid() not in (pid, parent)
+        assert grandparent == os.getpid()
+
+
+def test_pipeline_csv_prefetch(monkeypatch, caplog):
+    # pretend local files are downloaded
+    monkeypatch.setattr(manifests.sources.locations.Local, "prefetch", True)
+
+    pipeline = pipelines.Base.parse_file("tests/pipelines/pipeline_csv.json")
+
+    results, *_ = engine.run(
+        manifest=manifests.Base(sources=csv_sources(["tests/data/test.csv"] * 3)),
+        pipelines=[pipeline],
+        pipelines_dir=None,
+        prefetch=2,
+    )
+
+    expected = utils.get_expected("pipeline_csv")
+    assert [r.dict() for r in results] == [expected] * 3
+
+    # the first source is fetched as usual
+    prefetched = [r for r in caplog.records if r.getMessage() == "prefetched"]
+    assert sorted(r.props["source"] for r in prefetched) == ["1", "2"]
+
+
+def test_prefetcher_max_size(monkeypatch):
+    released = threading.Event()
+
+    def fetch(self, output_dir, cache_dir=None):
+        released.wait(timeout=10)
+        return shutil.copy(self.path, output_dir)
+
+    # pretend local files are downloaded
+    monkeypatch.setattr(manifests.sources.locations.Local, "prefetch", True)
+    monkeypatch.setattr(manifests.sources.locations.Local, "fetch", fetch)
+
+    workspace = tempfile.TemporaryDirectory()
+    sources = csv_sources(["tests/data/test.csv"] * 4)
+
+    with engine._Prefetcher(sources, workspace.name, None, 3, 1) as prefetcher:
+        prefetcher.get(sources[0])
+        # the size of the first fetch is unknown until it completes
+        assert list(prefetcher.futures) == [1]
+
+        released.set()
+        prefetcher.futures[1].result()
+        # over the budget once it completes
+        assert list(prefetcher.futures) == [1]
+
+    # the next fetches start as the previous ones complete
+    with engine._Prefetcher(sources, workspace.name, None, 3, 1024) as prefetcher:
+        prefetcher.get(sources[0])
+        deadline = time.monotonic() + 10
+        while len(prefetcher.futures) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert sorted(prefetcher.futures) == [1, 2, 3]
+
+    workspace.cleanup()
+
+
+def test_pipeline_csv_shared_location(monkeypatch):
+    fetched = []
+
+    def fetch(self, output_dir, cache_dir=None):
+        fetched.append(output_dir)
+        return shutil.copy(self.path, output_dir)
+
+    # pretend local files are downloaded
+    monkeypatch.setattr(manifests.sources.locations.Local, "prefetch", True)
+    monkeypatch.setattr(manifests.sources.locations.Local, "fetch", fetch)
+
+    pipeline = pipelines.Base.parse_file("tests/pipelines/pipeline_csv.json")
+    workspace = tempfile.TemporaryDirectory()
+    sources = csv_sources(["tests/data/test.csv"] * 3)
+
+    results, *_ = engine.run(
+        manifest=manifests.Base(sources=sources),
+        pipelines=[pipeline],
+        pipelines_dir=None,
+        workspace_dir=workspace.name,
+    )
+
+    expected = utils.get_expected("pipeline_csv")
+    assert [r.dict() for r in results] == [expected] * 3
+    assert len(fetched) == 1
+
+    # links to the shared file are removed with it
+    paths = [os.path.join(workspace.name, s.id, "test.csv") for s in sources]
+    assert not any(os.path.exists(path) for path in paths)
+
+    # a later run fetches a copy of its own, instead of writing through
+    # the read-only file other sources link to
+    results, *_ = engine.run(
+        manifest=manifests.Base(sources=sources[:1]),
+        pipelines=[pipeline],
+        pipelines_dir=None,
+        workspace_dir=workspace.name,
+    )
+
+    assert results[0].dict() == expected
+    assert len(fetched) == 2
+    assert os.stat(paths[0]).st_mode & stat.S_IWUSR
+
+    workspace.cleanup()
+
+
+@pytest.mark.skipif(skip_fork, reason="only forked workers share warm objects")
+def test_pipeline_csv_warm(caplog):
+    pipeline = pipelines.Base.parse_file("tests/pipelines/pipeline_csv.json")
+    workspace = tempfile.TemporaryDirectory()
+    sources = csv_sources(["tests/data/test.csv"] * 3)
+
+    results, *_ = engine.run(
+        manifest=manifests.Base(sources=sources),
+        pipelines=[pipeline],
+        pipelines_dir=None,
+        workspace_dir=workspace.name,
+        jobs=2,
+        warm=True,
+        start_method="fork",
+    )
+
+    expected = utils.get_expected("pipeline_csv")
+    assert [r.dict() for r in results] == [expected] * 3
+    warmed = [r for r in caplog.records if r.getMessage() == "warmed"]
+    assert warmed[0].props == {
+        "pipelines": 1,
+        "transformers": len({type(s) for p in pipeline.pipes for s in p.steps}),
+    }
+    # only frozen while forking workers
+    assert gc.get_freeze_count() == 0
+    context = multiprocessing.get_context("fork")
+    with engine._frozen():
+        with concurrent.futures.ProcessPoolExecutor(1, mp_context=context) as pool:
+            assert pool.submit(gc.get_freeze_count).result() > 0
+    assert gc.get_freeze_count() == 0
+
+    # nothing to share without a process pool
+    caplog.clear()
+    engine.run(
+        manifest=manifests.Base(sources=sources),
+        pipelines=[pipeline],
+        pipelines_dir=None,
+        workspace_dir=workspace.name,
+        warm=True,
+    )
+    assert "warmed" not in [r.getMessage() for r in caplog.records]
+
+    workspace.cleanup()
+
+
+def test_pipeline_csv_iter_run(monkeypatch):
+    pipeline = pipelines.Base.parse_file("tests/pipelines/pipeline_csv.json")
+    transformed = []
+    patch_transform(monkeypatch, pipeline.pipes[0].steps[0], transformed.append)
+
+    paths = ["tests/data/test.csv", "tests/data/missing.csv"]
+    results = engine.iter_run(
+        manifest=manifests.Base(sources=csv_sources(paths)),
+        pipelines=[pipeline],
+        pipelines_dir=None,
+    )
+
+    id, document, error = next(results)
+    assert id == "0"
+    assert document.dict() == utils.get_expected("pipeline_csv")
+    assert error is None
+
+    id, document, error = next(results)
+    assert id == "1"
+    assert document is None
+    assert error is not None
+
+    assert next(results, None) is None
+
+    # results are yielded as sources complete, so the remaining sources
+    # never run once the consumer stops
+    transformed.clear()
+    results = engine.iter_run(
+        manifest=manifests.Base(sources=csv_sources(["tests/data/test.csv"] * 4)),
+        pipelines=[pipeline],
+        pipelines_dir=None,
+    )
+    next(results)
+    results.close()
+    assert len(transformed) <= 2
+
+
+def test_pipeline_csv_resume():
+    pipeline = pipelines.Base.parse_file("tests/pipelines/pipeline_csv.json")
+    workspace = tempfile.TemporaryDirectory()
+    data = tempfile.TemporaryDirectory()
+
+    path = os.path.join(data.name, "test.csv")
+    shutil.copy("tests/data/test.csv", path)
+
+    source = manifests.sources.CSV(
+        id="resumable",
+        pipeline=pipeline.name,
+        location=manifests.sources.locations.Local(path=path),
+        destination=manifests.sources.destinations.Local(
+            directory=destinations.name,
+        ),
+    )
+    kwargs = {
+        "manifest": manifests.Base(sources=[source]),
+        "pipelines": [pipeline],
+        "pipelines_dir": None,
+        "workspace_dir": workspace.name,
+    }
+
+    engine.run_refs_only(**kwargs)
+    artifacts, documents = engine.run_refs_only(**kwargs)
+
+    # compacted once the run completes
+    with open(os.path.join(workspace.name, "journal.jsonl")) as journal_file:
+        assert len(journal_file.readlines()) == 1
+
+    # would fail if the source was processed again
+    os.remove(path)
+    resumed_artifacts, resumed_documents = engine.run_refs_only(resume=True, **kwargs)
+
+    assert resumed_artifacts == artifacts
+    assert resumed_documents == documents
+
+    workspace.cleanup()
+    data.cleanup()
+
+
+def test_pipeline_csv_cache(monkeypatch):
+    pipeline = pipelines.Base.parse_file("tests/pipelines/pipeline_csv.json")
+    source = manifests.sources.CSV(
+        id="",
+        pipeline=pipeline.name,
+        location=manifests.sources.locations.Local(path="tests/data/test.csv"),
+        destination=manifests.sources.destinations.Void(),
+    )
+    workspace = tempfile.TemporaryDirectory()
+    cache = pipelines.Cache(os.path.join(workspace.name, "pipes"), 1024 * 1024)
+
+    document = pipeline.run(workspace.name, source, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    cached = pipeline.run(workspace.name, source, cache=cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cached.dict() == document.dict()
+
+    # the store is only listed once its size is unknown to the process
+    evictions = []
+    evict = pipelines.Cache.evict
+    monkeypatch.setattr(
+        pipelines.Cache, "evict", lambda self: evictions.append(self) or evict(self)
+    )
+    paths = []
+    for index in range(3):
+        paths.append(os.path.join(workspace.name, f"test{index}.csv"))
+        with open(paths[-1], "w") as csv_file:
+            csv_file.write(f"Username,Identifier\nuser{index},{index}\n")
+    engine.run(
+        manifest=manifests.Base(sources=csv_sources(paths)),
+        pipelines=[pipeline],
+        pipelines_dir=None,
+        workspace_dir=os.path.join(workspace.name, "run"),
+        pipes_cache_size=1024 * 1024,
+    )
+    assert len(evictions) == 1
+    monkeypatch.undo()
+
+    # entries don't outlive upgrades
+    inputs = [documents.Text(content="")]
+    key = cache.key(pipeline.pipes[0], inputs)
+    monkeypatch.setattr(ingestum, "__version__", "0.0.0")
+    assert cache.key(pipeline.pipes[0], inputs) not in [key, None]
+
+    # too small to keep anything around
+    cache = pipelines.Cache(os.path.join(workspace.name, "small"), 1)
+    pipeline.run(workspace.name, source, cache=cache)
+    pipeline.run(workspace.name, source, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 2)
+
+    workspace.cleanup()
+
+
+def test_pipeline_csv_instrumentation():
+    pipeline = pipelines.Base.parse_file("tests/pipelines/pipeline_csv.json")
+    source = manifests.sources.CSV(
+        id="csv",
+        pipeline=pipeline.name,
+        location=manifests.sources.locations.Local(path="tests/data/test.csv"),
+        destination=manifests.sources.destinations.Void(),
+    )
+    sink = instrumentation.MemorySink()
+
+    engine.run(
+        manifest=manifests.Base(sources=[source]),
+        pipelines=[pipeline],
+        pipelines_dir=None,
+        sink=sink,
+    )
+
+    spans = {r["span"] for r in sink.records}
+    assert spans == {"manifest", "source", "fetch", "pipe", "transformer", "store"}
+
+    steps = [r for r in sink.records if r["span"] == "transformer"]
+    assert len(steps) == sum(len(p.steps) for p in pipeline.pipes)
+    for record in steps:
+        assert record["source"] == "csv"
+        assert record["wall_time"] >= 0
+        assert record["cpu_time"] >= 0
+        assert record["output_size"] > 0
+
+    rows = instrumentation.summarize(sink.records)
+    assert [r["calls"] for r in rows] == [1] * len(steps)
+
+    events = chrome_trace(sink.records)
+    assert len([e for e in events if e["ph"] == "X"]) == len(sink.records)
+
+    (manifest,) = [e for e in events if e.get("cat") == "manifest"]
+    (_source,) = [e for e in events if e.get("cat") == "source"]
+    assert_nested(manifest, _source)
+    for event in events:
+        if event.get("cat") in ("fetch", "pipe", "store"):
+            assert_nested(_source, event)
+        if event.get("cat") == "transformer":
+            (pipe,) = [
+                e
+                for e in events
+                if e.get("cat") == "pipe" and e["name"] == event["args"]["pipe"]
+            ]
+            assert_nested(pipe, event)
+
+
+@pytest.mark.parametrize("start_method", [None, "fork"])
+def test_pipeline_csv_instrumentation_tracks(tmp_path, start_method):
+    if start_method == "fork" and skip_fork:
+        pytest.skip("fork is not available")
+
+    sink = instrumentation.JSONLinesSink(str(tmp_path / "records.jsonl"))
+
+    engine.run(
+        manifest=manifests.Base(sources=csv_sources(["tests/data/test.csv"] * 4)),
+        pipelines=None,
+        pipelines_dir="tests/pipelines",
+        jobs=2,
+        sink=sink,
+        start_method=start_method,
+    )
+
+    events = chrome_trace(sink.read())
+    spans = [e for e in events if e["ph"] == "X"]
+    names = {e["pid"]: e["args"]["name"] for e in events if e["ph"] == "M"}
+
+    # the manifest is traced by the main process, sources by the workers
+    (manifest,) = [e for e in spans if e["cat"] == "manifest"]
+    assert manifest["pid"] == os.getpid()
+    workers = {e["pid"] for e in spans if e["cat"] == "source"}
+    assert 1 <= len(workers) <= 2
+    assert os.getpid() not in workers
+    assert set(names) == workers | {os.getpid()}
+    assert len(set(names.values())) == len(names)
+
+    # one track per worker, holding every span of the sources it processed
+    for pid in workers:
+        tids = {e["tid"] for e in spans if e["pid"] == pid}
+        assert len(tids) == 1
+
+    for _source in [e for e in spans if e["cat"] == "source"]:
+        assert_nested(manifest, _source)
+        for event in spans:
+            if event["cat"] != "source" and event["args"].get("source") == (
+                _source["args"]["source"]
+            ):
+                assert event["pid"] == _source["pid"]
+                assert_nested(_source, event)
+
+
+def test_pipeline_template():
+    path = "tests/pipelines/pipeline_pdf.json"
+    source = manifests.sources.PDF(
+        id="",
+        pipeline="pipeline_pdf",
+        first_page=1,
+        last_page=3,
+        location=manifests.sources.locations.Local(
+            path="tests/data/test.pdf",
+        ),
+        destination=manifests.sources.destinations.Void(),
+    )
+    workspace = tempfile.TemporaryDirectory()
+
+    template = engine.load_pipeline(path)
+    assert engine.load_pipeline(path) is template
+
+    pipeline = engine.find_pipeline(source, None, "tests/pipelines", workspace.name)
+    assert pipeline is not template
+    assert template.dict() == pipelines.Base.parse_file(path).dict()
+    assert workspace.name in pipeline.json()
+    assert workspace.name not in template.json()
+
+    workspace.cleanup()
+
+
+def test_pipeline_optimize():
+    collection = documents.Collection(
+        content=[
+            documents.Text(content="abc"),
+            documents.Text(content="bcd"),
+        ]
+    )
+    steps = [
+        transformers.CollectionDocumentTransform(
+            transformer=transformers.TextDocumentStringReplace(
+                regexp="a", replacement="b"
+            )
+        ),
+        transformers.CollectionDocumentTransform(
+            transformer=transformers.TextDocumentStringReplace(
+                regexp="b", replacement="c"
+            )
+        ),
+        transformers.CollectionDocumentTransform(
+            transformer=transformers.TextDocumentStringReplace(
+                regexp="^c+", replacement="x"
+            )
+        ),
+    ]
+
+    optimized = pipelines.optimizer.optimize_steps(steps)
+    assert len(optimized) == 1
+    assert len(optimized[0].arguments.transformers) == 1
+
+    document = pipelines.base.run_steps(optimized, [collection])
+    expected = pipelines.base.run_steps(steps, [collection])
+    assert document.dict() == expected.dict()
+    assert [d.content for d in document.content] == ["x", "xd"]
+
+    # fused steps are transformers like any other
+    assert isinstance(optimized[0], transformers.base.BaseTransformer)
+    assert transformers.registry.validate(optimized[0].dict()) == optimized[0]
+
+
+def test_pipeline_optimize_opt_in(caplog):
+    source = manifests.sources.PDF(
+        id="",
+        pipeline="pipeline_pdf",
+        first_page=1,
+        last_page=3,
+        location=manifests.sources.locations.Local(
+            path="tests/data/test.pdf",
+        ),
+        destination=manifests.sources.destinations.Void(),
+    )
+    workspace = tempfile.TemporaryDirectory()
+
+    template = engine.load_pipeline("tests/pipelines/pipeline_pdf.json")
+    pipeline = engine.find_pipeline(source, None, "tests/pipelines", workspace.name)
+    assert [len(p.steps) for p in pipeline.pipes] == [
+        len(p.steps) for p in template.pipes
+    ]
+
+    pipeline = engine.find_pipeline(
+        source, None, "tests/pipelines", workspace.name, optimize=True
+    )
+    assert len(pipeline.pipes[-1].steps) < len(template.pipes[-1].steps)
+
+    # fused steps would escape timeouts targeting the steps they stand for
+    pipeline = pipelines.Base.parse_file("tests/pipelines/pipeline_csv.json")
+    results, *_ = engine.run(
+        manifest=manifests.Base(sources=csv_sources(["tests/data/test.csv"])),
+        pipelines=[pipeline],
+        pipelines_dir=None,
+        workspace_dir=workspace.name,
+        step_timeouts={"text_document_string_replace": 10},
+        optimize=True,
+    )
+    assert results[0].dict() == utils.get_expected("pipeline_csv")
+    assert "not optimizing, step timeouts target fused steps" in [
+        r.getMessage() for r in caplog.records
+    ]
+
+    workspace.cleanup()
+
+
 def test_pipeline_html():
     pipeline = pipelines.Base.parse_file("tests/pipelines/pipeline_html.json")
     source = manifests.sources.HTML(
@@ -147,6 +995,30 @@ def test_pipeline_pdf():
     assert document.dict() == utils.get_expected("pipeline_pdf")
 
 
+def test_pipeline_pdf_concurrent():
+    pipeline = pipelines.Base.parse_file("tests/pipelines/pipeline_pdf.json")
+    source = manifests.sources.PDF(
+        id="",
+        pipeline=pipeline.name,
+        first_page=1,
+        last_page=3,
+        location=manifests.sources.locations.Local(
+            path="tests/data/test.pdf",
+        ),
+        destination=manifests.sources.destinations.Local(
+            directory=destinations.name,
+        ),
+    )
+    results, *_ = engine.run(
+        manifest=manifests.Base(sources=[source]),
+        pipelines=[pipeline],
+        pipelines_dir=None,
+        pipes_jobs=4,
+    )
+
+    assert results[0].dict() == utils.get_expected("pipeline_pdf")
+
+
 @pytest.mark.skipif(utils.skip_pubmed, reason="INGESTUM_PUBMED_* variables not found")
 def test_pipeline_pdf_publication():
     pipeline = pipelines.Base.parse_file(
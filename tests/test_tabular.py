@@ -75,6 +75,29 @@ def test_tabular_document_columns_update_with_extractables():
     )
 
 
+def test_tabular_document_columns_update_with_extractables_copy_on_write(
+    monkeypatch,
+):
+    monkeypatch.setattr(documents.base, "COPY_ON_WRITE", True)
+    before = tabular_collection.dict()
+    document = transformers.TabularDocumentColumnsUpdateWithExtractables(
+        columns=[2], regexp=r"row1"
+    ).transform(collection=tabular_collection, extractables=tabular_extractables)
+    assert document.dict() != before
+    assert tabular_collection.dict() == before
+
+
+def test_tabular_document_new_from(monkeypatch):
+    utils.assert_trusted(monkeypatch, documents.Tabular, tabular_document1)
+    utils.assert_trusted(
+        monkeypatch,
+        documents.Tabular,
+        tabular_document1,
+        content=[list(row) for row in tabular_document1.content],
+        columns=tabular_document1.columns + 1,
+    )
+
+
 def test_tabular_document_create_form_collection():
     document = transformers.TabularDocumentCreateFormCollection(
         format={0: "username", 1: "identifier", 2: "first_name", 3: "last_name"}
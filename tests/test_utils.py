@@ -20,14 +20,21 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
 
+import io
 import os
+import sys
+import json
+import types
 import pytest
 import requests
 
 from bs4 import BeautifulSoup
 
+from ingestum import documents
 from ingestum import sources
+from ingestum import transformers
 from ingestum import utils
+from ingestum.plugins.manager import Manager
 
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -52,3 +59,145 @@ def test_create_session_with_default_timeout():
     request = utils.create_request(total=0, default_timeout=1)
     with pytest.raises(requests.exceptions.ConnectionError):
         request.get("https://httpstat.us/200?sleep=40000")
+
+
+def test_registry():
+    registry = transformers.registry
+
+    transformer = registry.get("text_document_string_replace")
+    assert transformer is transformers.TextDocumentStringReplace
+
+    transformer = registry.validate(
+        {
+            "type": "text_document_string_replace",
+            "arguments": {"regexp": "a", "replacement": "b"},
+        }
+    )
+    assert isinstance(transformer, transformers.TextDocumentStringReplace)
+
+    with pytest.raises(ValueError):
+        registry.get("unknown_transformer")
+
+    with pytest.raises(ValueError):
+        transformers.CollectionDocumentJoin(transformer=transformer)
+
+
+def test_registry_collection():
+    collection = documents.Collection.parse_obj(
+        {
+            "type": "collection",
+            "content": [
+                {"type": "text", "content": "text"},
+                {"type": "collection", "content": [{"type": "passage"}]},
+            ],
+        }
+    )
+    assert isinstance(collection.content[0], documents.Text)
+    assert isinstance(collection.content[1], documents.Collection)
+    assert isinstance(collection.content[1].content[0], documents.Passage)
+
+    with pytest.raises(ValueError):
+        documents.Collection.parse_obj({"content": [{"type": "unknown"}]})
+
+
+def test_stringify_document():
+    collection = documents.Collection.parse_file(
+        os.path.join(ROOT_DIR, "tests/input/collection_passage_document.json")
+    )
+
+    assert utils.stringify_document(collection) == json.dumps(
+        collection.dict(), ensure_ascii=False
+    )
+    assert utils.stringify_document(collection, formatted=True) == json.dumps(
+        collection.dict(), ensure_ascii=False, indent=4, sort_keys=True
+    )
+
+
+@pytest.mark.parametrize("formatted", [False, True])
+def test_write_document(formatted):
+    collection = documents.Collection.parse_file(
+        os.path.join(ROOT_DIR, "tests/input/collection_collection_document.json")
+    )
+
+    output = io.StringIO()
+    utils.write_document(collection, output, formatted=formatted)
+
+    assert output.getvalue() == utils.stringify_document(
+        collection, formatted=formatted
+    )
+
+
+def test_plugins_index(tmp_path, monkeypatch):
+    directories = [os.path.join(ROOT_DIR, "tests/plugins")]
+    index_path = str(tmp_path / "plugins.json")
+    module = types.ModuleType("plugins_index")
+    monkeypatch.setitem(sys.modules, module.__name__, module)
+
+    manager = Manager(directories=directories, index_path=index_path)
+    manager.register(module, "sources", sources.Base)
+    assert manager.classes[module.__name__] == {"RSS": "rss.plugin.sources"}
+    assert os.path.exists(index_path)
+
+    def scan(*args):
+        raise AssertionError("plugins scanned despite a fresh index")
+
+    monkeypatch.setattr(Manager, "_scan", scan)
+
+    manager = Manager(directories=directories, index_path=index_path)
+    manager.register(module, "sources", sources.Base)
+    assert manager.resolve(module.__name__, "RSS") is sources.RSS
+    assert module.RSS is sources.RSS
+
+    with pytest.raises(AttributeError):
+        manager.resolve(module.__name__, "Unknown")
+
+
+@pytest.mark.parametrize("formatted", [False, True])
+def test_iter_collection_items(tmp_path, formatted):
+    collection = documents.Collection.parse_file(
+        os.path.join(ROOT_DIR, "tests/input/collection_collection_document.json")
+    )
+    path = os.path.join(tmp_path, "collection.json")
+    utils.write_document_to_path(collection, path, formatted=formatted)
+
+    items = list(utils.iter_collection_items(path, chunk_size=16))
+    assert items == collection.content
+
+    with pytest.raises(ValueError):
+        list(
+            utils.iter_collection_items(
+                os.path.join(ROOT_DIR, "tests/input/tabular_document.json")
+            )
+        )
+
+
+def test_iter_collection_dicts(tmp_path, monkeypatch):
+    items = [
+        {"type": "text", "content": "x" * 100000},
+        {"type": "unknown", "content": "plugin"},
+    ]
+    path = os.path.join(tmp_path, "collection.json")
+    with open(path, "w") as collection_file:
+        json.dump({"content": items, "type": "collection"}, collection_file)
+
+    reads = []
+    _open = open
+
+    def counting_open(*args, **kargs):
+        file = _open(*args, **kargs)
+        read = file.read
+        file.read = lambda size: reads.append(size) or read(size)
+        return file
+
+    monkeypatch.setattr(utils, "open", counting_open, raising=False)
+    assert list(utils.iter_collection_dicts(path, chunk_size=16)) == items
+    monkeypatch.undo()
+
+    # large documents are read in a number of steps logarithmic in their size
+    assert len(reads) < 32
+
+    with open(path, "w") as collection_file:
+        json.dump({"content": items}, collection_file)
+
+    with pytest.raises(ValueError):
+        list(utils.iter_collection_dicts(path))
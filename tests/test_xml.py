@@ -56,7 +56,9 @@ def test_xml_document_tag_replace():
     document = transformers.XMLDocumentTagReplace(
         tag="food", replacement="replacement"
     ).transform(document=xml_document)
-    write_document_to_path(document, "tests/output/xml_document_tag_replace.json")
+    write_document_to_path(
+        document, "tests/output/xml_document_tag_replace.json", formatted=True
+    )
     assert document.dict() == utils.get_expected("xml_document_tag_replace")
 
 
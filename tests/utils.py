@@ -21,9 +21,12 @@
 #
 
 
+import copy
 import json
 import os
 
+from pydantic import BaseModel
+
 
 def get_expected(transformer):
     filepath = "tests/output/" + transformer + ".json"
@@ -32,6 +35,34 @@ def get_expected(transformer):
     return expected
 
 
+def _types(value):
+    if isinstance(value, BaseModel):
+        return type(value), {k: _types(v) for k, v in value.__dict__.items()}
+    if isinstance(value, list):
+        return [_types(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _types(v) for k, v in value.items()}
+    return type(value)
+
+
+def assert_trusted(monkeypatch, cls, _object, **kargs):
+    """
+    Asserts that deriving a document without validation builds the same
+    document, down to the types of its nested values, as with validation.
+    """
+
+    from ingestum import documents
+
+    monkeypatch.setattr(documents.base, "VALIDATE", False)
+    trusted = cls.new_from(_object, **copy.deepcopy(kargs))
+    monkeypatch.setattr(documents.base, "VALIDATE", True)
+    validated = cls.new_from(_object, **copy.deepcopy(kargs))
+
+    assert trusted.dict() == validated.dict()
+    assert trusted.__fields_set__ == validated.__fields_set__
+    assert _types(trusted) == _types(validated)
+
+
 def update_expected(document, transformer):
     if not os.environ.get("INGESTUM_UPDATE_TEST_OUTPUT"):
         return